@@ -0,0 +1,109 @@
+"""library_generation som logg over committede transaksjoner
+
+Revision ID: a0b1c2d3e062
+Revises: f9a0b1c2d061
+Create Date: 2026-06-26
+
+Sekvensen fra e8f9a0b1c060 er ikke transaksjonell: nextval() ved commit blir
+synlig før transaksjonens rader. Et søk kunne lese den nye last_value, kjøre
+spørringen mot et øyeblikksbilde uten skriverens rader og cache gamle
+totaler, fasetter eller id-lister under den nye generasjonen — helt til neste
+skriving. TRUNCATE-triggeren hadde samme hull.
+
+Nå legger hver skrivende transaksjon én rad i library_generation_log (vanlige
+statement-triggere, én innsetting per transaksjon). Generasjonen er antall
+slike rader som er synlige i leserens øyeblikksbilde: library_generation.folded
+(rader som er slått sammen) pluss radene som fortsatt ligger i loggen. Den
+vokser bare når en skriver committer, uansett rekkefølge på id-ene, og leses i
+samme REPEATABLE READ-transaksjon som spørringen den stempler. Skrivere setter
+bare inn nye rader og venter aldri på hverandre.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a0b1c2d3e062"
+down_revision: Union[str, Sequence[str], None] = "f9a0b1c2d061"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("photos", "photo_tags", "tags", "events", "photographers", "photo_corrections")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER trg_{table}_library_generation_truncate ON {table}")
+        op.execute(f"DROP TRIGGER trg_{table}_library_generation ON {table}")
+    op.execute("DROP FUNCTION bump_library_generation()")
+
+    op.create_table(
+        "library_generation",
+        sa.Column("id", sa.SmallInteger(), primary_key=True),
+        sa.Column("folded", sa.BigInteger(), nullable=False),
+        sa.CheckConstraint("id = 1", name="ck_library_generation_single_row"),
+    )
+    op.execute("INSERT INTO library_generation (id, folded) SELECT 1, last_value FROM library_generation_seq")
+    op.execute("DROP SEQUENCE library_generation_seq")
+    op.create_table(
+        "library_generation_log",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True),
+    )
+
+    op.execute("""
+        CREATE FUNCTION log_library_generation() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('hotprevue.library_generation_logged', true) IS DISTINCT FROM 'on' THEN
+                INSERT INTO library_generation_log DEFAULT VALUES;
+                PERFORM set_config('hotprevue.library_generation_logged', 'on', true);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in _TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_library_generation
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION log_library_generation()
+        """)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER trg_{table}_library_generation ON {table}")
+    op.execute("DROP FUNCTION log_library_generation()")
+
+    op.execute("CREATE SEQUENCE library_generation_seq")
+    op.execute("""
+        SELECT setval('library_generation_seq', greatest(1,
+            (SELECT folded FROM library_generation) + (SELECT count(*) FROM library_generation_log)))
+    """)
+    op.drop_table("library_generation_log")
+    op.drop_table("library_generation")
+
+    op.execute("""
+        CREATE FUNCTION bump_library_generation() RETURNS trigger AS $$
+        BEGIN
+            IF TG_LEVEL = 'STATEMENT' THEN
+                PERFORM nextval('library_generation_seq');
+            ELSIF current_setting('hotprevue.library_generation_bumped', true) IS DISTINCT FROM 'on' THEN
+                PERFORM nextval('library_generation_seq');
+                PERFORM set_config('hotprevue.library_generation_bumped', 'on', true);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in _TABLES:
+        op.execute(f"""
+            CREATE CONSTRAINT TRIGGER trg_{table}_library_generation
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            DEFERRABLE INITIALLY DEFERRED
+            FOR EACH ROW EXECUTE FUNCTION bump_library_generation()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_library_generation_truncate
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_library_generation()
+        """)
@@ -0,0 +1,43 @@
+"""photos.tag_ids: denormalisert tag-liste med GIN-indeks
+
+Revision ID: a4b5c6d7e056
+Revises: f3a4b5c6d055
+Create Date: 2026-06-20
+
+Tag-kriterier i søk ble IN/NOT IN-delspørringer mot photo_tags, og all_of
+en GROUP BY ... HAVING. Flere tag-kriterier med OR ga nøstede delspørringer
+som skalerte dårlig. photos.tag_ids speiler photo_tags (holdes i takt av
+services/tag_service.py) slik at kriteriene blir &&, @> og NOT && mot en
+GIN-indeks.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "a4b5c6d7e056"
+down_revision: Union[str, Sequence[str], None] = "f3a4b5c6d055"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("photos", sa.Column(
+        "tag_ids", postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=False,
+        server_default=sa.text("'{}'"),
+    ))
+    op.execute("""
+        UPDATE photos p SET tag_ids = t.ids
+        FROM (
+            SELECT photo_id, array_agg(tag_id ORDER BY tag_id) AS ids
+            FROM photo_tags GROUP BY photo_id
+        ) t
+        WHERE t.photo_id = p.id
+    """)
+    op.create_index("ix_photos_tag_ids", "photos", ["tag_ids"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_photos_tag_ids", table_name="photos")
+    op.drop_column("photos", "tag_ids")
@@ -0,0 +1,39 @@
+"""photos.shuffle_key: fast tilfeldig rekkefølge med seed og cursor
+
+Revision ID: a8b9c0d1e050
+Revises: f7a8b9c0d049
+Create Date: 2026-06-14
+
+ORDER BY random() sorterte hele det filtrerte settet på hver side og ga
+gjentakelser og hull mellom sider. Hvert bilde får i stedet en fast
+tilfeldig nøkkel; sort=random leser (shuffle_key, id) fra et seed-bestemt
+startpunkt via indeksen (se services/photo_cursor.py).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a8b9c0d1e050"
+down_revision: Union[str, Sequence[str], None] = "f7a8b9c0d049"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Volatil default: hver eksisterende rad får sin egen verdi
+    op.add_column("photos", sa.Column(
+        "shuffle_key", sa.Integer(), nullable=False,
+        server_default=sa.text("floor(random() * 2147483647)::integer"),
+    ))
+    op.create_index(
+        "ix_photos_live_shuffle",
+        "photos",
+        ["shuffle_key", "id"],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_photos_live_shuffle", table_name="photos")
+    op.drop_column("photos", "shuffle_key")
@@ -0,0 +1,30 @@
+"""library_generation: også image_files
+
+Revision ID: b1c2d3e4f063
+Revises: a0b1c2d3e062
+Create Date: 2026-06-27
+
+Fritekstsøk treffer image_files.file_path, men image_files hadde ingen
+generasjonstrigger: etter POST /photos/{hothash}/companions kunne cachede
+id-lister, totaler og fasetter for fritekstsøk mangle den nye stien.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "b1c2d3e4f063"
+down_revision: Union[str, Sequence[str], None] = "a0b1c2d3e062"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TRIGGER trg_image_files_library_generation
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON image_files
+        FOR EACH STATEMENT EXECUTE FUNCTION log_library_generation()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER trg_image_files_library_generation ON image_files")
@@ -0,0 +1,62 @@
+"""ai_photo_status: versjon for CLIP-punktenes filterfelt
+
+Revision ID: b5c6d7e8f057
+Revises: a4b5c6d7e056
+Create Date: 2026-06-21
+
+Hybridsøk (POST /searches/semantic) filtrerer i Qdrant på taken_at,
+photographer_id, event_id, rating og slettet-status, som workeren lagrer
+som payload på hvert CLIP-punkt. En radtrigger på photos øker
+payload_version når et av feltene endres, uansett kodevei; workeren henter
+radene der payload_version > payload_synced_version (GET /ai/payloads),
+oppdaterer punktene og kvitterer med versjonen den sendte.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "b5c6d7e8f057"
+down_revision: Union[str, Sequence[str], None] = "a4b5c6d7e056"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_FIELDS = ("taken_at", "photographer_id", "event_id", "rating", "deleted_at")
+
+
+def upgrade() -> None:
+    op.add_column("ai_photo_status", sa.Column("payload_version", sa.Integer(), nullable=False, server_default="1"))
+    op.add_column(
+        "ai_photo_status", sa.Column("payload_synced_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Eksisterende punkter har bare hothash som payload — alle må synkes én gang
+    op.create_index(
+        "ix_ai_photo_status_payload_stale",
+        "ai_photo_status",
+        ["photo_id"],
+        postgresql_where=sa.text("capability = 'clip' AND payload_version > payload_synced_version"),
+    )
+    op.execute("""
+        CREATE FUNCTION bump_ai_clip_payload() RETURNS trigger AS $$
+        BEGIN
+            UPDATE ai_photo_status SET payload_version = payload_version + 1
+            WHERE photo_id = NEW.id AND capability = 'clip';
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    changed = " OR ".join(f"OLD.{f} IS DISTINCT FROM NEW.{f}" for f in _FIELDS)
+    op.execute(f"""
+        CREATE TRIGGER trg_photos_ai_clip_payload
+        AFTER UPDATE OF {", ".join(_FIELDS)} ON photos
+        FOR EACH ROW WHEN ({changed})
+        EXECUTE FUNCTION bump_ai_clip_payload()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER trg_photos_ai_clip_payload ON photos")
+    op.execute("DROP FUNCTION bump_ai_clip_payload()")
+    op.drop_index("ix_ai_photo_status_payload_stale", table_name="ai_photo_status")
+    op.drop_column("ai_photo_status", "payload_synced_version")
+    op.drop_column("ai_photo_status", "payload_version")
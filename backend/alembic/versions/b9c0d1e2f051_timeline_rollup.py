@@ -0,0 +1,66 @@
+"""timeline_days og timeline_day_events: inkrementelt vedlikeholdt tidslinje
+
+Revision ID: b9c0d1e2f051
+Revises: a8b9c0d1e050
+Create Date: 2026-06-15
+
+Tidslinjen grupperte alle bilder på år/måned/dag og hendelse ved hvert kall.
+Tabellene holder ferdige tellinger per UTC-dag (og per dag og hendelse), og
+holdes oppdatert av services/timeline_rollup.py når bilder registreres,
+flyttes i tid, bytter hendelse eller slettes/gjenopprettes.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "b9c0d1e2f051"
+down_revision: Union[str, Sequence[str], None] = "a8b9c0d1e050"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "timeline_days",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("cover_hothash", sa.String(), nullable=False),
+        sa.Column("cover_taken_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "timeline_day_events",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column(
+            "event_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("events.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("first_taken_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_taken_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_timeline_day_events_event_id", "timeline_day_events", ["event_id"])
+
+    # Fyll fra eksisterende bilder (samme spørring som timeline_rollup.rebuild)
+    op.execute("""
+        INSERT INTO timeline_days (day, count, cover_hothash, cover_taken_at)
+        SELECT (taken_at AT TIME ZONE 'UTC')::date, count(*),
+               (array_agg(hothash ORDER BY taken_at DESC, hothash))[1], max(taken_at)
+        FROM photos
+        WHERE deleted_at IS NULL AND taken_at IS NOT NULL
+        GROUP BY 1
+    """)
+    op.execute("""
+        INSERT INTO timeline_day_events (day, event_id, count, first_taken_at, last_taken_at)
+        SELECT (taken_at AT TIME ZONE 'UTC')::date, event_id, count(*), min(taken_at), max(taken_at)
+        FROM photos
+        WHERE deleted_at IS NULL AND taken_at IS NOT NULL AND event_id IS NOT NULL
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_timeline_day_events_event_id", table_name="timeline_day_events")
+    op.drop_table("timeline_day_events")
+    op.drop_table("timeline_days")
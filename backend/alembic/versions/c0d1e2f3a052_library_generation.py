@@ -0,0 +1,54 @@
+"""library_generation: teller som øker ved hver endring i søkbare data
+
+Revision ID: c0d1e2f3a052
+Revises: b9c0d1e2f051
+Create Date: 2026-06-16
+
+Søkeresultater (totaler og fasetter) caches per (kriterier, generasjon).
+Statement-triggere på tabellene et søk leser fra øker telleren i samme
+transaksjon som endringen, så en cache-nøkkel med gammel generasjon aldri
+treffes etter at endringen er committet — uansett hvilken kodevei som endret
+dataene.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c0d1e2f3a052"
+down_revision: Union[str, Sequence[str], None] = "b9c0d1e2f051"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("photos", "photo_tags", "tags", "events", "photographers")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "library_generation",
+        sa.Column("id", sa.SmallInteger(), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.CheckConstraint("id = 1", name="ck_library_generation_single_row"),
+    )
+    op.execute("INSERT INTO library_generation (id, value) VALUES (1, 1)")
+    op.execute("""
+        CREATE FUNCTION bump_library_generation() RETURNS trigger AS $$
+        BEGIN
+            UPDATE library_generation SET value = value + 1 WHERE id = 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in _TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_library_generation
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_library_generation()
+        """)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER trg_{table}_library_generation ON {table}")
+    op.execute("DROP FUNCTION bump_library_generation()")
+    op.drop_table("library_generation")
@@ -0,0 +1,27 @@
+"""indeks på image_files.photo_id
+
+Revision ID: c6d7e8f9a058
+Revises: b5c6d7e8f057
+Create Date: 2026-06-22
+
+Fremmednøkkelen hadde ingen indeks, så hvert oppslag av et bildes filer
+(detaljvisning, eksport av filstier og EXIF per bilde) skannet hele
+image_files. Eksporten (POST /searches/export) slår opp filene for hvert
+bilde i resultatet.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "c6d7e8f9a058"
+down_revision: Union[str, Sequence[str], None] = "b5c6d7e8f057"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_image_files_photo_id", "image_files", ["photo_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_image_files_photo_id", table_name="image_files")
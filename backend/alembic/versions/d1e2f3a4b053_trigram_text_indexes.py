@@ -0,0 +1,44 @@
+"""pg_trgm GIN-indekser for deltekstsøk
+
+Revision ID: d1e2f3a4b053
+Revises: c0d1e2f3a052
+Create Date: 2026-06-17
+
+contains-kriteriene (ILIKE '%x%') og fritekstkriteriet `text` leste hele
+biblioteket. Trigram-indekser lar PostgreSQL slå opp delstrenger på tre tegn
+eller mer direkte. pg_trgm er allerede installert (a1b2c3d4e035).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "d1e2f3a4b053"
+down_revision: Union[str, Sequence[str], None] = "c0d1e2f3a052"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, column)
+_INDEXES = [
+    ("ix_photos_camera_make_trgm", "photos", "camera_make"),
+    ("ix_photos_camera_model_trgm", "photos", "camera_model"),
+    ("ix_photos_lens_model_trgm", "photos", "lens_model"),
+    ("ix_photos_share_caption_trgm", "photos", "share_caption"),
+    ("ix_image_files_file_path_trgm", "image_files", "file_path"),
+    ("ix_events_name_trgm", "events", "name"),
+    ("ix_events_description_trgm", "events", "description"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in _INDEXES:
+        op.create_index(
+            name, table, [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for name, table, _ in _INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,28 @@
+"""RAW coldpreview-nivå: photos.coldpreview_source og innstilling for full kvalitet
+
+Revision ID: d5e6f7a8b047
+Revises: c4d5e6f7a046
+Create Date: 2026-06-10
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d5e6f7a8b047"
+down_revision: Union[str, Sequence[str], None] = "c4d5e6f7a046"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("photos", sa.Column("coldpreview_source", sa.String(), nullable=True))
+    op.add_column(
+        "system_settings",
+        sa.Column("coldpreview_raw_full_quality", sa.Boolean(), nullable=False, server_default="false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("system_settings", "coldpreview_raw_full_quality")
+    op.drop_column("photos", "coldpreview_source")
@@ -0,0 +1,48 @@
+"""perceptual_hash_jobs og delvis indeks for bilder uten perseptuell hash
+
+Revision ID: d7e8f9a0b059
+Revises: c6d7e8f9a058
+Create Date: 2026-06-23
+
+POST /photos/compute-perceptual-hashes blir en bakgrunnsjobb. Jobben lagrer
+fremdrift og posisjonen (siste photo_id) etter hver bit som er committet, så
+den kan fortsette etter en omstart. Den delvise indeksen lar hver bit hente
+de neste bildene uten hash i id-rekkefølge uten å gå gjennom alle bildene som
+allerede har fått hash.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d7e8f9a0b059"
+down_revision: Union[str, Sequence[str], None] = "c6d7e8f9a058"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "perceptual_hash_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False),
+        sa.Column("updated", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("last_photo_id", sa.UUID(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("progressed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_photos_missing_perceptual_hash", "photos", ["id"],
+        postgresql_where=sa.text("dct_perceptual_hash IS NULL OR difference_hash IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_photos_missing_perceptual_hash", table_name="photos")
+    op.drop_table("perceptual_hash_jobs")
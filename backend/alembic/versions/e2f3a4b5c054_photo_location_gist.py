@@ -0,0 +1,32 @@
+"""GiST-indeks på bildeposisjon for kartutsnitt og radiussøk
+
+Revision ID: e2f3a4b5c054
+Revises: d1e2f3a4b053
+Create Date: 2026-06-18
+
+B-tree-indeksen ix_photos_location (location_lat, location_lng) kan bare
+avgrense på breddegrad. En GiST-indeks på punktet point(lng, lat) avgrenser
+på begge aksene (`<@ box`), uten ekstra utvidelser. Spørringene må ta med
+`location_lat IS NOT NULL` for å treffe delindeksen — se
+services/photo_service.py (map_clusters) og location_radius i search_service.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "e2f3a4b5c054"
+down_revision: Union[str, Sequence[str], None] = "d1e2f3a4b053"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX ix_photos_location_point ON photos "
+        "USING gist (point(location_lng, location_lat)) "
+        "WHERE location_lat IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_photos_location_point", table_name="photos")
@@ -0,0 +1,44 @@
+"""Hotpreview ut av photos: rå JPEG-bytes i egen tabell photo_hotpreviews
+
+Revision ID: e6f7a8b9c048
+Revises: d5e6f7a8b047
+Create Date: 2026-06-12
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "e6f7a8b9c048"
+down_revision: Union[str, Sequence[str], None] = "d5e6f7a8b047"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "photo_hotpreviews",
+        sa.Column("photo_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("jpeg", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["photo_id"], ["photos.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("photo_id"),
+    )
+    # JPEG er allerede komprimert — ikke forsøk pglz på nytt
+    op.execute("ALTER TABLE photo_hotpreviews ALTER COLUMN jpeg SET STORAGE EXTERNAL")
+    op.execute(
+        "INSERT INTO photo_hotpreviews (photo_id, jpeg) "
+        "SELECT id, decode(hotpreview_b64, 'base64') FROM photos"
+    )
+    op.drop_column("photos", "hotpreview_b64")
+
+
+def downgrade() -> None:
+    op.add_column("photos", sa.Column("hotpreview_b64", sa.Text(), nullable=True))
+    # encode(..., 'base64') bryter linjene hvert 76. tegn
+    op.execute(
+        "UPDATE photos p SET hotpreview_b64 = replace(encode(h.jpeg, 'base64'), E'\\n', '') "
+        "FROM photo_hotpreviews h WHERE h.photo_id = p.id"
+    )
+    op.alter_column("photos", "hotpreview_b64", nullable=False)
+    op.drop_table("photo_hotpreviews")
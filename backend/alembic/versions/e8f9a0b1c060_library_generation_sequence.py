@@ -0,0 +1,96 @@
+"""library_generation som sekvens i stedet for én delt rad
+
+Revision ID: e8f9a0b1c060
+Revises: d7e8f9a0b059
+Create Date: 2026-06-24
+
+Triggerne fra c0d1e2f3a052 oppdaterte én felles rad, så hver skrivende
+transaksjon holdt radlåsen til commit: alle skrivinger mot biblioteket ble
+seriefisert, og to transaksjoner som også låste bilderader i motsatt
+rekkefølge (f.eks. add_tag_to_photos mot batch_rating) kunne gå i vranglås.
+
+Generasjonen er nå sekvensen library_generation_seq (leses med last_value).
+nextval() tar ingen lås som varer transaksjonen ut. Økningen skjer ved commit
+(utsatte constraint-triggere, én nextval per transaksjon): øker den allerede
+ved første skriving, kan et søk som kjører mens transaksjonen pågår cache
+gamle data under den nye generasjonen. TRUNCATE har bare statement-triggere
+og øker straks.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e8f9a0b1c060"
+down_revision: Union[str, Sequence[str], None] = "d7e8f9a0b059"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("photos", "photo_tags", "tags", "events", "photographers", "photo_corrections")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER trg_{table}_library_generation ON {table}")
+    op.execute("DROP FUNCTION bump_library_generation()")
+
+    op.execute("CREATE SEQUENCE library_generation_seq")
+    op.execute("SELECT setval('library_generation_seq', (SELECT value FROM library_generation))")
+    op.drop_table("library_generation")
+
+    op.execute("""
+        CREATE FUNCTION bump_library_generation() RETURNS trigger AS $$
+        BEGIN
+            IF TG_LEVEL = 'STATEMENT' THEN
+                PERFORM nextval('library_generation_seq');
+            ELSIF current_setting('hotprevue.library_generation_bumped', true) IS DISTINCT FROM 'on' THEN
+                PERFORM nextval('library_generation_seq');
+                PERFORM set_config('hotprevue.library_generation_bumped', 'on', true);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in _TABLES:
+        op.execute(f"""
+            CREATE CONSTRAINT TRIGGER trg_{table}_library_generation
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            DEFERRABLE INITIALLY DEFERRED
+            FOR EACH ROW EXECUTE FUNCTION bump_library_generation()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_library_generation_truncate
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_library_generation()
+        """)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER trg_{table}_library_generation_truncate ON {table}")
+        op.execute(f"DROP TRIGGER trg_{table}_library_generation ON {table}")
+    op.execute("DROP FUNCTION bump_library_generation()")
+
+    op.create_table(
+        "library_generation",
+        sa.Column("id", sa.SmallInteger(), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.CheckConstraint("id = 1", name="ck_library_generation_single_row"),
+    )
+    op.execute("INSERT INTO library_generation (id, value) SELECT 1, last_value FROM library_generation_seq")
+    op.execute("DROP SEQUENCE library_generation_seq")
+
+    op.execute("""
+        CREATE FUNCTION bump_library_generation() RETURNS trigger AS $$
+        BEGIN
+            UPDATE library_generation SET value = value + 1 WHERE id = 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in _TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_library_generation
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_library_generation()
+        """)
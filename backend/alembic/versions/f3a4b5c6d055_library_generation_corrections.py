@@ -0,0 +1,30 @@
+"""library_generation: tell også endringer i photo_corrections
+
+Revision ID: f3a4b5c6d055
+Revises: e2f3a4b5c054
+Create Date: 2026-06-19
+
+Lagrede søk caches nå som ferdig sorterte treff-lister per generasjon, og
+generasjonen skal dekke alle skrivinger mot det et søk viser — også
+korreksjoner (rotasjon, beskjæring).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "f3a4b5c6d055"
+down_revision: Union[str, Sequence[str], None] = "e2f3a4b5c054"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TRIGGER trg_photo_corrections_library_generation
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON photo_corrections
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_library_generation()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER trg_photo_corrections_library_generation ON photo_corrections")
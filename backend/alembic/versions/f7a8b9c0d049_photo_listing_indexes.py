@@ -0,0 +1,62 @@
+"""Indekser for listings av photos: sortering, filtre og papirkurv
+
+Revision ID: f7a8b9c0d049
+Revises: e6f7a8b9c048
+Create Date: 2026-06-13
+
+Hver listing filtrerer på deleted_at IS NULL og sorterer på den fulle
+nøkkelen fra services/photo_cursor.py (sorteringskolonne, registered_at, id).
+Indeksene speiler nøkkelen eksakt — også NULLS LAST — slik at første side og
+hver cursor-side blir en indeksrekkevidde som stopper etter LIMIT rader.
+
+Blandede retninger (taken_at DESC, registered_at ASC) kan ikke leses
+baklengs fra en ASC-indeks, derfor egne indekser for stigende og synkende
+taken_at og rating. registered_at-sorteringene deler én indeks.
+
+Filtrene: gjesters visning (photographer_id) får en sammensatt indeks i
+samme rekkefølge som standardsorteringen; event-sider, input-sesjoner,
+kategori og kind får vanlige indekser (også nødvendig for ON DELETE SET NULL).
+Papirkurven (deleted_at IS NOT NULL) er liten og får en egen delindeks.
+Se backend/tests/api/test_query_plans.py.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "f7a8b9c0d049"
+down_revision: Union[str, Sequence[str], None] = "e6f7a8b9c048"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_LIVE = sa.text("deleted_at IS NULL")
+
+# (navn, kolonner, where)
+_INDEXES = [
+    ("ix_photos_live_taken_desc", [sa.text("taken_at DESC NULLS LAST"), "registered_at", "id"], _LIVE),
+    ("ix_photos_live_taken_asc", ["taken_at", "registered_at", "id"], _LIVE),
+    ("ix_photos_live_registered", ["registered_at", "id"], _LIVE),
+    ("ix_photos_live_rating_desc", [sa.text("rating DESC NULLS LAST"), "registered_at", "id"], _LIVE),
+    ("ix_photos_live_rating_asc", ["rating", "registered_at", "id"], _LIVE),
+    (
+        "ix_photos_live_photographer_taken",
+        ["photographer_id", sa.text("taken_at DESC NULLS LAST"), "registered_at", "id"],
+        _LIVE,
+    ),
+    ("ix_photos_event_taken", ["event_id", "taken_at"], None),
+    ("ix_photos_input_session_registered", ["input_session_id", "registered_at", "id"], None),
+    ("ix_photos_category_id", ["category_id"], None),
+    ("ix_photos_kind_id", ["kind_id"], None),
+    ("ix_photos_deleted_at", ["deleted_at"], sa.text("deleted_at IS NOT NULL")),
+]
+
+
+def upgrade() -> None:
+    for name, columns, where in _INDEXES:
+        op.create_index(name, "photos", columns, postgresql_where=where)
+    op.execute("ANALYZE photos")
+
+
+def downgrade() -> None:
+    for name, _, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name="photos")
@@ -0,0 +1,44 @@
+"""coldpreview_variant_jobs: backfill av coldpreview-varianter som bakgrunnsjobb
+
+Revision ID: f9a0b1c2d061
+Revises: e8f9a0b1c060
+Create Date: 2026-06-25
+
+POST /photos/build-coldpreview-variants dekodet hver coldpreview i selve
+HTTP-forespørselen. Nå starter den en jobb som går gjennom bildene i
+id-rekkefølge i biter og lagrer fremdrift og posisjon etter hver bit, så den
+kan fortsette etter en omstart.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "f9a0b1c2d061"
+down_revision: Union[str, Sequence[str], None] = "e8f9a0b1c060"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coldpreview_variant_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False),
+        sa.Column("written", sa.Integer(), nullable=False),
+        sa.Column("photos_updated", sa.Integer(), nullable=False),
+        sa.Column("missing_coldpreview", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("last_photo_id", sa.UUID(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("progressed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("coldpreview_variant_jobs")
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from core.config import settings
 from database.session import get_db
 from models.ai import AiPhotoStatus
+from services.semantic_search import clip_payload
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
@@ -20,6 +21,8 @@ _CAPABILITIES = {"clip", "faces"}
 class AiJob(BaseModel):
     photo_id: uuid.UUID
     hothash: str
+    # clip: filter payload to store with the point (see semantic_search.clip_payload)
+    payload: dict | None = None
 
 
 class AiResult(BaseModel):
@@ -29,6 +32,8 @@ class AiResult(BaseModel):
     qdrant_id: str | None = None
     face_count: int | None = None
     error: str | None = None
+    # clip: the job's payload as stored with the point
+    payload: dict | None = None
 
 
 class AiResultsPayload(BaseModel):
@@ -47,6 +52,21 @@ class AiStatusSummary(BaseModel):
     pending: int
 
 
+class AiPayloadUpdate(BaseModel):
+    photo_id: uuid.UUID
+    version: int
+    payload: dict
+
+
+class AiPayloadSynced(BaseModel):
+    photo_id: uuid.UUID
+    version: int
+
+
+class AiPayloadAck(BaseModel):
+    synced: list[AiPayloadSynced]
+
+
 class SearchResult(BaseModel):
     hothash: str
     score: float
@@ -85,7 +105,8 @@ def get_ai_jobs(
 
     rows = db.execute(
         text("""
-            SELECT p.id AS photo_id, p.hothash
+            SELECT p.id AS photo_id, p.hothash,
+                   p.taken_at, p.photographer_id, p.event_id, p.rating, p.deleted_at
             FROM photos p
             LEFT JOIN ai_photo_status s
                 ON s.photo_id = p.id AND s.capability = :capability
@@ -97,7 +118,14 @@ def get_ai_jobs(
         {"capability": capability, "limit": limit},
     ).fetchall()
 
-    return [AiJob(photo_id=row.photo_id, hothash=row.hothash) for row in rows]
+    return [
+        AiJob(
+            photo_id=row.photo_id,
+            hothash=row.hothash,
+            payload=_payload_of(row) if capability == "clip" else None,
+        )
+        for row in rows
+    ]
 
 
 @router.post("/results", response_model=AiResultsResponse)
@@ -105,23 +133,28 @@ def post_ai_results(payload: AiResultsPayload, db: Session = Depends(get_db)):
     """Accept batch results from the AI worker.
 
     Upserts an AiPhotoStatus row per result. Unknown hothashes are silently skipped.
+    A clip point counts as in sync only if the payload it was stored with still
+    matches the photo; otherwise it is handed out again by GET /ai/payloads.
     """
     hothashes = [r.hothash for r in payload.results]
     photo_rows = db.execute(
-        text("SELECT id, hothash FROM photos WHERE hothash = ANY(:hashes)"),
+        text("""
+            SELECT id, hothash, taken_at, photographer_id, event_id, rating, deleted_at
+            FROM photos WHERE hothash = ANY(:hashes)
+        """),
         {"hashes": hothashes},
     ).fetchall()
-    hothash_to_id: dict[str, uuid.UUID] = {row.hothash: row.id for row in photo_rows}
+    photos = {row.hothash: row for row in photo_rows}
 
     now = datetime.now(timezone.utc)
     accepted = 0
 
     for result in payload.results:
-        photo_id = hothash_to_id.get(result.hothash)
-        if photo_id is None:
+        photo = photos.get(result.hothash)
+        if photo is None:
             continue
 
-        existing = db.get(AiPhotoStatus, (photo_id, result.capability))
+        existing = db.get(AiPhotoStatus, (photo.id, result.capability))
         if existing:
             existing.status = result.status
             existing.qdrant_id = result.qdrant_id
@@ -129,23 +162,73 @@ def post_ai_results(payload: AiResultsPayload, db: Session = Depends(get_db)):
             existing.analyzed_at = now
             existing.error = result.error
         else:
-            db.add(
-                AiPhotoStatus(
-                    photo_id=photo_id,
-                    capability=result.capability,
-                    status=result.status,
-                    qdrant_id=result.qdrant_id,
-                    face_count=result.face_count,
-                    analyzed_at=now,
-                    error=result.error,
-                )
+            existing = AiPhotoStatus(
+                photo_id=photo.id,
+                capability=result.capability,
+                status=result.status,
+                qdrant_id=result.qdrant_id,
+                face_count=result.face_count,
+                analyzed_at=now,
+                error=result.error,
+                payload_version=1,
+                payload_synced_version=0,
             )
+            db.add(existing)
+        if result.capability == "clip" and result.status == "done":
+            if result.payload == _payload_of(photo):
+                existing.payload_synced_version = existing.payload_version
+            else:
+                existing.payload_version = existing.payload_synced_version + 1
         accepted += 1
 
     db.commit()
     return AiResultsResponse(accepted=accepted)
 
 
+@router.get("/payloads", response_model=list[AiPayloadUpdate])
+def get_ai_payloads(
+    limit: int = Query(default=200, le=1000),
+    db: Session = Depends(get_db),
+):
+    """Return CLIP points whose filter payload is out of date, with the current payload."""
+    rows = db.execute(
+        text("""
+            SELECT s.photo_id, s.payload_version,
+                   p.taken_at, p.photographer_id, p.event_id, p.rating, p.deleted_at
+            FROM ai_photo_status s
+            JOIN photos p ON p.id = s.photo_id
+            WHERE s.capability = 'clip' AND s.status = 'done'
+              AND s.payload_version > s.payload_synced_version
+            LIMIT :limit
+        """),
+        {"limit": limit},
+    ).fetchall()
+    return [
+        AiPayloadUpdate(photo_id=row.photo_id, version=row.payload_version, payload=_payload_of(row))
+        for row in rows
+    ]
+
+
+@router.post("/payloads", response_model=AiResultsResponse)
+def post_ai_payloads(ack: AiPayloadAck, db: Session = Depends(get_db)):
+    """Record the payload versions the worker has written to its points.
+
+    A photo changed again after GET /ai/payloads keeps its newer version and is
+    handed out again.
+    """
+    if ack.synced:
+        db.execute(
+            text("""
+                UPDATE ai_photo_status
+                SET payload_synced_version = GREATEST(payload_synced_version, :version)
+                WHERE photo_id = :photo_id AND capability = 'clip'
+            """),
+            [{"photo_id": str(s.photo_id), "version": s.version} for s in ack.synced],
+        )
+        db.commit()
+    return AiResultsResponse(accepted=len(ack.synced))
+
+
 @router.get("/status", response_model=list[AiStatusSummary])
 def get_ai_status(db: Session = Depends(get_db)):
     """Return a summary of AI analysis progress per capability."""
@@ -177,3 +260,7 @@ def get_ai_status(db: Session = Depends(get_db)):
             )
         )
     return summaries
+
+
+def _payload_of(row) -> dict:
+    return clip_payload(row.taken_at, row.photographer_id, row.event_id, row.rating, row.deleted_at)
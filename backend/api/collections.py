@@ -1,10 +1,11 @@
 import re
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
+from core import encoding
 from database.session import get_db
 from middleware.machine_auth import require_owner
 from schemas.collection import (
@@ -70,9 +71,9 @@ def export_collection(collection_id: uuid.UUID, db: Session = Depends(get_db)):
 
 
 @router.get("/{collection_id}/items", response_model=list[CollectionItemOut])
-def get_items(collection_id: uuid.UUID, db: Session = Depends(get_db)):
+def get_items(request: Request, collection_id: uuid.UUID, db: Session = Depends(get_db)):
     items = collection_service.get_items(db, collection_id)
-    return [CollectionItemOut.model_validate(item) for item in items]
+    return encoding.respond(request, [CollectionItemOut.model_validate(item) for item in items])
 
 
 @router.post("/{collection_id}/items", response_model=CollectionItemOut, status_code=201)
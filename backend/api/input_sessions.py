@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from database.session import get_db
@@ -13,7 +13,7 @@ from schemas.input_session import (
     SessionErrorOut,
 )
 from schemas.photo import PhotoListItem
-from services import input_session_service
+from services import input_session_service, photo_service
 
 router = APIRouter(prefix="/input-sessions", tags=["input-sessions"])
 
@@ -34,9 +34,18 @@ def get_session(session_id: uuid.UUID, db: Session = Depends(get_db)):
 
 
 @router.get("/{session_id}/photos", response_model=list[PhotoListItem])
-def get_session_photos(session_id: uuid.UUID, db: Session = Depends(get_db)):
-    photos = input_session_service.list_photos(db, session_id)
-    return [PhotoListItem.model_validate(p) for p in photos]
+def get_session_photos(
+    request: Request,
+    session_id: uuid.UUID,
+    include_hotpreview: bool = True,
+    limit: int | None = Query(default=None, ge=1, le=10000),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+):
+    items, next_cursor = input_session_service.list_photos(
+        db, session_id, include_hotpreview, limit=limit, cursor=cursor,
+    )
+    return photo_service.list_items_response(request, items, next_cursor)
 
 
 @router.get("/{session_id}/errors", response_model=list[SessionErrorOut])
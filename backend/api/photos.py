@@ -1,10 +1,11 @@
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Request
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
+from core import encoding
 from database.session import get_db
 from fastapi import File, Form, UploadFile
 
@@ -19,33 +20,43 @@ from schemas.photo import (
     BatchResult,
     BatchTakenAt,
     BatchTakenAtOffset,
+    ColdpreviewVariantJobOut,
     CompanionCreate,
     CorrectionPatch,
     ImageFileSchema,
+    MapCluster,
     PhotoDetail,
     PhotoListItem,
+    PhotoNeighbours,
     PhotoPatch,
-    PerceptualHashComputeResult,
+    PerceptualHashJobOut,
+    SimilarPair,
+    SimilarPairsRequest,
+    SimilarPhoto,
     TimelineBucket,
     TimelineEventBalloon,
+    TimelineRebuildResult,
 )
 from middleware.machine_auth import get_requesting_photographer, require_owner
 from models.photographer import Photographer
-from services import photo_service
+from services import hash_backfill, photo_service, similarity_index, variant_backfill
 
 router = APIRouter(prefix="/photos", tags=["photos"])
 
+# GET /photos/hotpreviews — hothashes per request keeps the URL well below 8 KB
+HOTPREVIEW_PACK_MAX = 100
+HOTPREVIEW_PACK_MEDIA_TYPE = "application/vnd.hotprevue.hotpreview-pack"
+
 
 @router.post("/check-hothashes", response_model=CheckHothashResponse)
 def check_hothashes(data: CheckHothashRequest, db: Session = Depends(get_db)):
     return photo_service.check_hothashes(db, data)
 
 
-@router.get("", response_model=list[PhotoListItem])
-def list_photos(
-    db: Session = Depends(get_db),
+def _list_filters(
     photographer: Photographer | None = Depends(get_requesting_photographer),
-    hothash: list[str] = Query(default=[]),
+    # Aliased so the name does not clash with the {hothash} path parameter
+    hothashes: list[str] = Query(default=[], alias="hothash"),
     photographer_id: uuid.UUID | None = None,
     event_id: uuid.UUID | None = None,
     session_id: uuid.UUID | None = None,
@@ -58,13 +69,10 @@ def list_photos(
     taken_before: datetime | None = None,
     deleted: bool = False,
     stacks_collapsed: bool = False,
-    sort: str = "taken_at_desc",
-    limit: int = Query(default=100, le=10000),
-    offset: int = 0,
-):
-    photos = photo_service.list_photos(
-        db,
-        hothashes=hothash or None,
+) -> dict:
+    """Filter query parameters shared by GET /photos and GET /photos/{hothash}/neighbours."""
+    return dict(
+        hothashes=hothashes or None,
         photographer_id=photographer_id,
         event_id=event_id,
         session_id=session_id,
@@ -77,22 +85,124 @@ def list_photos(
         taken_before=taken_before,
         deleted=deleted,
         stacks_collapsed=stacks_collapsed,
+        requesting_photographer=photographer,
+    )
+
+
+@router.get("", response_model=list[PhotoListItem])
+def list_photos(
+    request: Request,
+    db: Session = Depends(get_db),
+    filters: dict = Depends(_list_filters),
+    sort: str = "taken_at_desc",
+    limit: int = Query(default=100, le=10000),
+    offset: int = 0,
+    cursor: str | None = None,
+    seed: int | None = None,
+    include_hotpreview: bool = True,
+):
+    """One page of photos. Pass X-Next-Cursor back as cursor for the next page.
+
+    sort=random is a shuffle fixed by seed (drawn per request when omitted).
+    """
+    items, next_cursor = photo_service.list_photos(
+        db,
         sort=sort,
         limit=limit,
         offset=offset,
-        requesting_photographer=photographer,
+        cursor=cursor,
+        seed=seed,
+        include_hotpreview=include_hotpreview,
+        **filters,
     )
-    return [PhotoListItem.model_validate(p) for p in photos]
+    return photo_service.list_items_response(request, items, next_cursor)
+
+
+@router.get("/map-clusters", response_model=list[MapCluster])
+def get_map_clusters(
+    request: Request,
+    zoom: int = Query(ge=0, le=22),
+    west: float = Query(ge=-180, le=180),
+    south: float = Query(ge=-90, le=90),
+    east: float = Query(ge=-180, le=180),
+    north: float = Query(ge=-90, le=90),
+    db: Session = Depends(get_db),
+    filters: dict = Depends(_list_filters),
+):
+    """Pre-clustered map markers for the geotagged photos inside the box.
+
+    Takes the GET /photos filters; west > east crosses the antimeridian.
+    """
+    return encoding.respond(request, photo_service.map_clusters(db, zoom, west, south, east, north, **filters))
+
+
+@router.get("/hotpreviews")
+def get_hotpreviews(
+    db: Session = Depends(get_db),
+    photographer: Photographer | None = Depends(get_requesting_photographer),
+    hothash: list[str] = Query(default=[], max_length=HOTPREVIEW_PACK_MAX),
+):
+    """Raw hotpreview JPEGs for many photos in one binary response.
+
+    See photo_service.hotpreview_pack() for the layout. Content is addressed
+    by hothash and never changes, so a pack holding every requested photo is
+    cacheable forever. One with photos left out (unknown yet, or hidden from
+    this requester) is not: the same URL may return more later.
+    """
+    pack, complete = photo_service.hotpreview_pack(db, hothash, requesting_photographer=photographer)
+    return Response(
+        content=pack,
+        media_type=HOTPREVIEW_PACK_MEDIA_TYPE,
+        headers={"Cache-Control": "private, max-age=31536000, immutable" if complete else "no-store"},
+    )
+
+
+@router.post("/compute-perceptual-hashes", response_model=PerceptualHashJobOut, status_code=202)
+def compute_perceptual_hashes_for_all(db: Session = Depends(get_db), _: None = Depends(require_owner)):
+    """Start a background job computing the hashes for all photos that lack them.
+
+    Reads the hotpreviews from the database — no original files needed.
+    Returns the job already pending or running, if any; poll
+    GET /photos/compute-perceptual-hashes/{job_id} for progress.
+    """
+    return hash_backfill.start(db)
+
+
+@router.get("/compute-perceptual-hashes/{job_id}", response_model=PerceptualHashJobOut)
+def get_perceptual_hash_job(job_id: uuid.UUID, db: Session = Depends(get_db)):
+    return hash_backfill.get_or_404(db, job_id)
 
 
-@router.post("/compute-perceptual-hashes", response_model=PerceptualHashComputeResult)
-def compute_perceptual_hashes_for_all(db: Session = Depends(get_db)):
-    """Compute dct_perceptual_hash and difference_hash for all photos that lack them.
+@router.post("/build-coldpreview-variants", response_model=ColdpreviewVariantJobOut, status_code=202)
+def build_coldpreview_variants_for_all(db: Session = Depends(get_db), _: None = Depends(require_owner)):
+    """Start a background job rendering missing 300/600 px coldpreview variants.
 
-    Reads hotpreview_b64 from the database — no original files needed.
-    Safe to call multiple times; skips photos that already have both hashes.
+    Reads the coldpreviews on disk — no original files needed. Returns the
+    job already pending or running if there is one; skips variants that
+    already exist. Poll GET /photos/build-coldpreview-variants/{job_id}.
     """
-    return photo_service.compute_perceptual_hashes_for_all(db)
+    return variant_backfill.start(db)
+
+
+@router.get("/build-coldpreview-variants/{job_id}", response_model=ColdpreviewVariantJobOut)
+def get_coldpreview_variant_job(job_id: uuid.UUID, db: Session = Depends(get_db)):
+    return variant_backfill.get_or_404(db, job_id)
+
+
+@router.post("/similar-pairs", response_model=list[SimilarPair])
+def get_similar_pairs(
+    data: SimilarPairsRequest,
+    db: Session = Depends(get_db),
+    photographer: Photographer | None = Depends(get_requesting_photographer),
+):
+    """Pairs of visually similar photos (perceptual-hash distance), closest first.
+
+    With hothashes, only pairs involving those photos; without, the whole
+    library — one index lookup per photo, so seconds for a large library.
+    """
+    return similarity_index.similar_pairs(
+        db, data.hash, data.max_distance, data.hothashes, data.limit, photographer,
+    )
 
 
 @router.get("/timeline", response_model=list[TimelineBucket])
@@ -114,12 +224,58 @@ def get_timeline_events(
     return photo_service.timeline_events(db, from_date, to_date)
 
 
+@router.post("/timeline/rebuild", response_model=TimelineRebuildResult)
+def rebuild_timeline(db: Session = Depends(get_db), _: None = Depends(require_owner)):
+    """Recompute the per-day timeline rollup from all photos.
+
+    The rollup is maintained incrementally; this repairs drift after direct
+    database edits. Safe to call at any time.
+    """
+    return photo_service.rebuild_timeline(db)
+
+
 @router.get("/{hothash}", response_model=PhotoDetail)
 def get_photo(hothash: str, db: Session = Depends(get_db)):
     photo = photo_service.get_by_hothash(db, hothash)
     return PhotoDetail.model_validate(photo)
 
 
+@router.get("/{hothash}/neighbours", response_model=PhotoNeighbours)
+def get_neighbours(
+    hothash: str,
+    db: Session = Depends(get_db),
+    filters: dict = Depends(_list_filters),
+    sort: str = "taken_at_desc",
+    n: int = Query(default=1, ge=1, le=100),
+    seed: int | None = None,
+    include_hotpreview: bool = True,
+):
+    """Up to n photos before and after hothash in the same listing as GET /photos."""
+    prev, nxt = photo_service.neighbours(
+        db, hothash, n=n, sort=sort, seed=seed, include_hotpreview=include_hotpreview, **filters,
+    )
+    return PhotoNeighbours(
+        prev=[PhotoListItem.model_validate(p) for p in prev],
+        next=[PhotoListItem.model_validate(p) for p in nxt],
+    )
+
+
+@router.get("/{hothash}/similar", response_model=list[SimilarPhoto])
+def get_similar(
+    hothash: str,
+    hash: str = "dct",
+    max_distance: int = Query(default=10, ge=0, le=similarity_index.MAX_DISTANCE),
+    limit: int = Query(default=100, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    photographer: Photographer | None = Depends(get_requesting_photographer),
+):
+    """Photos whose perceptual hash is within max_distance bits of this one's, nearest first.
+
+    hash selects the hash kind: dct (pHash) or difference (dHash).
+    """
+    return similarity_index.similar(db, hothash, hash, max_distance, limit, photographer)
+
+
 @router.get("/{hothash}/files", response_model=list[ImageFileSchema])
 def get_photo_files(hothash: str, db: Session = Depends(get_db)):
     files = photo_service.get_image_files(db, hothash)
@@ -148,21 +304,27 @@ def download_photo(
 
 
 @router.get("/{hothash}/coldpreview")
-def get_coldpreview(hothash: str, db: Session = Depends(get_db)):
+def get_coldpreview(
+    hothash: str,
+    max_px: int | None = Query(default=None, ge=1),
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
     """Serve the coldpreview image, applying any stored correction on-the-fly.
 
+    max_px: serve the smallest pre-rendered variant (300/600 px) that covers it.
     Returns 404 if the photo does not exist or the coldpreview file is missing.
-    ETag is set to the hothash (no correction) or hothash+correction_timestamp (with correction).
+    ETag is hothash plus a digest of source variant, correction and EXIF;
+    a matching If-None-Match returns 304 without any image work.
     """
-    image_bytes, etag = photo_service.serve_coldpreview(db, hothash)
-    return Response(
-        content=image_bytes,
-        media_type="image/jpeg",
-        headers={
-            "ETag": f'"{etag}"',
-            "Cache-Control": "private, max-age=3600",
-        },
-    )
+    jpeg, etag = photo_service.serve_coldpreview(db, hothash, max_px, if_none_match)
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": "private, max-age=3600",
+    }
+    if jpeg is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=jpeg, media_type="image/jpeg", headers=headers)
 
 
 @router.post("/{hothash}/companions", response_model=ImageFileSchema, status_code=201)
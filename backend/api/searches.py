@@ -1,17 +1,21 @@
+import re
 import uuid
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from core import encoding
 from database.session import get_db
 from middleware.machine_auth import get_requesting_photographer
 from models.photographer import Photographer
-from schemas.photo import PhotoListItem
+from schemas.photo import MapCluster, PhotoListItem, PhotoNeighbours
 from schemas.saved_search import (
-    ExecuteSearchRequest, SavedSearchCreate, SavedSearchOut, SavedSearchPatch,
-    TimelineRequest, TimelineYear,
+    ExecuteSearchRequest, ExportSearchRequest, MapClustersRequest, SavedSearchCreate, SavedSearchOut, SavedSearchPatch, SearchFacets,
+    SearchFacetsRequest, SearchNeighboursRequest, SemanticSearchRequest, TimelineRequest, TimelineYear,
 )
-from services import search_service
+from services import photo_service, search_export, search_service, semantic_search
 
 router = APIRouter(prefix="/searches", tags=["searches"])
 
@@ -29,28 +33,147 @@ def create_search(data: SavedSearchCreate, db: Session = Depends(get_db)):
 # POST routes must be declared before GET /{search_id} to avoid route conflicts
 @router.post("/execute", response_model=list[PhotoListItem])
 def execute_search(
+    request: Request,
     req: ExecuteSearchRequest,
     db: Session = Depends(get_db),
     photographer: Photographer | None = Depends(get_requesting_photographer),
 ):
-    photos = search_service.execute(
+    items, next_cursor = search_service.execute(
         db, req.logic, req.criteria, req.sort, req.limit, req.offset, req.date_filter,
         requesting_photographer=photographer,
+        include_hotpreview=req.include_hotpreview,
+        cursor=req.cursor,
+        seed=req.seed,
+        search_id=req.search_id,
     )
-    return photos
+    response = photo_service.list_items_response(request, items, next_cursor)
+    if req.total:
+        logic, criteria = search_service.resolve_criteria(db, req.search_id, req.logic, req.criteria)
+        response.headers["X-Total-Count"] = str(search_service.total(
+            db, logic, criteria, req.total, req.date_filter, requesting_photographer=photographer,
+        ))
+    return response
+
+
+@router.post("/facets", response_model=SearchFacets)
+def search_facets(
+    req: SearchFacetsRequest,
+    db: Session = Depends(get_db),
+    photographer: Photographer | None = Depends(get_requesting_photographer),
+):
+    """Exact total and facet counts for a search, cached until the library changes."""
+    return search_service.facets(
+        db, req.logic, req.criteria, req.date_filter, requesting_photographer=photographer,
+    )
+
+
+@router.post("/neighbours", response_model=PhotoNeighbours)
+def search_neighbours(
+    req: SearchNeighboursRequest,
+    db: Session = Depends(get_db),
+    photographer: Photographer | None = Depends(get_requesting_photographer),
+):
+    """Up to n results before and after one photo — lets quickview step without re-running the search."""
+    logic, criteria = search_service.resolve_criteria(db, req.search_id, req.logic, req.criteria)
+    prev, nxt = search_service.neighbours(
+        db, req.hothash, req.n, logic, criteria, req.sort, req.date_filter,
+        requesting_photographer=photographer,
+        include_hotpreview=req.include_hotpreview,
+        seed=req.seed,
+    )
+    return PhotoNeighbours(
+        prev=[PhotoListItem.model_validate(p) for p in prev],
+        next=[PhotoListItem.model_validate(p) for p in nxt],
+    )
+
+
+@router.post("/semantic", response_model=list[PhotoListItem])
+def search_semantic(
+    request: Request,
+    req: SemanticSearchRequest,
+    db: Session = Depends(get_db),
+    photographer: Photographer | None = Depends(get_requesting_photographer),
+):
+    """Search results ranked by CLIP similarity to q — needs AI_SEARCH_URL (the worker)."""
+    items, next_cursor = semantic_search.search(
+        db, req.q, req.logic, req.criteria, req.limit, req.offset, req.date_filter,
+        requesting_photographer=photographer,
+        include_hotpreview=req.include_hotpreview,
+        cursor=req.cursor,
+    )
+    return photo_service.list_items_response(request, items, next_cursor)
+
+
+@router.post("/export")
+def export_search(
+    req: ExportSearchRequest,
+    db: Session = Depends(get_db),
+    photographer: Photographer | None = Depends(get_requesting_photographer),
+):
+    """Every result with EXIF, file paths and tag names, streamed as NDJSON or CSV."""
+    logic, criteria = search_service.resolve_criteria(db, req.search_id, req.logic, req.criteria)
+    return _export_response(db, req.format, logic, criteria, req.sort, req.date_filter, photographer, "search")
+
+
+@router.post("/map-clusters", response_model=list[MapCluster])
+def search_map_clusters(
+    request: Request,
+    req: MapClustersRequest,
+    db: Session = Depends(get_db),
+    photographer: Photographer | None = Depends(get_requesting_photographer),
+):
+    """Pre-clustered map markers for the search results inside the box."""
+    clusters = search_service.map_clusters(
+        db, req.logic, req.criteria, req.zoom, req.west, req.south, req.east, req.north,
+        req.date_filter, requesting_photographer=photographer,
+    )
+    return encoding.respond(request, clusters)
 
 
 @router.post("/timeline", response_model=list[TimelineYear])
 def search_timeline(
+    request: Request,
     req: TimelineRequest,
     db: Session = Depends(get_db),
     photographer: Photographer | None = Depends(get_requesting_photographer),
 ):
-    return search_service.timeline(
+    years = search_service.timeline(
         db, req.logic, req.criteria,
         session_id=req.session_id,
         event_id=req.event_id,
         requesting_photographer=photographer,
+        search_id=req.search_id,
+    )
+    return encoding.respond(request, years)
+
+
+@router.get("/{search_id}/export")
+def export_saved_search(
+    search_id: uuid.UUID,
+    format: str = Query(default="ndjson"),
+    sort: str = Query(default="taken_at_desc"),
+    db: Session = Depends(get_db),
+    photographer: Photographer | None = Depends(get_requesting_photographer),
+):
+    """Download link variant of POST /searches/export for a saved search."""
+    saved = search_service.get_or_404(db, search_id)
+    return _export_response(
+        db, format, saved.logic, search_service.saved_criteria(saved), sort, None, photographer, saved.name,
+    )
+
+
+def _export_response(db, fmt, logic, criteria, sort, date_filter, photographer, name) -> StreamingResponse:
+    chunks = search_export.stream(db, fmt, logic, criteria, sort, date_filter, requesting_photographer=photographer)
+    safe_name = re.sub(r'[^\w\-. ]', '_', name).strip() or "search"
+    filename = f"{safe_name}.{fmt}"
+    # Headers are Latin-1: non-ASCII names go in filename* (RFC 5987) with an ASCII fallback
+    disposition = f'attachment; filename="{re.sub(r"[^ -~]", "_", filename)}"'
+    if not filename.isascii():
+        disposition += f"; filename*=UTF-8''{quote(filename)}"
+    return StreamingResponse(
+        chunks,
+        media_type=search_export.FORMATS[fmt],
+        headers={"Content-Disposition": disposition},
     )
 
 
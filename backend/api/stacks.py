@@ -1,8 +1,9 @@
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
+from core import encoding
 from database.session import get_db
 from schemas.stack import StackAddPhotos, StackCreate, StackDetail, StackOut
 from services import stack_service
@@ -26,8 +27,8 @@ def dissolve_stack(data: StackAddPhotos, db: Session = Depends(get_db)):
 
 
 @router.get("", response_model=list[StackOut])
-def list_stacks(db: Session = Depends(get_db)):
-    return stack_service.list_all(db)
+def list_stacks(request: Request, db: Session = Depends(get_db)):
+    return encoding.respond(request, stack_service.list_all(db))
 
 
 @router.get("/{stack_id}", response_model=StackDetail)
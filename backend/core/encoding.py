@@ -0,0 +1,148 @@
+"""Negotiated encoding for the bulk read endpoints.
+
+    return encoding.respond(request, items, headers={"X-Next-Cursor": cursor})
+
+The body is JSON encoded with orjson, or MessagePack when the client asks
+for it with "Accept: application/msgpack". Bodies of at least
+COMPRESS_MIN_BYTES are compressed with zstd or gzip when the client accepts
+it — but only when they are text-heavy: base64 hotpreviews are JPEG data
+and shrink by a few percent at most, so a list carrying them would spend
+seconds of CPU for almost nothing. A fast zlib pass over the first
+_SAMPLE_BYTES decides. Binary payloads (JPEGs, hotpreview packs) never go
+through here.
+
+msgpack and zstandard are optional ("compact" extra). Without msgpack the
+response is JSON; without zstandard only gzip is offered. If orjson is not
+installed pydantic-core's encoder is used.
+
+Settings.fast_responses=false falls back to FastAPI's own encoding
+(pydantic JSON mode + json.dumps) and disables MessagePack and compression;
+Settings.response_compression=false disables only compression (e.g. when a
+reverse proxy already compresses).
+"""
+
+import datetime
+import gzip
+import json
+import uuid
+import zlib
+from decimal import Decimal
+from typing import Any
+
+import pydantic_core
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+_MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+COMPRESS_MIN_BYTES = 1024
+_SAMPLE_BYTES = 64 * 1024
+_MIN_SAMPLE_RATIO = 2.0
+_GZIP_LEVEL = 5
+_ZSTD_LEVEL = 3
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson/msgpack do not know. Output matches pydantic's JSON mode."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, datetime.datetime):
+        return pydantic_core.to_jsonable_python(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not serializable: {type(obj).__name__}")
+
+
+def dump_json(content: Any) -> bytes:
+    if orjson is not None:
+        # OPT_UTC_Z: "...Z" like pydantic instead of "+00:00"
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return pydantic_core.to_json(content)
+
+
+def dump_json_standard(content: Any) -> bytes:
+    """What FastAPI produces with a response_model: pydantic's JSON mode, then json.dumps."""
+    return json.dumps(
+        pydantic_core.to_jsonable_python(content), ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def dump_msgpack(content: Any) -> bytes:
+    # datetime=False: datetimes go through _default as ISO strings, as in JSON
+    return msgpack.packb(content, default=_default, datetime=False)
+
+
+def _accepts_msgpack(request: Request) -> bool:
+    accept = request.headers.get("accept", "")
+    return msgpack is not None and any(t in accept for t in _MSGPACK_TYPES)
+
+
+def _accepted_encodings(request: Request) -> set[str]:
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def _text_heavy(body: bytes) -> bool:
+    sample = body[:_SAMPLE_BYTES]
+    return len(sample) >= _MIN_SAMPLE_RATIO * len(zlib.compress(sample, 1))
+
+
+def compress(request: Request, body: bytes) -> tuple[bytes, str | None]:
+    """(body, content-encoding) — zstd before gzip; small or incompressible bodies untouched."""
+    if len(body) < COMPRESS_MIN_BYTES or not _text_heavy(body):
+        return body, None
+    accepted = _accepted_encodings(request)
+    if zstandard is not None and "zstd" in accepted:
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(body), "zstd"
+    if "gzip" in accepted:
+        return gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0), "gzip"
+    return body, None
+
+
+def respond(request: Request, content: Any, headers: dict[str, str] | None = None) -> Response:
+    """Encode content for request. content is JSON-like data; pydantic models,
+    datetimes and UUIDs may appear anywhere in it."""
+    headers = dict(headers or {})
+    if not settings.fast_responses:
+        return Response(content=dump_json_standard(content), media_type=JSON, headers=headers)
+
+    if _accepts_msgpack(request):
+        body, media_type = dump_msgpack(content), MSGPACK
+    else:
+        body, media_type = dump_json(content), JSON
+    headers["Vary"] = "Accept, Accept-Encoding"
+
+    if settings.response_compression:
+        body, content_encoding = compress(request, body)
+        if content_encoding:
+            headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type=media_type, headers=headers)
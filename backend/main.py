@@ -15,6 +15,7 @@ from models.settings import SystemSettings
 async def lifespan(app: FastAPI):
     _run_migrations()
     _bootstrap_settings()
+    _resume_jobs()
     yield
 
 
@@ -25,6 +26,12 @@ def _run_migrations() -> None:
     command.upgrade(cfg, "head")
 
 
+def _resume_jobs() -> None:
+    from services import hash_backfill, variant_backfill
+    hash_backfill.resume_interrupted()
+    variant_backfill.resume_interrupted()
+
+
 app = FastAPI(title="Hotprevue", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
@@ -58,6 +65,8 @@ import models.ai  # noqa: F401
 import models.kind  # noqa: F401
 import models.tag  # noqa: F401
 import models.stack  # noqa: F401
+import models.perceptual_hash_job  # noqa: F401
+import models.coldpreview_variant_job  # noqa: F401
 
 from api import admin, ai, auth, collections, events, file_copy, input_sessions, kinds, machines, photographers, photos, searches, settings as settings_api, share, shortcuts, stacks, stats, system, tags, text_items  # noqa: E402
 app.include_router(auth.router)
@@ -28,3 +28,8 @@ class AiPhotoStatus(Base):
     face_count: Mapped[int | None] = mapped_column(Integer, nullable=True)  # faces capability only
     analyzed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # clip only: bumped by a trigger on photos whenever a field of the point's
+    # filter payload changes (services/semantic_search.clip_payload); the worker
+    # acknowledges the version it pushed via POST /ai/payloads
+    payload_version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    payload_synced_version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
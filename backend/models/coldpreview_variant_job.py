@@ -0,0 +1,15 @@
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+from models.chunked_job import ChunkedJob
+
+
+class ColdpreviewVariantJob(ChunkedJob, Base):
+    """One run of the coldpreview-variant backfill (services/variant_backfill.py)."""
+
+    __tablename__ = "coldpreview_variant_jobs"
+
+    written: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    photos_updated: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    missing_coldpreview: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,49 @@
+from sqlalchemy import BigInteger, CheckConstraint, Identity, SmallInteger, text
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from models.base import Base
+
+# Every committed transaction that changes photos, photo_tags, tags, events,
+# photographers, photo_corrections or image_files adds one row to
+# library_generation_log (statement triggers, migrations a0b1c2d3e062 and
+# b1c2d3e4f063). The generation — a cheap version stamp for cached search
+# results — is the number of those transactions visible in the reader's
+# snapshot, so it only moves when a writer's rows become visible.
+# Writers only insert new rows and never wait on each other; readers fold the log
+# into library_generation.folded now and then, which leaves the sum unchanged.
+
+FOLD_ROWS = 10_000
+
+
+class LibraryGeneration(Base):
+    __tablename__ = "library_generation"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_library_generation_single_row"),)
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    folded: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class LibraryGenerationLog(Base):
+    __tablename__ = "library_generation_log"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+
+
+def current_generation(db: Session) -> tuple[int, int]:
+    """(generation, log rows not yet folded) as seen by db's snapshot.
+
+    Read it in the same REPEATABLE READ transaction as the query it versions.
+    """
+    folded, logged = db.execute(text(
+        "SELECT folded, (SELECT count(*) FROM library_generation_log) FROM library_generation"
+    )).one()
+    return folded + logged, logged
+
+
+def fold_log(db: Session) -> None:
+    """Move the committed log rows into library_generation.folded, in one transaction."""
+    db.execute(text("""
+        WITH gone AS (DELETE FROM library_generation_log RETURNING 1)
+        UPDATE library_generation SET folded = folded + (SELECT count(*) FROM gone)
+    """))
+    db.commit()
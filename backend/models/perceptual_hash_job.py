@@ -0,0 +1,13 @@
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+from models.chunked_job import ChunkedJob
+
+
+class PerceptualHashJob(ChunkedJob, Base):
+    """One run of the perceptual-hash backfill (services/hash_backfill.py)."""
+
+    __tablename__ = "perceptual_hash_jobs"
+
+    updated: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
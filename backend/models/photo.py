@@ -1,8 +1,9 @@
+import base64
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import Base
@@ -17,7 +18,6 @@ class Photo(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     hothash: Mapped[str] = mapped_column(String, unique=True, nullable=False, index=True)
-    hotpreview_b64: Mapped[str] = mapped_column(Text, nullable=False)
 
     taken_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     taken_at_source: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -95,6 +95,9 @@ class Photo(Base):
     exposure_clipping: Mapped[float | None] = mapped_column(Float, nullable=True)
     noise_score: Mapped[float | None] = mapped_column(Float, nullable=True)
 
+    # RAW coldpreview tier: "embedded" | "half_size" | "full" — NULL for non-RAW
+    coldpreview_source: Mapped[str | None] = mapped_column(String, nullable=True)
+
     is_shared: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     share_caption: Mapped[str | None] = mapped_column(Text, nullable=True)
     share_downloads: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
@@ -104,8 +107,31 @@ class Photo(Base):
     public_share_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     registered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Fixed random position in the sort=random shuffle (services/photo_cursor.py)
+    shuffle_key: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("floor(random() * 2147483647)::integer"),
+    )
+    # Mirror of photo_tags for the GIN-indexed tag criteria — maintained by
+    # services/tag_service.py, never written directly
+    tag_ids: Mapped[list[uuid.UUID]] = mapped_column(
+        ARRAY(UUID(as_uuid=True)), nullable=False, server_default=text("'{}'"),
+    )
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    @property
+    def hotpreview_b64(self) -> str | None:
+        """Read by PhotoListItem schema. Load with selectinload(Photo.hotpreview) for lists.
+
+        None when the query used noload(Photo.hotpreview) (include_hotpreview=false).
+        """
+        if self.hotpreview is None:
+            return None
+        return base64.b64encode(self.hotpreview.jpeg).decode("ascii")
+
+    @hotpreview_b64.setter
+    def hotpreview_b64(self, value: str) -> None:
+        self.hotpreview = PhotoHotpreview(jpeg=base64.b64decode(value))
+
     @property
     def has_correction(self) -> bool:
         """Read by PhotoListItem schema (from_attributes=True). Requires correction to be loaded."""
@@ -149,6 +175,14 @@ class Photo(Base):
         back_populates="photo",
         cascade="all, delete-orphan",
     )
+    # Raw JPEG bytes live in their own table so that queries on photos do not
+    # drag ~5 KB of thumbnail per row along
+    hotpreview: Mapped["PhotoHotpreview"] = relationship(
+        "PhotoHotpreview",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
     correction: Mapped["PhotoCorrection | None"] = relationship(
         "PhotoCorrection",
         back_populates="photo",
@@ -163,6 +197,19 @@ class Photo(Base):
     )
 
 
+class PhotoHotpreview(Base):
+    """150×150 hotpreview JPEG (the bytes hothash is computed from)."""
+
+    __tablename__ = "photo_hotpreviews"
+
+    photo_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("photos.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    jpeg: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
 class ImageFile(Base):
     __tablename__ = "image_files"
 
@@ -171,6 +218,7 @@ class ImageFile(Base):
         UUID(as_uuid=True),
         ForeignKey("photos.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     file_path: Mapped[str] = mapped_column(String, nullable=False)
     file_type: Mapped[str] = mapped_column(String, nullable=False)  # RAW, JPEG, TIFF, PNG, HEIC, XMP
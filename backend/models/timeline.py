@@ -0,0 +1,38 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class TimelineDay(Base):
+    """Per-day rollup of dated, non-deleted photos (UTC day of taken_at).
+
+    Maintained by services/timeline_rollup.py — never written directly.
+    """
+    __tablename__ = "timeline_days"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Newest photo of the day
+    cover_hothash: Mapped[str] = mapped_column(String, nullable=False)
+    cover_taken_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class TimelineDayEvent(Base):
+    """Per-day, per-event photo counts and time span for the timeline balloons."""
+    __tablename__ = "timeline_day_events"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("events.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_taken_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_taken_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -115,6 +115,9 @@ class GroupPayload(BaseModel):
     exposure_clipping: float | None = None
     noise_score: float | None = None
 
+    # RAW coldpreview tier reported by the agent ("embedded" | "half_size" | "full")
+    coldpreview_source: str | None = None
+
     # Optional assignment overrides (falls back to session defaults)
     photographer_id: uuid.UUID | None = None
     event_id: uuid.UUID | None = None
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ImageFileSchema(BaseModel):
@@ -38,7 +38,7 @@ class PhotoListItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     hothash: str
-    hotpreview_b64: str
+    hotpreview_b64: str | None  # None when listed with include_hotpreview=false
     taken_at: datetime | None
     taken_at_accuracy: str
     rating: int | None
@@ -73,6 +73,13 @@ class PhotoListItem(BaseModel):
     focal_length: float | None
 
 
+class PhotoNeighbours(BaseModel):
+    """Photos around one photo in a sorted listing, nearest first."""
+
+    prev: list[PhotoListItem]
+    next: list[PhotoListItem]
+
+
 class CompanionCreate(BaseModel):
     path: str
     type: str
@@ -91,6 +98,7 @@ class PhotoDetail(PhotoListItem):
     exposure_mean: float | None
     exposure_clipping: float | None
     noise_score: float | None
+    coldpreview_source: str | None
     is_shared: bool
     share_caption: str | None
     share_downloads: bool
@@ -192,9 +200,58 @@ class BatchResult(BaseModel):
     updated: int
 
 
-class PerceptualHashComputeResult(BaseModel):
-    updated: int
-    already_computed: int
+class ChunkedJobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    status: str       # pending | running | completed | failed
+    total: int        # photos left to process when the job (last) started
+    processed: int
+    failed: int
+    started_at: datetime
+    progressed_at: datetime | None  # last committed chunk
+    completed_at: datetime | None
+    error: str | None
+
+
+class PerceptualHashJobOut(ChunkedJobOut):
+    updated: int      # hashes computed and stored; failed = missing or undecodable hotpreview
+
+
+class ColdpreviewVariantJobOut(ChunkedJobOut):
+    written: int            # variant files rendered; failed = undecodable coldpreview
+    photos_updated: int     # photos that got at least one new variant
+    missing_coldpreview: int
+
+
+class MapCluster(BaseModel):
+    lat: float    # centroid
+    lng: float
+    count: int
+    hothash: str  # one photo of the cluster, for the marker thumbnail
+
+
+class SimilarPhoto(BaseModel):
+    hothash: str
+    distance: int  # Hamming distance between the perceptual hashes (0–64)
+
+
+class SimilarPairsRequest(BaseModel):
+    hash: str = "dct"                   # "dct" or "difference"
+    max_distance: int = Field(default=6, ge=0, le=16)
+    hothashes: list[str] | None = None  # only pairs involving these; None = whole library
+    limit: int = Field(default=1000, ge=1, le=100_000)
+
+
+class SimilarPair(BaseModel):
+    a: str  # a < b
+    b: str
+    distance: int
+
+
+class TimelineRebuildResult(BaseModel):
+    days: int         # timeline_days rows written
+    event_days: int   # timeline_day_events rows written
 
 
 class TimelineBucket(BaseModel):
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SearchCriterion(BaseModel):
@@ -47,6 +47,64 @@ class ExecuteSearchRequest(BaseModel):
     # Used by the timeline day-view to scope results to a single calendar day
     # without altering the user's OR/AND search logic. See docs/decisions/006-timeline.md.
     date_filter: str | None = None  # ISO date "YYYY-MM-DD"
+    # False: hotpreview_b64 is null — fetch thumbnails via GET /photos/hotpreviews
+    include_hotpreview: bool = True
+    # Keyset paging: X-Next-Cursor from the previous page; offset is then ignored
+    cursor: str | None = None
+    # sort=random: the shuffle to follow (drawn per request when omitted)
+    seed: int | None = None
+    # "exact" | "estimate": report the number of matches in X-Total-Count
+    total: str | None = None
+    # Run this saved search instead of logic/criteria; pages come from its
+    # cached result order until the library changes
+    search_id: uuid.UUID | None = None
+
+
+class SearchNeighboursRequest(ExecuteSearchRequest):
+    hothash: str
+    n: int = Field(default=1, ge=1, le=100)
+
+
+class SearchFacetsRequest(BaseModel):
+    logic: str = "AND"
+    criteria: list[SearchCriterion] = []
+    date_filter: str | None = None  # same meaning as on ExecuteSearchRequest
+
+
+class SemanticSearchRequest(SearchFacetsRequest):
+    q: str = Field(min_length=1)  # free text, matched against CLIP image embeddings
+    limit: int = Field(default=100, ge=1, le=500)
+    offset: int = 0
+    include_hotpreview: bool = True
+    # X-Next-Cursor from the previous page; offset is then ignored
+    cursor: str | None = None
+
+
+class ExportSearchRequest(SearchFacetsRequest):
+    format: str = "ndjson"  # "ndjson" | "csv"
+    sort: str = "taken_at_desc"
+    # Export this saved search instead of logic/criteria
+    search_id: uuid.UUID | None = None
+
+
+class MapClustersRequest(SearchFacetsRequest):
+    zoom: int = Field(ge=0, le=22)
+    west: float = Field(ge=-180, le=180)
+    south: float = Field(ge=-90, le=90)
+    east: float = Field(ge=-180, le=180)
+    north: float = Field(ge=-90, le=90)
+
+
+class FacetBucket(BaseModel):
+    value: str | int | None  # None = photos without a value
+    label: str | None = None  # display name for photographer, event and tags
+    count: int
+
+
+class SearchFacets(BaseModel):
+    total: int
+    # camera_model, lens_model, rating, year, photographer, event, tags — largest first
+    facets: dict[str, list[FacetBucket]]
 
 
 class TimelineRequest(BaseModel):
@@ -54,6 +112,8 @@ class TimelineRequest(BaseModel):
     criteria: list[SearchCriterion] = []
     session_id: uuid.UUID | None = None
     event_id: uuid.UUID | None = None
+    # Saved search to use instead of logic/criteria; the tree is cached
+    search_id: uuid.UUID | None = None
 
 
 class TimelineDay(BaseModel):
@@ -16,6 +16,7 @@ class GlobalSettingsOut(BaseModel):
     browse_buffer_size: int
     coldpreview_max_px: int
     coldpreview_quality: int
+    coldpreview_raw_full_quality: bool
     copy_verify_after_copy: bool
     copy_include_videos: bool
     public_share_relay_url: str | None
@@ -34,6 +35,7 @@ class GlobalSettingsPatch(BaseModel):
     browse_buffer_size: int | None = None
     coldpreview_max_px: int | None = None
     coldpreview_quality: int | None = None
+    coldpreview_raw_full_quality: bool | None = None
     copy_verify_after_copy: bool | None = None
     copy_include_videos: bool | None = None
     public_share_relay_url: str | None = None
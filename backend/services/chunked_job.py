@@ -0,0 +1,147 @@
+"""Chunked background jobs over the photos (hash_backfill, variant_backfill).
+
+A job walks the photos its kind still has to process in id order, CHUNK_ROWS
+at a time, hands each chunk to the kind's process function — which maps the
+heavy work over a process pool — and commits the chunk together with the
+job's progress and keyset position (last_photo_id). All kinds share one
+background thread, so one job, and one process pool, runs at a time. A job
+interrupted by a restart is resumed from its last committed chunk at startup
+(resume_interrupted()); at most one chunk is done again.
+
+A kind only supplies its job model, the query for its pending photos and the
+per-chunk work (JobKind).
+"""
+
+import os
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Query, Session, sessionmaker
+
+from models.chunked_job import ChunkedJob
+from models.photo import Photo
+
+# Photos per fetch, pool batch and commit
+CHUNK_ROWS = 500
+# Leave one core to the API
+WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+ACTIVE = ("pending", "running")
+
+# One worker for every kind — jobs run sequentially
+_executor = ThreadPoolExecutor(max_workers=1)
+
+
+@dataclass(frozen=True)
+class JobKind:
+    model: type[ChunkedJob]
+    name: str                         # in 404 details, e.g. "Perceptual hash job"
+    pending: Callable[[Session], Query]  # rows for the photos left to process, unordered
+    # (db, job, rows, pool) → count the chunk into job; may return a callback for after its commit
+    process: Callable[[Session, ChunkedJob, list, Executor], Callable[[], None] | None]
+
+
+def chunk_query(q: Query, after: uuid.UUID | None) -> Query:
+    """The next chunk of q after the keyset position."""
+    if after is not None:
+        q = q.filter(Photo.id > after)
+    return q.order_by(Photo.id).limit(CHUNK_ROWS)
+
+
+def pool_map(pool: Executor, fn, items: list) -> list:
+    """pool.map over one chunk, in about one batch per worker."""
+    return list(pool.map(fn, items, chunksize=max(1, len(items) // WORKERS)))
+
+
+def _remaining(db: Session, kind: JobKind, after: uuid.UUID | None) -> int:
+    q = kind.pending(db).with_entities(Photo.id)
+    if after is not None:
+        q = q.filter(Photo.id > after)
+    return q.count()
+
+
+def _chunk(db: Session, kind: JobKind, after: uuid.UUID | None) -> list:
+    return chunk_query(kind.pending(db), after).all()
+
+
+def start(db: Session, kind: JobKind) -> ChunkedJob:
+    """Start a job of this kind, or return the one already pending or running."""
+    job = (
+        db.query(kind.model)
+        .filter(kind.model.status.in_(ACTIVE))
+        .order_by(kind.model.started_at)
+        .first()
+    )
+    if job is not None:
+        return job
+    job = kind.model(status="pending", total=_remaining(db, kind, None))
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _submit(kind, job.id)
+    return job
+
+
+def get_or_404(db: Session, kind: JobKind, job_id: uuid.UUID) -> ChunkedJob:
+    job = db.get(kind.model, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"{kind.name} not found")
+    return job
+
+
+def resume_interrupted(kind: JobKind) -> None:
+    """Resubmit the jobs a previous process left pending or running (call at startup)."""
+    from database.session import SessionLocal
+
+    with SessionLocal() as db:
+        ids = [
+            job_id for (job_id,) in db.query(kind.model.id)
+            .filter(kind.model.status.in_(ACTIVE))
+            .order_by(kind.model.started_at)
+        ]
+    for job_id in ids:
+        _submit(kind, job_id)
+
+
+def _submit(kind: JobKind, job_id: uuid.UUID) -> None:
+    from database.session import SessionLocal
+
+    _executor.submit(run, kind, job_id, SessionLocal)
+
+
+def run(kind: JobKind, job_id: uuid.UUID, session_factory: sessionmaker) -> None:
+    """Process a job to the end, committing after every chunk."""
+    with session_factory() as db:
+        job = db.get(kind.model, job_id)
+        if job is None or job.status not in ACTIVE:
+            return
+        job.status = "running"
+        job.total = job.processed + _remaining(db, kind, job.last_photo_id)
+        db.commit()
+
+        try:
+            with ProcessPoolExecutor(max_workers=WORKERS, mp_context=get_context("spawn")) as pool:
+                while rows := _chunk(db, kind, job.last_photo_id):
+                    after_commit = kind.process(db, job, rows, pool)
+                    job.processed += len(rows)
+                    job.last_photo_id = rows[-1].id
+                    job.progressed_at = datetime.now(timezone.utc)
+                    db.commit()
+                    if after_commit is not None:
+                        after_commit()
+
+            job.status = "completed"
+            job.completed_at = datetime.now(timezone.utc)
+            db.commit()
+
+        except Exception as exc:
+            db.rollback()
+            job.status = "failed"
+            job.error = str(exc)
+            job.completed_at = datetime.now(timezone.utc)
+            db.commit()
@@ -21,11 +21,9 @@ def _item_count(db: Session, collection_id: uuid.UUID) -> int:
 
 def _enrich_items(db: Session, items: list[CollectionItem]) -> list[CollectionItem]:
     """Attach hotpreview_b64 from Photo and markup from TextItem for all items."""
-    hothashes = [item.hothash for item in items if item.hothash]
-    preview_map: dict[str, str] = {}
-    if hothashes:
-        photos = db.query(Photo).filter(Photo.hothash.in_(hothashes)).all()
-        preview_map = {p.hothash: p.hotpreview_b64 for p in photos}
+    from services.photo_service import hotpreview_b64_map
+
+    preview_map = hotpreview_b64_map(db, (item.hothash for item in items if item.hothash))
 
     ti_ids = [item.text_item_id for item in items if item.text_item_id]
     markup_map: dict[uuid.UUID, str] = {}
@@ -0,0 +1,71 @@
+"""Background backfill of perceptual hashes (POST /photos/compute-perceptual-hashes).
+
+A chunked job (services/chunked_job.py) over the photos lacking a hash — the
+keyset runs on ix_photos_missing_perceptual_hash. Each chunk's hashes are
+computed from the stored hotpreviews on the process pool and committed with
+the job's progress.
+
+Photos whose hotpreview is missing or cannot be decoded are counted as failed
+and left without hashes; a later job tries them again.
+"""
+
+import uuid
+from concurrent.futures import Executor
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session, sessionmaker
+
+from models.perceptual_hash_job import PerceptualHashJob
+from models.photo import Photo, PhotoHotpreview
+from services import chunked_job
+
+_MISSING = Photo.dct_perceptual_hash.is_(None) | Photo.difference_hash.is_(None)
+
+
+def _pending(db: Session):
+    return (
+        db.query(Photo.id, Photo.hothash, PhotoHotpreview.jpeg)
+        .outerjoin(PhotoHotpreview, PhotoHotpreview.photo_id == Photo.id)
+        .filter(_MISSING)
+    )
+
+
+def _process(db: Session, job: PerceptualHashJob, rows: list, pool: Executor):
+    from services import similarity_index
+    from utils.previews import try_perceptual_hashes
+
+    hashes = chunked_job.pool_map(pool, try_perceptual_hashes, [r.jpeg for r in rows])
+    computed = [(r, h) for r, h in zip(rows, hashes) if h is not None]
+    if computed:
+        db.execute(update(Photo), [
+            {"id": r.id, "dct_perceptual_hash": h[0], "difference_hash": h[1]}
+            for r, h in computed
+        ])
+    job.updated += len(computed)
+    job.failed += len(rows) - len(computed)
+
+    def index_committed() -> None:
+        for r, (dct_hash, diff_hash) in computed:
+            similarity_index.photo_added(r.hothash, dct_hash, diff_hash)
+
+    return index_committed
+
+
+KIND = chunked_job.JobKind(PerceptualHashJob, "Perceptual hash job", _pending, _process)
+
+
+def start(db: Session) -> PerceptualHashJob:
+    """Start a backfill job, or return the one already pending or running."""
+    return chunked_job.start(db, KIND)
+
+
+def get_or_404(db: Session, job_id: uuid.UUID) -> PerceptualHashJob:
+    return chunked_job.get_or_404(db, KIND, job_id)
+
+
+def resume_interrupted() -> None:
+    chunked_job.resume_interrupted(KIND)
+
+
+def run(job_id: uuid.UUID, session_factory: sessionmaker) -> None:
+    chunked_job.run(KIND, job_id, session_factory)
@@ -1,6 +1,7 @@
 """InputSession service — create, check, register groups, complete."""
 
 import base64
+import logging
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
@@ -18,6 +19,8 @@ from schemas.input_session import (
     ProcessResult,
 )
 
+log = logging.getLogger(__name__)
+
 
 def create(db: Session, data: InputSessionCreate) -> InputSession:
     from models.event import Event
@@ -46,14 +49,23 @@ def list_all(db: Session) -> list[InputSession]:
     return db.query(InputSession).order_by(InputSession.started_at.desc()).all()
 
 
-def list_photos(db: Session, session_id: uuid.UUID) -> list[Photo]:
+def list_photos(
+    db: Session,
+    session_id: uuid.UUID,
+    include_hotpreview: bool = True,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """Return (list items, next_cursor) in registration order; all photos when limit is None."""
+    from services import photo_cursor
+    from services.photo_service import list_item_query, list_items
+
     get_or_404(db, session_id)
-    return (
-        db.query(Photo)
-        .filter(Photo.input_session_id == session_id)
-        .order_by(Photo.registered_at)
-        .all()
-    )
+    q = list_item_query(db, include_hotpreview).filter(Photo.input_session_id == session_id)
+    if limit is None:
+        return list_items(photo_cursor.order_by(q, "registered_at_asc").all()), None
+    rows, next_cursor = photo_cursor.page(q, "registered_at_asc", limit, cursor=cursor)
+    return list_items(rows), next_cursor
 
 
 def list_errors(db: Session, session_id: uuid.UUID) -> list[SessionError]:
@@ -131,6 +143,7 @@ def register_group(
             exposure_mean=payload.exposure_mean,
             exposure_clipping=payload.exposure_clipping,
             noise_score=payload.noise_score,
+            coldpreview_source=payload.coldpreview_source,
             photographer_id=photographer_id,
             input_session_id=session_id,
             registered_by_machine_id=payload.machine_id,
@@ -165,7 +178,10 @@ def register_group(
                 height=comp.height,
             ))
 
+        from services import similarity_index, timeline_rollup
+        timeline_rollup.photo_added(db, photo)
         db.commit()
+        similarity_index.photo_added(payload.hothash, payload.dct_perceptual_hash, payload.difference_hash)
         _increment(db, session_id, photo_count=1)
 
         s = get_or_404(db, session_id)
@@ -205,11 +221,21 @@ def complete(db: Session, session_id: uuid.UUID) -> ProcessResult:
 
 
 def _write_coldpreview(hothash: str, coldpreview_b64: str) -> None:
-    """Decode and write coldpreview JPEG to disk at the canonical path."""
+    """Decode and write coldpreview JPEG to disk at the canonical path.
+
+    Also renders the smaller pre-sized variants (utils.previews.COLDPREVIEW_VARIANTS)
+    next to it, so serving never has to resample per request. A coldpreview the
+    variants cannot be rendered from is logged and kept; registration goes on and
+    serving falls back to the full coldpreview.
+    """
+    from utils.previews import try_write_coldpreview_variants
+
     coldpreview_bytes = base64.b64decode(coldpreview_b64)
     coldpreview_path = Path(app_settings.coldpreview_dir) / hothash[:2] / hothash[2:4] / f"{hothash}.jpg"
     coldpreview_path.parent.mkdir(parents=True, exist_ok=True)
     coldpreview_path.write_bytes(coldpreview_bytes)
+    if try_write_coldpreview_variants(hothash, app_settings.coldpreview_dir) is None:
+        log.warning("Could not render coldpreview variants for %s", hothash)
 
 
 def _increment(db: Session, session_id: uuid.UUID, **fields: int) -> None:
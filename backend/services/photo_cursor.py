@@ -0,0 +1,239 @@
+"""Keyset (cursor) pagination over the photo sort orders.
+
+Every sort mode is a total order: the sort column, then registered_at and
+id as tiebreakers. A cursor encodes the sort key of the
+last row on a page; the next page is "rows after that key", which is an
+index range scan instead of OFFSET's skip-and-discard, and does not shift
+when photos are inserted in front of it.
+
+    q = photo_cursor.order_by(q, sort)
+    q = photo_cursor.after(q, sort, photo_cursor.decode(cursor, sort))
+    page = q.limit(limit).all()
+    next_cursor = photo_cursor.encode(page[-1], sort)
+
+Cursors are opaque to clients (base64url JSON) and bound to their sort mode.
+
+sort=random is a seeded shuffle. Every photo has a fixed random
+shuffle_key; a seed picks a starting point in that order and the listing
+runs (shuffle_key, id) from there, wrapping around once. Each page is one
+or two index range scans, the cursor carries the seed, and the same seed
+gives the same order — a slideshow can page, step back and resume.
+Different seeds start at different points of one global permutation.
+"""
+
+import base64
+import json
+import secrets
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, asc, desc, literal, nulls_last, or_, tuple_
+
+from models.photo import Photo
+
+# sort → (primary column, descending, nullable); tiebreakers follow
+_PRIMARY = {
+    "taken_at_desc": (Photo.taken_at, True, True),
+    "taken_at_asc": (Photo.taken_at, False, True),
+    "registered_at_desc": (Photo.registered_at, True, False),
+    "registered_at_asc": (Photo.registered_at, False, False),
+    "rating_desc": (Photo.rating, True, True),
+    "rating_asc": (Photo.rating, False, True),
+    "random": (Photo.shuffle_key, False, False),
+}
+DEFAULT_SORT = "taken_at_desc"
+
+# shuffle_key is drawn from [0, SHUFFLE_SPACE); seeds are reduced into it
+SHUFFLE_SPACE = 2**31 - 1
+
+
+def _spec(sort: str) -> list[tuple]:
+    """[(column, descending, nullable), ...] — the full sort key for sort."""
+    column, descending, nullable = _PRIMARY.get(sort, _PRIMARY[DEFAULT_SORT])
+    if column is Photo.registered_at or column is Photo.shuffle_key:
+        # Practically unique already — id only breaks exact ties
+        return [(column, descending, False), (Photo.id, descending, False)]
+    return [
+        (column, descending, nullable),
+        (Photo.registered_at, False, False),
+        (Photo.id, False, False),
+    ]
+
+
+def order_by(q, sort: str, reverse: bool = False):
+    """Order q by the full sort key (NULLs last). reverse flips every direction."""
+    clauses = []
+    for column, descending, nullable in _spec(sort):
+        clause = desc(column) if descending != reverse else asc(column)
+        if nullable:
+            clause = nulls_last(clause) if not reverse else clause.nulls_first()
+        clauses.append(clause)
+    return q.order_by(*clauses)
+
+
+def key_of(photo: Photo, sort: str) -> list:
+    return [getattr(photo, column.key) for column, _, _ in _spec(sort)]
+
+
+def after(q, sort: str, key: list, reverse: bool = False):
+    """Restrict q to rows strictly after key in sort order (before it if reverse)."""
+    (column, descending, nullable), *tail = _spec(sort)
+    value, tail_values = key[0], key[1:]
+
+    # Tail columns share a direction, so a row comparison can use the index
+    tail_cols = tuple_(*(c for c, _, _ in tail))
+    tail_vals = tuple_(*(literal(v, c.type) for (c, _, _), v in zip(tail, tail_values)))
+    tail_desc = tail[0][1] != reverse
+    tail_after = tail_cols < tail_vals if tail_desc else tail_cols > tail_vals
+
+    primary_desc = descending != reverse
+    if not nullable:
+        primary_after = column < value if primary_desc else column > value
+        return q.filter(or_(primary_after, and_(column == value, tail_after)))
+
+    # NULLs sort last going forward, first going backward
+    if value is None:
+        if reverse:
+            return q.filter(or_(column.isnot(None), tail_after))
+        return q.filter(column.is_(None), tail_after)
+    primary_after = column < value if primary_desc else column > value
+    if reverse:
+        return q.filter(or_(primary_after, and_(column == value, tail_after)))
+    return q.filter(or_(primary_after, column.is_(None), and_(column == value, tail_after)))
+
+
+def encode(photo: Photo, sort: str, seed: int | None = None) -> str:
+    return encode_key(sort, key_of(photo, sort), seed)
+
+
+def encode_key(sort: str, key: list, seed: int | None = None) -> str:
+    """Cursor for an explicit key — also used by orders defined outside this module."""
+    key = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    key = [str(v) if isinstance(v, uuid.UUID) else v for v in key]
+    data = {"s": sort, "k": key}
+    if seed is not None:
+        data["r"] = seed
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _load(cursor: str) -> dict:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+
+def decode_seed(cursor: str) -> int:
+    """The shuffle seed carried by a sort=random cursor."""
+    seed = _load(cursor).get("r")
+    if not isinstance(seed, int):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    return seed
+
+
+def decode_key(cursor: str, sort: str) -> list:
+    """The raw JSON key of a cursor made by encode_key(); 422 unless it belongs to sort."""
+    data = _load(cursor)
+    if not isinstance(data, dict) or data.get("s") != sort or not isinstance(data.get("k"), list):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    return data["k"]
+
+
+def decode(cursor: str, sort: str) -> list:
+    data = _load(cursor)
+    try:
+        spec = _spec(data["s"])
+        if data["s"] != sort or len(data["k"]) != len(spec):
+            raise ValueError
+        key = []
+        for (column, _, _), value in zip(spec, data["k"]):
+            if value is None:
+                key.append(None)
+            elif column is Photo.id:
+                key.append(uuid.UUID(value))
+            elif column in (Photo.taken_at, Photo.registered_at):
+                key.append(datetime.fromisoformat(value))
+            else:
+                key.append(int(value))
+        return key
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+
+def _shuffle_segments(q, seed: int, key: list | None = None, reverse: bool = False) -> list:
+    """The rows after key in seed's rotation, as one or two ordered queries.
+
+    The rotation starts at shuffle_key = seed: first the head
+    (shuffle_key >= start), then the wrapped tail (shuffle_key < start).
+    """
+    start = seed % SHUFFLE_SPACE
+    head = q.filter(Photo.shuffle_key >= start)
+    tail = q.filter(Photo.shuffle_key < start)
+    if reverse:
+        # Only used from a key (neighbours): back to the start of the rotation
+        if key[0] < start:
+            return [after(order_by(tail, "random", True), "random", key, True), order_by(head, "random", True)]
+        return [after(order_by(head, "random", True), "random", key, True)]
+    if key is None:
+        return [order_by(head, "random"), order_by(tail, "random")]
+    if key[0] >= start:
+        return [after(order_by(head, "random"), "random", key), order_by(tail, "random")]
+    return [after(order_by(tail, "random"), "random", key)]
+
+
+def _take(segments: list, n: int) -> list:
+    rows = []
+    for segment in segments:
+        rows += segment.limit(n - len(rows)).all()
+        if len(rows) >= n:
+            break
+    return rows
+
+
+def _shuffle_page(q, limit: int, cursor: str | None, offset: int, seed: int | None) -> tuple[list, str | None]:
+    if cursor:
+        seed = decode_seed(cursor)
+        rows = _take(_shuffle_segments(q, seed, decode(cursor, "random")), limit)
+    else:
+        if seed is None:
+            seed = secrets.randbelow(SHUFFLE_SPACE)
+        rows = _take(_shuffle_segments(q, seed), offset + limit)[offset:]
+    next_cursor = encode(rows[-1], "random", seed) if rows and len(rows) == limit else None
+    return rows, next_cursor
+
+
+def page(
+    q, sort: str, limit: int, cursor: str | None = None, offset: int = 0, seed: int | None = None,
+) -> tuple[list, str | None]:
+    """Return (rows, next_cursor) for one page of q.
+
+    With a cursor, offset is ignored. next_cursor is None on the last page.
+    seed only applies to sort=random; without one a fresh shuffle is drawn
+    (the cursor keeps it for the following pages).
+    """
+    if sort == "random":
+        return _shuffle_page(q, limit, cursor, offset, seed)
+
+    q = order_by(q, sort)
+    if cursor:
+        q = after(q, sort, decode(cursor, sort))
+    else:
+        q = q.offset(offset)
+    rows = q.limit(limit).all()
+    next_cursor = encode(rows[-1], sort) if rows and len(rows) == limit else None
+    return rows, next_cursor
+
+
+def neighbours(q, sort: str, photo: Photo, n: int, seed: int | None = None) -> tuple[list, list]:
+    """Return (prev, next): up to n rows on either side of photo, nearest first."""
+    key = key_of(photo, sort)
+    if sort == "random":
+        if seed is None:
+            raise HTTPException(status_code=422, detail="sort=random needs the shuffle seed")
+        prev = _take(_shuffle_segments(q, seed, key, reverse=True), n)
+        return prev, _take(_shuffle_segments(q, seed, key), n)
+    prev = after(order_by(q, sort, reverse=True), sort, key, reverse=True).limit(n).all()
+    nxt = after(order_by(q, sort), sort, key).limit(n).all()
+    return prev, nxt
@@ -1,21 +1,32 @@
 import base64
+import hashlib
 import io
 import math
+import struct
+import threading
 import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import piexif
 
-from fastapi import HTTPException
-from sqlalchemy.orm import Session, selectinload
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session, noload, selectinload
 
 from models.event import Event
-from models.photo import ImageFile, Photo, PhotoCorrection
+from models.photo import ImageFile, Photo, PhotoCorrection, PhotoHotpreview
 from models.photo_field_edit import PhotoFieldEdit
+from services import timeline_rollup
 from utils import time_source as ts, location_source as ls
+from utils.render_cache import RenderCache
 from schemas.input_session import CheckHothashRequest, CheckHothashResponse
-from schemas.photo import PerceptualHashComputeResult, TimelineBucket, TimelineEventBalloon
+from schemas.photo import (
+    PhotoListItem,
+    TimelineBucket,
+    TimelineEventBalloon,
+    TimelineRebuildResult,
+)
 
 
 def check_hothashes(db: Session, data: CheckHothashRequest) -> CheckHothashResponse:
@@ -33,6 +44,140 @@ def check_hothashes(db: Session, data: CheckHothashRequest) -> CheckHothashRespo
 def list_photos(
     db: Session,
     *,
+    sort: str = "taken_at_desc",
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+    seed: int | None = None,
+    include_hotpreview: bool = True,
+    **filters,
+) -> tuple[list[dict], str | None]:
+    """Return (list items, next_cursor) for one page. See services/photo_cursor.py.
+
+    Items are PhotoListItem-shaped dicts from a column projection — return
+    them with list_items_response().
+    """
+    from services import photo_cursor
+
+    q = _list_query(db, list_item_query(db, include_hotpreview), **filters)
+    rows, next_cursor = photo_cursor.page(q, sort, limit, cursor=cursor, offset=offset, seed=seed)
+    return list_items(rows), next_cursor
+
+
+# ---------------------------------------------------------------------------
+# List item projection
+#
+# Large listings are dominated by per-row Python work: hydrating Photo and
+# PhotoCorrection objects, the correction-derived properties, and
+# PhotoListItem.model_validate(). The projection selects exactly the
+# PhotoListItem columns (correction columns outer-joined flat) and the rows
+# are serialized in one pydantic-core call.
+# ---------------------------------------------------------------------------
+
+# PhotoListItem fields read from the correction row (NULL when uncorrected)
+_CORRECTION_LIST_FIELDS = (
+    "rotation", "crop_left", "crop_top", "crop_right", "crop_bottom", "exposure_ev",
+)
+# Selected for cursor keys (photo_cursor.key_of) but not part of PhotoListItem
+_LIST_KEY_FIELDS = ("id", "registered_at", "shuffle_key")
+
+def list_item_query(db: Session, include_hotpreview: bool = True):
+    """Column query producing one PhotoListItem-shaped row per photo.
+
+    UUID columns are selected as text: they are only ever serialized, and
+    building uuid.UUID objects is a large share of the fetch cost.
+    """
+    from sqlalchemy import Text, cast, false, func, null
+    from sqlalchemy.dialects.postgresql import UUID
+
+    columns = []
+    for name in PhotoListItem.model_fields:
+        if name == "hotpreview_b64":
+            column = _hotpreview_subquery() if include_hotpreview else null()
+        elif name == "has_correction":
+            column = PhotoCorrection.photo_id.isnot(None)
+        elif name == "flip_horizontal":
+            column = func.coalesce(PhotoCorrection.flip_horizontal, false())
+        elif name in _CORRECTION_LIST_FIELDS:
+            column = getattr(PhotoCorrection, name)
+        else:
+            column = getattr(Photo, name)
+        if isinstance(column.type, UUID):
+            column = cast(column, Text)
+        columns.append(column.label(name))
+    columns += [
+        cast(Photo.id, Text).label("id"),
+        Photo.registered_at.label("registered_at"),
+        Photo.shuffle_key.label("shuffle_key"),
+    ]
+
+    return (
+        db.query(*columns)
+        .select_from(Photo)
+        .outerjoin(PhotoCorrection, PhotoCorrection.photo_id == Photo.id)
+    )
+
+
+def _hotpreview_subquery():
+    """Correlated lookup instead of a join: PostgreSQL evaluates costly
+    select-list expressions after Sort/LIMIT, so only the rows on the page
+    are probed even when the page is sorted from a larger filtered set.
+    """
+    from sqlalchemy import select
+
+    return (
+        select(PhotoHotpreview.jpeg)
+        .where(PhotoHotpreview.photo_id == Photo.id)
+        .scalar_subquery()
+    )
+
+
+def list_items(rows) -> list[dict]:
+    """Rows from list_item_query() → PhotoListItem-shaped dicts."""
+    b64 = base64.b64encode
+    items = []
+    for row in rows:
+        item = row._asdict()
+        for name in _LIST_KEY_FIELDS:
+            del item[name]
+        if item["hotpreview_b64"] is not None:
+            item["hotpreview_b64"] = b64(item["hotpreview_b64"]).decode("ascii")
+        items.append(item)
+    return items
+
+
+def list_items_response(request: Request, items: list[dict], next_cursor: str | None) -> Response:
+    """Negotiated response for a list endpoint; bypasses response_model re-validation."""
+    from core import encoding
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return encoding.respond(request, items, headers)
+
+
+def neighbours(
+    db: Session,
+    hothash: str,
+    *,
+    n: int = 1,
+    sort: str = "taken_at_desc",
+    seed: int | None = None,
+    include_hotpreview: bool = True,
+    **filters,
+) -> tuple[list[Photo], list[Photo]]:
+    """Up to n photos before and after hothash in the filtered, sorted listing, nearest first."""
+    from services import photo_cursor
+
+    photo = get_by_hothash(db, hothash)
+    q = _list_query(db, **filters).options(
+        selectinload(Photo.correction), hotpreview_loader(include_hotpreview),
+    )
+    return photo_cursor.neighbours(q, sort, photo, n, seed=seed)
+
+
+def _list_query(
+    db: Session,
+    q=None,
+    *,
     hothashes: list[str] | None = None,
     photographer_id: uuid.UUID | None = None,
     event_id: uuid.UUID | None = None,
@@ -46,14 +191,13 @@ def list_photos(
     taken_before: datetime | None = None,
     deleted: bool = False,
     stacks_collapsed: bool = False,
-    sort: str = "taken_at_desc",
-    limit: int = 100,
-    offset: int = 0,
     requesting_photographer=None,
-) -> list[Photo]:
+):
+    """Apply the GET /photos filters to q (default: a plain Photo query)."""
     from services.access_filter import PhotoAccessFilter
 
-    q = db.query(Photo).options(selectinload(Photo.correction))
+    if q is None:
+        q = db.query(Photo)
 
     if deleted:
         q = q.filter(Photo.deleted_at.isnot(None))
@@ -95,9 +239,56 @@ def list_photos(
             (Photo.stack_id.is_(None)) | (Photo.is_stack_cover.is_(True))
         )
 
-    q = PhotoAccessFilter.apply(q, requesting_photographer)
-    q = _apply_sort(q, sort)
-    return q.offset(offset).limit(limit).all()
+    return PhotoAccessFilter.apply(q, requesting_photographer)
+
+
+def hotpreview_loader(include_hotpreview: bool):
+    """Loader option for Photo.hotpreview in list queries.
+
+    Without the thumbnail the relationship is set to None (no extra query),
+    and PhotoListItem.hotpreview_b64 serializes as null.
+    """
+    return selectinload(Photo.hotpreview) if include_hotpreview else noload(Photo.hotpreview)
+
+
+def hotpreview_pack(db: Session, hothashes: list[str], requesting_photographer=None) -> tuple[bytes, bool]:
+    """Return (pack, complete): raw hotpreview JPEGs as one length-prefixed binary pack.
+
+    Per photo, in request order: hothash (64 ASCII bytes), JPEG length
+    (uint32 big-endian), JPEG bytes. Unknown hothashes and photos the
+    requesting photographer may not see are left out; complete is False
+    when any were.
+    """
+    from services.access_filter import PhotoAccessFilter
+
+    q = (
+        db.query(Photo.hothash, PhotoHotpreview.jpeg)
+        .join(PhotoHotpreview, PhotoHotpreview.photo_id == Photo.id)
+        .filter(Photo.hothash.in_(set(hothashes)))
+    )
+    jpegs = dict(PhotoAccessFilter.apply(q, requesting_photographer).all())
+
+    parts = []
+    requested = dict.fromkeys(hothashes)
+    for h in requested:
+        jpeg = jpegs.get(h)
+        if jpeg is not None:
+            parts += (h.encode("ascii"), struct.pack(">I", len(jpeg)), jpeg)
+    return b"".join(parts), len(parts) == 3 * len(requested)
+
+
+def hotpreview_b64_map(db: Session, hothashes) -> dict[str, str]:
+    """Return {hothash: hotpreview_b64} for the given photos in one query."""
+    hothashes = list(set(hothashes))
+    if not hothashes:
+        return {}
+    rows = (
+        db.query(Photo.hothash, PhotoHotpreview.jpeg)
+        .join(PhotoHotpreview, PhotoHotpreview.photo_id == Photo.id)
+        .filter(Photo.hothash.in_(hothashes))
+        .all()
+    )
+    return {h: base64.b64encode(jpeg).decode("ascii") for h, jpeg in rows}
 
 
 def get_by_hothash(db: Session, hothash: str) -> Photo:
@@ -123,13 +314,53 @@ def get_image_files(db: Session, hothash: str) -> list[ImageFile]:
 # Coldpreview serving
 # ---------------------------------------------------------------------------
 
-def serve_coldpreview(db: Session, hothash: str) -> tuple[bytes, str]:
-    """Return (image_bytes, etag) for the coldpreview with embedded EXIF.
+# Bump when the render pipeline changes output for the same inputs
+_RENDER_VERSION = 2
+
+_render_caches: dict[Path, RenderCache] = {}
+_render_caches_lock = threading.Lock()
+
+
+def _render_cache():
+    """RenderCache for the configured directory (resolved per call — tests swap dirs)."""
+    from core.config import settings as app_settings
+
+    directory = Path(
+        app_settings.render_cache_dir
+        or Path(app_settings.coldpreview_dir).parent / "render-cache"
+    )
+    with _render_caches_lock:
+        cache = _render_caches.get(directory)
+        if cache is None:
+            cache = RenderCache(directory, app_settings.render_cache_max_mb * 1024 * 1024)
+            _render_caches[directory] = cache
+        return cache
+
+
+def serve_coldpreview(
+    db: Session,
+    hothash: str,
+    max_px: int | None = None,
+    if_none_match: str | None = None,
+) -> tuple[bytes | None, str]:
+    """Return (jpeg, etag) for the coldpreview with embedded EXIF.
 
     Corrections are applied in order: rotation → horizon → crop → exposure.
     The original coldpreview on disk is never modified.
+
+    max_px: serve the smallest pre-rendered variant that still covers max_px
+    after corrections (see _coldpreview_source). None = full coldpreview.
+
+    The ETag is a digest of everything that determines the output (source
+    file, correction timestamp, embedded EXIF — which includes the
+    photographer name). If it matches if_none_match, returns (None, etag)
+    without touching the image. Otherwise returns the rendered JPEG from the
+    on-disk render cache, rendering once on a miss.
+
+    Without a correction the render never decodes: the EXIF segment is
+    spliced into the stored JPEG bytes, so pixels are served as stored
+    (no second generation of JPEG loss).
     """
-    from core.config import settings as app_settings
     from models.photographer import Photographer
 
     photo = (
@@ -141,9 +372,8 @@ def serve_coldpreview(db: Session, hothash: str) -> tuple[bytes, str]:
     if photo is None:
         raise HTTPException(status_code=404, detail="Photo not found")
 
-    coldpreview_file = (
-        Path(app_settings.coldpreview_dir) / hothash[:2] / hothash[2:4] / f"{hothash}.jpg"
-    )
+    c = photo.correction
+    coldpreview_file = _coldpreview_source(hothash, max_px, c)
     if not coldpreview_file.exists():
         raise HTTPException(status_code=404, detail="Coldpreview not found")
 
@@ -153,13 +383,60 @@ def serve_coldpreview(db: Session, hothash: str) -> tuple[bytes, str]:
         if p and not p.is_unknown:
             photographer_name = p.name
 
-    c = photo.correction
-    img = _open_and_correct(coldpreview_file, c)
     exif_bytes = _build_exif_bytes(photo, photographer_name, c)
-    image_bytes = _encode_jpeg(img, exif_bytes)
+    key = hashlib.sha256(b"\0".join([
+        str(_RENDER_VERSION).encode(),
+        coldpreview_file.name.encode(),
+        (str(c.updated_at.timestamp()) if c is not None else "").encode(),
+        exif_bytes,
+    ])).hexdigest()
+    etag = f"{hothash}-{key[:16]}"
+
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return None, etag
+
+    def render() -> bytes:
+        if c is None:
+            return _splice_exif(coldpreview_file.read_bytes(), exif_bytes)
+        img = _open_and_correct(coldpreview_file, c)
+        return _encode_jpeg(img, exif_bytes)
+
+    return _render_cache().get_or_render(key, render), etag
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """RFC 9110 weak comparison of an If-None-Match header against etag."""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+def _coldpreview_source(hothash: str, max_px: int | None, c) -> Path:
+    """Smallest coldpreview file on disk that still covers max_px after corrections.
+
+    A crop shrinks the image, so the source must be correspondingly larger.
+    Horizon correction crops by an angle-dependent amount — use the full
+    coldpreview then.
+    """
+    from core.config import settings as app_settings
+    from utils.previews import best_coldpreview_path
 
-    etag = hothash if c is None else f"{hothash}-{c.updated_at.timestamp()}"
-    return image_bytes, etag
+    if max_px is not None and c is not None:
+        if c.horizon_angle:
+            max_px = None
+        else:
+            kept = min(
+                1.0 - (c.crop_left or 0.0) - (c.crop_right or 0.0),
+                1.0 - (c.crop_top or 0.0) - (c.crop_bottom or 0.0),
+            )
+            max_px = math.ceil(max_px / max(kept, 0.01))
+    return best_coldpreview_path(hothash, app_settings.coldpreview_dir, max_px)
 
 
 def _crop_horizon(img, orig_w: int, orig_h: int, angle_deg: float):
@@ -272,6 +549,13 @@ def _encode_jpeg(img, exif_bytes: bytes, quality: int = 85) -> bytes:
     return buf.getvalue()
 
 
+def _splice_exif(jpeg_bytes: bytes, exif_bytes: bytes) -> bytes:
+    """Insert (or replace) the EXIF APP1 segment without decoding the image."""
+    buf = io.BytesIO()
+    piexif.insert(exif_bytes, jpeg_bytes, buf)
+    return buf.getvalue()
+
+
 # ---------------------------------------------------------------------------
 # Download (JPEG with optional downscale, Content-Disposition attachment)
 # ---------------------------------------------------------------------------
@@ -280,9 +564,12 @@ _SIZE_LIMITS = {"full": None, "medium": 1200, "small": 600}
 
 
 def build_download(db: Session, hothash: str, size: str) -> tuple[bytes, str]:
-    """Return (jpeg_bytes, suggested_filename) for a downloadable image."""
+    """Return (jpeg_bytes, suggested_filename) for a downloadable image.
+
+    small/medium start from the smallest pre-rendered coldpreview variant that
+    covers the size, so usually no resampling is needed.
+    """
     from PIL import Image
-    from core.config import settings as app_settings
     from models.photographer import Photographer
 
     max_px = _SIZE_LIMITS.get(size)
@@ -296,9 +583,8 @@ def build_download(db: Session, hothash: str, size: str) -> tuple[bytes, str]:
     if photo is None:
         raise HTTPException(status_code=404, detail="Photo not found")
 
-    coldpreview_file = (
-        Path(app_settings.coldpreview_dir) / hothash[:2] / hothash[2:4] / f"{hothash}.jpg"
-    )
+    c = photo.correction
+    coldpreview_file = _coldpreview_source(hothash, max_px, c)
     if not coldpreview_file.exists():
         raise HTTPException(status_code=404, detail="Coldpreview not found")
 
@@ -308,7 +594,6 @@ def build_download(db: Session, hothash: str, size: str) -> tuple[bytes, str]:
         if p and not p.is_unknown:
             photographer_name = p.name
 
-    c = photo.correction
     img = _open_and_correct(coldpreview_file, c)
 
     if max_px is not None:
@@ -387,11 +672,18 @@ def _build_gps_ifd(lat: float, lng: float, accuracy_meters: float | None = None)
 # PATCH single photo
 # ---------------------------------------------------------------------------
 
+# Fields that move a photo between timeline rollup rows
+_TIMELINE_FIELDS = {"taken_at", "event_id", "deleted_at"}
+
+
 def patch_photo(db: Session, hothash: str, data) -> Photo:
     photo = get_by_hothash(db, hothash)
     updates = data.model_dump(exclude_unset=True)
+    days = timeline_rollup.days_of([photo])
     for field, value in updates.items():
         setattr(photo, field, value)
+    if updates.keys() & _TIMELINE_FIELDS:
+        timeline_rollup.refresh(db, days | timeline_rollup.days_of([photo]))
     db.commit()
     db.refresh(photo)
     return photo
@@ -447,6 +739,7 @@ def soft_delete(db: Session, hothash: str) -> None:
     if photo is None:
         raise HTTPException(status_code=404, detail="Photo not found")
     photo.deleted_at = datetime.now(timezone.utc)
+    timeline_rollup.refresh(db, timeline_rollup.days_of([photo]))
     db.commit()
 
 
@@ -455,6 +748,7 @@ def restore(db: Session, hothash: str) -> None:
     if photo is None:
         raise HTTPException(status_code=404, detail="Photo not found")
     photo.deleted_at = None
+    timeline_rollup.refresh(db, timeline_rollup.days_of([photo]))
     db.commit()
 
 
@@ -487,6 +781,7 @@ def batch_event(db: Session, hothashes: list[str], event_id: uuid.UUID | None) -
     photos = _get_batch(db, hothashes)
     for photo in photos:
         photo.event_id = event_id
+    timeline_rollup.refresh(db, timeline_rollup.days_of(photos))
     db.commit()
     return len(photos)
 
@@ -509,9 +804,11 @@ def batch_photographer(db: Session, hothashes: list[str], photographer_id: uuid.
 
 def batch_taken_at(db: Session, hothashes: list[str], taken_at: datetime, taken_at_source: int) -> int:
     photos = _get_batch(db, hothashes)
+    days = timeline_rollup.days_of(photos)
     for photo in photos:
         photo.taken_at = taken_at
         photo.taken_at_source = taken_at_source
+    timeline_rollup.refresh(db, days | timeline_rollup.days_of(photos))
     db.commit()
     return len(photos)
 
@@ -525,6 +822,7 @@ def batch_taken_at_offset(
 ) -> int:
     from datetime import timedelta
     photos = _get_batch(db, hothashes)
+    days = timeline_rollup.days_of(photos)
     updated = 0
     for photo in photos:
         if photo.taken_at is None:
@@ -556,6 +854,7 @@ def batch_taken_at_offset(
             machine_id=machine_id,
         ))
         updated += 1
+    timeline_rollup.refresh(db, days | timeline_rollup.days_of(photos))
     db.commit()
     return updated
 
@@ -606,6 +905,7 @@ def batch_delete(db: Session, hothashes: list[str]) -> int:
     now = datetime.now(timezone.utc)
     for photo in photos:
         photo.deleted_at = now
+    timeline_rollup.refresh(db, timeline_rollup.days_of(photos))
     db.commit()
     return len(photos)
 
@@ -614,47 +914,11 @@ def batch_restore(db: Session, hothashes: list[str]) -> int:
     photos = _get_batch(db, hothashes)
     for photo in photos:
         photo.deleted_at = None
+    timeline_rollup.refresh(db, timeline_rollup.days_of(photos))
     db.commit()
     return len(photos)
 
 
-# ---------------------------------------------------------------------------
-# Perceptual hashes
-# ---------------------------------------------------------------------------
-
-def compute_perceptual_hashes_for_all(db: Session) -> PerceptualHashComputeResult:
-    """Compute dct_perceptual_hash and difference_hash for photos that lack them.
-
-    Reads hotpreview_b64 from the database — no original files needed.
-    """
-    from utils.previews import compute_perceptual_hashes
-
-    photos = (
-        db.query(Photo)
-        .filter(
-            (Photo.dct_perceptual_hash.is_(None)) | (Photo.difference_hash.is_(None))
-        )
-        .all()
-    )
-
-    updated = 0
-    for photo in photos:
-        try:
-            jpeg_bytes = base64.b64decode(photo.hotpreview_b64)
-            dct_hash, diff_hash = compute_perceptual_hashes(jpeg_bytes)
-            photo.dct_perceptual_hash = dct_hash
-            photo.difference_hash = diff_hash
-            updated += 1
-        except Exception:
-            pass
-
-    if updated:
-        db.commit()
-
-    total = db.query(Photo).count()
-    return PerceptualHashComputeResult(updated=updated, already_computed=total - updated)
-
-
 # ---------------------------------------------------------------------------
 # Companions
 # ---------------------------------------------------------------------------
@@ -679,42 +943,114 @@ def add_companion(db: Session, hothash: str, data) -> ImageFile:
 
 
 # ---------------------------------------------------------------------------
-# Sorting
+# Map
 # ---------------------------------------------------------------------------
 
+# Grid cells across one 256 px map tile: clusters are ~64 px apart at any zoom
+CLUSTER_CELLS_PER_TILE = 4
+
+
+def location_in_box(west: float, south: float, east: float, north: float):
+    """Photos inside a lng/lat box, through the GiST index ix_photos_location_point.
+
+    west > east means the box crosses the antimeridian.
+    """
+    from sqlalchemy import and_, func, or_
+
+    point = func.point(Photo.location_lng, Photo.location_lat)
+
+    def box(w: float, e: float):
+        return point.op("<@")(func.box(func.point(w, south), func.point(e, north)))
+
+    inside = box(west, east) if west <= east else or_(box(west, 180.0), box(-180.0, east))
+    # Repeats the partial index predicate so the planner can use it
+    return and_(Photo.location_lat.isnot(None), inside)
+
+
+def map_clusters(
+    db: Session, zoom: int, west: float, south: float, east: float, north: float, **filters,
+) -> list[dict]:
+    """Marker clusters for the photos matching the list filters — see clusters_of()."""
+    return clusters_of(_list_query(db, **filters), zoom, west, south, east, north)
+
+
+def clusters_of(q, zoom: int, west: float, south: float, east: float, north: float) -> list[dict]:
+    """Marker clusters for the photos of q inside the box at a map zoom level.
+
+    Photos are grouped on a lng/lat grid whose cell size halves per zoom
+    level; each cluster has its count, centroid and one sample hothash. The
+    work is one index range scan plus a GROUP BY, and the response size
+    follows the number of cells on screen, not the number of photos.
+    """
+    from sqlalchemy import func
+
+    if south > north:
+        raise HTTPException(status_code=422, detail="south must not be greater than north")
+    cell = 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+    rows = (
+        q.with_entities(
+            func.count().label("count"),
+            func.avg(Photo.location_lat).label("lat"),
+            func.avg(Photo.location_lng).label("lng"),
+            func.min(Photo.hothash).label("hothash"),
+        )
+        .filter(location_in_box(west, south, east, north))
+        .group_by(func.floor(Photo.location_lng / cell), func.floor(Photo.location_lat / cell))
+        .order_by(None)
+        .all()
+    )
+    return sorted(
+        ({"lat": r.lat, "lng": r.lng, "count": r.count, "hothash": r.hothash} for r in rows),
+        key=lambda c: (-c["count"], c["hothash"]),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Timeline
+# ---------------------------------------------------------------------------
+
+def rebuild_timeline(db: Session) -> TimelineRebuildResult:
+    days, event_days = timeline_rollup.rebuild(db)
+    db.commit()
+    return TimelineRebuildResult(days=days, event_days=event_days)
+
+
 def timeline_buckets(
     db: Session,
     granularity: str,
     from_date: datetime | None = None,
     to_date: datetime | None = None,
 ) -> list[TimelineBucket]:
+    """Year/month/day photo counts from the per-day rollup (services/timeline_rollup.py)."""
     from sqlalchemy import extract, func
 
-    base = db.query(Photo).filter(Photo.taken_at.isnot(None), Photo.deleted_at.is_(None))
-    if from_date:
-        base = base.filter(Photo.taken_at >= from_date)
-    if to_date:
-        base = base.filter(Photo.taken_at < to_date)
+    from models.timeline import TimelineDay
+    from services import timeline_rollup
+
+    base = db.query(TimelineDay)
+    first, last = timeline_rollup.day_range(from_date, to_date)
+    if first:
+        base = base.filter(TimelineDay.day >= first)
+    if last:
+        base = base.filter(TimelineDay.day <= last)
+    total = func.sum(TimelineDay.count).label('count')
 
     if granularity == 'year':
-        year_col = extract('year', Photo.taken_at).label('year')
-        rows = (base.with_entities(year_col, func.count(Photo.id).label('count'))
-                .group_by(year_col).order_by(year_col).all())
+        year_col = extract('year', TimelineDay.day).label('year')
+        rows = base.with_entities(year_col, total).group_by(year_col).order_by(year_col).all()
         return [TimelineBucket(year=int(r.year), count=r.count) for r in rows]
 
     if granularity == 'month':
-        year_col = extract('year', Photo.taken_at).label('year')
-        month_col = extract('month', Photo.taken_at).label('month')
-        rows = (base.with_entities(year_col, month_col, func.count(Photo.id).label('count'))
+        year_col = extract('year', TimelineDay.day).label('year')
+        month_col = extract('month', TimelineDay.day).label('month')
+        rows = (base.with_entities(year_col, month_col, total)
                 .group_by(year_col, month_col).order_by(year_col, month_col).all())
         return [TimelineBucket(year=int(r.year), month=int(r.month), count=r.count) for r in rows]
 
     # day
-    day_col = func.date_trunc('day', Photo.taken_at).label('day')
-    rows = (base.with_entities(day_col, func.count(Photo.id).label('count'))
-            .group_by(day_col).order_by(day_col).all())
+    rows = base.order_by(TimelineDay.day).all()
     return [TimelineBucket(year=r.day.year, month=r.day.month,
-                           date=r.day.strftime('%Y-%m-%d'), count=r.count) for r in rows]
+                           date=r.day.isoformat(), count=r.count) for r in rows]
 
 
 def timeline_events(
@@ -722,21 +1058,25 @@ def timeline_events(
     from_date: datetime | None = None,
     to_date: datetime | None = None,
 ) -> list[TimelineEventBalloon]:
+    """Event balloons (time span and photo count) from the per-day rollup."""
     from sqlalchemy import func
 
+    from models.timeline import TimelineDayEvent
+    from services import timeline_rollup
+
     q = (db.query(
             Event.id, Event.name,
-            func.min(Photo.taken_at).label('from_date'),
-            func.max(Photo.taken_at).label('to_date'),
-            func.count(Photo.id).label('count'),
+            func.min(TimelineDayEvent.first_taken_at).label('from_date'),
+            func.max(TimelineDayEvent.last_taken_at).label('to_date'),
+            func.sum(TimelineDayEvent.count).label('count'),
          )
-         .join(Photo, Photo.event_id == Event.id)
-         .filter(Photo.taken_at.isnot(None), Photo.deleted_at.is_(None)))
-    if from_date:
-        q = q.filter(Photo.taken_at >= from_date)
-    if to_date:
-        q = q.filter(Photo.taken_at < to_date)
-    rows = q.group_by(Event.id, Event.name).having(func.count(Photo.id) > 0).all()
+         .join(TimelineDayEvent, TimelineDayEvent.event_id == Event.id))
+    first, last = timeline_rollup.day_range(from_date, to_date)
+    if first:
+        q = q.filter(TimelineDayEvent.day >= first)
+    if last:
+        q = q.filter(TimelineDayEvent.day <= last)
+    rows = q.group_by(Event.id, Event.name).all()
     return [
         TimelineEventBalloon(
             id=str(r.id), name=r.name,
@@ -746,25 +1086,3 @@ def timeline_events(
         )
         for r in rows
     ]
-
-
-def _apply_sort(q, sort: str):
-    from sqlalchemy import asc, desc, func, nulls_last
-
-    secondary = asc(Photo.registered_at)
-
-    match sort:
-        case "taken_at_asc":
-            return q.order_by(nulls_last(asc(Photo.taken_at)), secondary)
-        case "registered_at_desc":
-            return q.order_by(desc(Photo.registered_at))
-        case "registered_at_asc":
-            return q.order_by(asc(Photo.registered_at))
-        case "rating_desc":
-            return q.order_by(nulls_last(desc(Photo.rating)), secondary)
-        case "rating_asc":
-            return q.order_by(nulls_last(asc(Photo.rating)), secondary)
-        case "random":
-            return q.order_by(func.random())
-        case _:  # taken_at_desc (default)
-            return q.order_by(nulls_last(desc(Photo.taken_at)), secondary)
@@ -0,0 +1,139 @@
+"""Streaming export of search results (NDJSON or CSV).
+
+Rows come from one server-side cursor (stream_results + yield_per), so memory
+stays constant whatever the size of the result; the response body is produced
+chunk by chunk as the cursor advances. Per photo the query carries its file
+paths and master EXIF (correlated lookups on ix_image_files_photo_id),
+photographer and event names (joins) and tag ids (photos.tag_ids), resolved to
+names from one in-memory map of the tags table.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from core import encoding
+from models.event import Event
+from models.photo import ImageFile, Photo
+from models.photographer import Photographer
+from models.tag import Tag
+from schemas.saved_search import SearchCriterion
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Rows per cursor fetch and per chunk written to the response
+CHUNK_ROWS = 1000
+
+FIELDS = (
+    "hothash", "taken_at", "registered_at", "photographer", "event", "rating",
+    "camera_make", "camera_model", "lens_model", "iso", "shutter_speed", "aperture", "focal_length",
+    "width", "height", "location_lat", "location_lng", "tags", "file_paths", "exif",
+)
+
+
+def export_query(
+    db: Session, logic: str, criteria: list[SearchCriterion], sort: str, date_filter, requesting_photographer,
+):
+    from services import photo_cursor
+    from services.search_service import _execute_query
+
+    master_first = aggregate_order_by(ImageFile.file_path, ImageFile.is_master.desc(), ImageFile.file_path)
+    file_paths = (
+        select(func.array_agg(master_first))
+        .where(ImageFile.photo_id == Photo.id)
+        .scalar_subquery()
+    )
+    exif = (
+        select(ImageFile.exif_data)
+        .where(ImageFile.photo_id == Photo.id, ImageFile.is_master)
+        .limit(1)
+        .scalar_subquery()
+    )
+    q = (
+        db.query(
+            Photo.hothash, Photo.taken_at, Photo.registered_at,
+            Photographer.name.label("photographer"), Event.name.label("event"), Photo.rating,
+            Photo.camera_make, Photo.camera_model, Photo.lens_model, Photo.iso, Photo.shutter_speed,
+            Photo.aperture, Photo.focal_length, Photo.width, Photo.height, Photo.location_lat, Photo.location_lng,
+            Photo.tag_ids, file_paths.label("file_paths"), exif.label("exif"),
+        )
+        .select_from(Photo)
+        .join(Photographer, Photographer.id == Photo.photographer_id)
+        .outerjoin(Event, Event.id == Photo.event_id)
+    )
+    q = _execute_query(db, logic, criteria, date_filter, requesting_photographer, q)
+    return photo_cursor.order_by(q, sort)
+
+
+def stream(
+    db: Session,
+    fmt: str,
+    logic: str,
+    criteria: list[SearchCriterion],
+    sort: str = "taken_at_desc",
+    date_filter: str | None = None,
+    requesting_photographer=None,
+) -> Iterator[bytes]:
+    """Encoded chunks of the export, CHUNK_ROWS rows at a time.
+
+    Validates before the first chunk so errors still become a 422, not a
+    truncated body.
+    """
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=422, detail=f"Unknown export format: {fmt}")
+    q = export_query(db, logic, criteria, sort, date_filter, requesting_photographer)
+    tag_names = dict(db.query(Tag.id, Tag.name))
+    encode = _ndjson_chunk if fmt == "ndjson" else _csv_chunk
+    return _chunks(q, tag_names, encode, header=_csv_header() if fmt == "csv" else None)
+
+
+def _chunks(q, tag_names: dict, encode, header: bytes | None) -> Iterator[bytes]:
+    if header:
+        yield header
+    rows = []
+    for row in q.execution_options(stream_results=True, yield_per=CHUNK_ROWS):
+        record = row._asdict()
+        record["tags"] = sorted(tag_names[t] for t in record["tag_ids"] if t in tag_names)
+        record["file_paths"] = record["file_paths"] or []
+        rows.append({f: record[f] for f in FIELDS})
+        if len(rows) == CHUNK_ROWS:
+            yield encode(rows)
+            rows = []
+    if rows:
+        yield encode(rows)
+
+
+def _ndjson_chunk(rows: list[dict]) -> bytes:
+    return b"".join(encoding.dump_json(r) + b"\n" for r in rows)
+
+
+def _csv_header() -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf).writerow(FIELDS)
+    return buf.getvalue().encode()
+
+
+def _csv_chunk(rows: list[dict]) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for r in rows:
+        writer.writerow([_csv_value(v) for v in r.values()])
+    return buf.getvalue().encode()
+
+
+def _csv_value(value):
+    """Lists as "|"-separated text, EXIF as compact JSON, datetimes as ISO 8601."""
+    if isinstance(value, list):
+        return "|".join(value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -1,16 +1,21 @@
+import hashlib
+import json
 import math
 import uuid
-from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session, selectinload
 
+from core.config import settings as app_settings
 from models.photo import Photo
 from models.saved_search import SavedSearch
 from models.tag import PhotoTag
-from schemas.saved_search import SavedSearchCreate, SavedSearchPatch, SearchCriterion
+from schemas.saved_search import (
+    FacetBucket, SavedSearchCreate, SavedSearchPatch, SearchCriterion, SearchFacets,
+)
+from utils.result_cache import ResultCache
 
 
 # ---------------------------------------------------------------------------
@@ -23,8 +28,11 @@ def _base_query(
     criteria: list[SearchCriterion],
     session_id=None,
     event_id=None,
+    q=None,
 ):
-    q = db.query(Photo).filter(Photo.deleted_at.is_(None))
+    if q is None:
+        q = db.query(Photo)
+    q = q.filter(Photo.deleted_at.is_(None))
     f = _build_filters(criteria, logic)
     if f is not None:
         q = q.filter(f)
@@ -48,11 +56,74 @@ def execute(
     offset: int = 0,
     date_filter: str | None = None,
     requesting_photographer=None,
-) -> list[Photo]:
+    include_hotpreview: bool = True,
+    cursor: str | None = None,
+    seed: int | None = None,
+    search_id: uuid.UUID | None = None,
+) -> tuple[list[dict], str | None]:
+    """Return (list items, next_cursor) for one page of results.
+
+    Items come from the list item projection — see photo_service.list_item_query().
+    With search_id the saved search's logic and criteria are used instead, and
+    pages are served from its cached result order (see _saved_page()).
+    """
+    from services import photo_cursor
+    from services.photo_service import list_item_query, list_items
+
+    if search_id is not None:
+        saved = get_or_404(db, search_id)
+        logic, criteria = saved.logic, saved_criteria(saved)
+        if sort != "random":  # a shuffle is per seed — nothing worth keeping
+            page = _saved_page(
+                db, saved, sort, limit, offset, date_filter, requesting_photographer, include_hotpreview, cursor,
+            )
+            if page is not None:
+                return page
+
+    q = _execute_query(
+        db, logic, criteria, date_filter, requesting_photographer,
+        list_item_query(db, include_hotpreview),
+    )
+    if sort == RELEVANCE:
+        rows, next_cursor = _relevance_page(db, q, _relevance(criteria), limit, cursor, offset)
+    else:
+        rows, next_cursor = photo_cursor.page(q, sort, limit, cursor=cursor, offset=offset, seed=seed)
+    return list_items(rows), next_cursor
+
+
+def neighbours(
+    db: Session,
+    hothash: str,
+    n: int,
+    logic: str,
+    criteria: list[SearchCriterion],
+    sort: str = "taken_at_desc",
+    date_filter: str | None = None,
+    requesting_photographer=None,
+    include_hotpreview: bool = True,
+    seed: int | None = None,
+) -> tuple[list[Photo], list[Photo]]:
+    """Up to n results before and after hothash, nearest first."""
+    from services import photo_cursor
+    from services.photo_service import get_by_hothash, hotpreview_loader
+
+    photo = get_by_hothash(db, hothash)
+    q = _execute_query(
+        db, logic, criteria, date_filter, requesting_photographer,
+        db.query(Photo).options(selectinload(Photo.correction), hotpreview_loader(include_hotpreview)),
+    )
+    if sort == RELEVANCE:
+        rank = _relevance(criteria)
+        key = [_rank_of(db, rank, photo.id), photo.id]
+        prev = _relevance_after(q.order_by(rank.asc(), Photo.id.desc()), rank, key, reverse=True).limit(n).all()
+        return prev, _relevance_after(q.order_by(rank.desc(), Photo.id), rank, key).limit(n).all()
+    return photo_cursor.neighbours(q, sort, photo, n, seed=seed)
+
+
+def _execute_query(db, logic, criteria, date_filter, requesting_photographer, q):
     from services.access_filter import PhotoAccessFilter
-    from services.photo_service import _apply_sort
 
-    q = _base_query(db, logic, criteria).options(selectinload(Photo.correction))
+    q = _base_query(db, logic, criteria, q=q)
     q = PhotoAccessFilter.apply(q, requesting_photographer)
 
     # date_filter is always ANDed regardless of `logic` – see docs/decisions/006-timeline.md
@@ -60,9 +131,360 @@ def execute(
         day_start = _parse_dt(date_filter).replace(hour=0, minute=0, second=0, microsecond=0)
         day_end = day_start + timedelta(days=1)
         q = q.filter(Photo.taken_at >= day_start, Photo.taken_at < day_end)
+    return q
 
-    q = _apply_sort(q, sort)
-    return q.offset(offset).limit(limit).all()
+
+# ---------------------------------------------------------------------------
+# Saved-search result cache
+# ---------------------------------------------------------------------------
+
+# Ordered result ids (16 bytes each) per (saved search, criteria, sort, date_filter,
+# access scope, library generation); bounded by total size, least recently used first out
+_saved_results = ResultCache(
+    max_entries=256, max_weight=app_settings.saved_search_cache_mb * 1024 * 1024, weigh=len,
+)
+
+
+def saved_criteria(saved: SavedSearch) -> list[SearchCriterion]:
+    return [SearchCriterion(**c) for c in saved.criteria]
+
+
+def resolve_criteria(db: Session, search_id, logic: str, criteria: list[SearchCriterion]):
+    """(logic, criteria) of the saved search when search_id is given, else as passed."""
+    if search_id is None:
+        return logic, criteria
+    saved = get_or_404(db, search_id)
+    return saved.logic, saved_criteria(saved)
+
+
+def _saved_page(
+    db: Session, saved: SavedSearch, sort, limit, offset, date_filter, requesting_photographer,
+    include_hotpreview, cursor,
+) -> tuple[list[dict], str | None] | None:
+    """One page of a saved search from its cached result order.
+
+    The first open runs the search once and keeps only the ordered ids; every
+    page after that (and every reopen until the library changes) is a slice of
+    that list plus one primary-key lookup for the page's rows. Returns None when
+    a cursor's row is no longer in the list — the caller then pages normally.
+    """
+    from services import photo_cursor
+    from services.photo_service import list_item_query, list_items
+
+    logic, criteria = saved.logic, saved_criteria(saved)
+    ids = _cached(
+        _saved_results, "saved-ids", db, [str(saved.id), _criteria_spec(logic, criteria), date_filter, sort],
+        requesting_photographer,
+        lambda snapshot: _ordered_ids(snapshot, logic, criteria, sort, date_filter, requesting_photographer),
+    )
+
+    start = offset
+    if cursor:
+        start = _position_after(ids, _cursor_photo_id(cursor, sort))
+        if start is None:
+            return None
+    page_ids = [uuid.UUID(bytes=ids[i:i + 16]) for i in range(start * 16, min(len(ids), (start + limit) * 16), 16)]
+    by_id = {
+        row.id: row
+        for row in list_item_query(db, include_hotpreview).filter(Photo.id.in_(page_ids)).all()
+    } if page_ids else {}
+    rows = [by_id[str(i)] for i in page_ids if str(i) in by_id]  # ids are selected as text
+
+    next_cursor = None
+    if rows and (start + limit) * 16 < len(ids):
+        last = rows[-1]
+        if sort == RELEVANCE:
+            next_cursor = photo_cursor.encode_key(RELEVANCE, [_rank_of(db, _relevance(criteria), last.id), last.id])
+        else:
+            next_cursor = photo_cursor.encode(last, sort)
+    return list_items(rows), next_cursor
+
+
+def _ordered_ids(db: Session, logic, criteria, sort, date_filter, requesting_photographer) -> bytes:
+    from services import photo_cursor
+
+    q = _execute_query(db, logic, criteria, date_filter, requesting_photographer, db.query(Photo.id))
+    if sort == RELEVANCE:
+        q = q.order_by(_relevance(criteria).desc(), Photo.id)
+    else:
+        q = photo_cursor.order_by(q, sort)
+    return b"".join(row.id.bytes for row in q.yield_per(10_000))
+
+
+def _cursor_photo_id(cursor: str, sort: str) -> uuid.UUID:
+    """The id of the last row of the previous page — every sort key ends with it."""
+    from services import photo_cursor
+
+    if sort == RELEVANCE:
+        try:
+            return uuid.UUID(photo_cursor.decode_key(cursor, RELEVANCE)[-1])
+        except (TypeError, ValueError, IndexError):
+            raise HTTPException(status_code=422, detail="Invalid cursor")
+    return photo_cursor.decode(cursor, sort)[-1]
+
+
+def _position_after(ids: bytes, photo_id: uuid.UUID) -> int | None:
+    needle = photo_id.bytes
+    i = ids.find(needle)
+    while i != -1 and i % 16:
+        i = ids.find(needle, i + 1)
+    return None if i == -1 else i // 16 + 1
+
+
+# ---------------------------------------------------------------------------
+# Relevance order (free-text criterion)
+# ---------------------------------------------------------------------------
+
+RELEVANCE = "relevance"
+
+
+def _relevance(criteria: list[SearchCriterion]):
+    """Rank expression for sort=relevance: the best word_similarity() of the
+    free-text criteria against any searched text of a photo."""
+    from sqlalchemy import Float, cast, func, select
+
+    from models.event import Event
+    from models.photo import ImageFile
+
+    terms = [str(c.value) for c in criteria if c.field == "text" and c.value]
+    if not terms:
+        raise HTTPException(status_code=422, detail="sort=relevance needs a text criterion")
+    term = " ".join(terms)
+
+    files = (
+        select(func.max(func.word_similarity(term, ImageFile.file_path)))
+        .where(ImageFile.photo_id == Photo.id)
+        .scalar_subquery()
+    )
+    event = (
+        select(func.greatest(
+            func.word_similarity(term, Event.name),
+            func.word_similarity(term, func.coalesce(Event.description, "")),
+        ))
+        .where(Event.id == Photo.event_id)
+        .scalar_subquery()
+    )
+    # word_similarity() is real; compare and encode cursors as double precision
+    return cast(func.greatest(
+        *(func.word_similarity(term, func.coalesce(c, "")) for c in _TEXT_COLUMNS),
+        func.coalesce(files, 0),
+        func.coalesce(event, 0),
+    ), Float)
+
+
+def _rank_of(db: Session, rank, photo_id) -> float:
+    return db.query(rank).select_from(Photo).filter(Photo.id == photo_id).scalar()
+
+
+def _relevance_after(q, rank, key: list, reverse: bool = False):
+    """Rows after key in (rank DESC, id) order — before it if reverse."""
+    from sqlalchemy import and_, or_
+
+    value, photo_id = key
+    if reverse:
+        return q.filter(or_(rank > value, and_(rank == value, Photo.id < photo_id)))
+    return q.filter(or_(rank < value, and_(rank == value, Photo.id > photo_id)))
+
+
+def _relevance_page(db: Session, q, rank, limit: int, cursor: str | None, offset: int):
+    """One page in relevance order. Every match is ranked to sort them, so the
+    cursor (rank, id) mainly keeps pages stable rather than saving work."""
+    from services import photo_cursor
+
+    q = q.order_by(rank.desc(), Photo.id)
+    if cursor:
+        try:
+            value, photo_id = photo_cursor.decode_key(cursor, RELEVANCE)
+            key = [float(value), uuid.UUID(photo_id)]
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail="Invalid cursor")
+        q = _relevance_after(q, rank, key)
+    else:
+        q = q.offset(offset)
+    rows = q.limit(limit).all()
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1].id
+        next_cursor = photo_cursor.encode_key(RELEVANCE, [_rank_of(db, rank, last), last])
+    return rows, next_cursor
+
+
+# ---------------------------------------------------------------------------
+# Totals and facets
+# ---------------------------------------------------------------------------
+
+# Keyed by (kind, criteria hash, library generation) — see models/library_generation.py
+_result_cache = ResultCache(max_entries=512)
+
+_FACET_COLUMNS = ("camera_model", "lens_model", "rating", "year", "photographer", "event")
+
+
+def _criteria_spec(logic: str, criteria: list[SearchCriterion]) -> list:
+    return [logic, [c.model_dump(mode="json") for c in criteria]]
+
+
+def _cached(cache: ResultCache, kind: str, db: Session, spec: list, requesting_photographer, compute):
+    """compute(snapshot) through cache, keyed by (kind, hash of spec + access scope, library generation).
+
+    The generation and, on a miss, compute run in one REPEATABLE READ snapshot on
+    a session of their own, so a result is never stored under a generation that
+    includes writes its query did not see.
+    """
+    from models import library_generation
+
+    scope = None
+    if requesting_photographer is not None and requesting_photographer.access_level != "owner":
+        scope = str(requesting_photographer.id)
+    raw = json.dumps([spec, scope], sort_keys=True, separators=(",", ":"))
+    with Session(db.get_bind()) as snapshot:
+        snapshot.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        generation, logged = library_generation.current_generation(snapshot)
+        value = cache.get_or_compute(
+            (kind, hashlib.sha256(raw.encode()).hexdigest(), generation), lambda: compute(snapshot),
+        )
+    if logged > library_generation.FOLD_ROWS:
+        with Session(db.get_bind()) as fold:
+            library_generation.fold_log(fold)
+    return value
+
+
+def total(
+    db: Session,
+    logic: str,
+    criteria: list[SearchCriterion],
+    mode: str = "exact",
+    date_filter: str | None = None,
+    requesting_photographer=None,
+) -> int:
+    """Number of matches. mode="estimate" reads the planner's row estimate instead of counting."""
+    from sqlalchemy import func
+
+    if mode not in ("exact", "estimate"):
+        raise HTTPException(status_code=422, detail="total must be 'exact' or 'estimate'")
+
+    def compute(snapshot: Session) -> int:
+        q = _execute_query(snapshot, logic, criteria, date_filter, requesting_photographer, snapshot.query(Photo.id))
+        if mode == "estimate":
+            return _estimate_rows(snapshot, q)
+        return q.with_entities(func.count(Photo.id)).order_by(None).scalar()
+
+    return _cached(
+        _result_cache, mode, db, [_criteria_spec(logic, criteria), date_filter], requesting_photographer, compute,
+    )
+
+
+def _estimate_rows(db: Session, q) -> int:
+    compiled = q.statement.compile(dialect=db.bind.dialect, compile_kwargs={"render_postcompile": True})
+    plan = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def facets(
+    db: Session,
+    logic: str,
+    criteria: list[SearchCriterion],
+    date_filter: str | None = None,
+    requesting_photographer=None,
+) -> SearchFacets:
+    """Exact total and per-field histograms for the matching photos.
+
+    One statement: the matches are materialized once as a CTE, GROUPING SETS
+    counts every column facet (and the total) in a single pass over it, and
+    tag counts are UNION ALLed from a join with photo_tags.
+    """
+    return _cached(
+        _result_cache, "facets", db, [_criteria_spec(logic, criteria), date_filter], requesting_photographer,
+        lambda snapshot: _compute_facets(snapshot, logic, criteria, date_filter, requesting_photographer),
+    )
+
+
+def _compute_facets(db, logic, criteria, date_filter, requesting_photographer) -> SearchFacets:
+    from sqlalchemy import String, cast, case, extract, func, literal, select, tuple_, union_all
+
+    from models.event import Event
+    from models.photographer import Photographer
+    from models.tag import Tag
+
+    matches = _execute_query(
+        db, logic, criteria, date_filter, requesting_photographer,
+        db.query(
+            Photo.id.label("id"),
+            Photo.camera_model.label("camera_model"),
+            Photo.lens_model.label("lens_model"),
+            Photo.rating.label("rating"),
+            extract("year", func.timezone("UTC", Photo.taken_at)).label("year"),
+            Photo.photographer_id.label("photographer"),
+            Photo.event_id.label("event"),
+        ),
+    ).cte("matches")
+
+    columns = [matches.c[name] for name in _FACET_COLUMNS]
+    grouped = (
+        select(
+            case(*[(func.grouping(c) == 0, literal(c.name)) for c in columns], else_=literal("total")).label("facet"),
+            case(*[(func.grouping(c) == 0, cast(c, String)) for c in columns]).label("value"),
+            func.count().label("count"),
+        )
+        .select_from(matches)
+        .group_by(func.grouping_sets(*columns, tuple_()))
+    )
+    tags = (
+        select(literal("tags"), cast(PhotoTag.tag_id, String), func.count())
+        .select_from(matches.join(PhotoTag, PhotoTag.photo_id == matches.c.id))
+        .group_by(PhotoTag.tag_id)
+    )
+
+    result: dict[str, list[dict]] = {name: [] for name in (*_FACET_COLUMNS, "tags")}
+    count = 0
+    for facet, value, n in db.execute(union_all(grouped, tags)):
+        if facet == "total":
+            count = n
+        else:
+            if value is not None and facet in ("rating", "year"):
+                value = int(float(value))
+            result[facet].append({"value": value, "count": n})
+
+    labels = {
+        "photographer": Photographer,
+        "event": Event,
+        "tags": Tag,
+    }
+    for facet, model in labels.items():
+        ids = [uuid.UUID(b["value"]) for b in result[facet] if b["value"] is not None]
+        names = {str(i): name for i, name in db.query(model.id, model.name).filter(model.id.in_(ids))} if ids else {}
+        for b in result[facet]:
+            b["label"] = names.get(b["value"])
+
+    return SearchFacets(
+        total=count,
+        facets={
+            name: [FacetBucket(**b) for b in sorted(buckets, key=lambda b: (-b["count"], str(b["value"])))]
+            for name, buckets in result.items()
+        },
+    )
+
+
+# ---------------------------------------------------------------------------
+# Map
+# ---------------------------------------------------------------------------
+
+def map_clusters(
+    db: Session,
+    logic: str,
+    criteria: list[SearchCriterion],
+    zoom: int,
+    west: float,
+    south: float,
+    east: float,
+    north: float,
+    date_filter: str | None = None,
+    requesting_photographer=None,
+) -> list[dict]:
+    """Marker clusters for the search results — see photo_service.clusters_of()."""
+    from services.photo_service import clusters_of
+
+    q = _execute_query(db, logic, criteria, date_filter, requesting_photographer, db.query(Photo))
+    return clusters_of(q, zoom, west, south, east, north)
 
 
 # ---------------------------------------------------------------------------
@@ -76,60 +498,98 @@ def timeline(
     session_id=None,
     event_id=None,
     requesting_photographer=None,
+    search_id: uuid.UUID | None = None,
 ) -> list[dict]:
     """Return a year→month→day tree for all dated photos matching the criteria.
 
+    With search_id the saved search's logic and criteria are used instead, and
+    the tree is cached until the library changes. The cached tree holds only
+    cover hothashes; the hotpreviews are looked up per request, so a cached
+    tree stays a few bytes per day.
+
     Only photos with taken_at IS NOT NULL are included. Photos without a date
     are excluded; the caller must handle them separately if needed.
 
     Cover photo per node = newest photo in that node (taken_at DESC).
     Grouping uses UTC dates from the stored taken_at value.
     """
+    if search_id is None:
+        tree = _compute_timeline(db, logic, criteria, session_id, event_id, requesting_photographer)
+    else:
+        saved = get_or_404(db, search_id)
+        logic, criteria = saved.logic, saved_criteria(saved)
+        spec = [str(saved.id), _criteria_spec(logic, criteria), str(session_id), str(event_id)]
+        tree = _cached(
+            _result_cache, "timeline", db, spec, requesting_photographer,
+            lambda snapshot: _compute_timeline(snapshot, logic, criteria, session_id, event_id, requesting_photographer),
+        )
+    return _with_cover_hotpreviews(db, tree)
+
+
+def _with_cover_hotpreviews(db: Session, tree: list[dict]) -> list[dict]:
+    """Copy of the tree with cover_hotpreview_b64 on every node (the tree may be cached)."""
+    from services.photo_service import hotpreview_b64_map
+
+    # Year and month covers are always one of the day covers
+    previews = hotpreview_b64_map(db, (d["cover_hothash"] for y in tree for m in y["months"] for d in m["days"]))
+
+    def covered(node: dict) -> dict:
+        return {**node, "cover_hotpreview_b64": previews[node["cover_hothash"]]}
+
+    return [
+        {**covered(y), "months": [{**covered(m), "days": [covered(d) for d in m["days"]]} for m in y["months"]]}
+        for y in tree
+    ]
+
+
+def _compute_timeline(db: Session, logic, criteria, session_id, event_id, requesting_photographer) -> list[dict]:
+    """The year→month→day tree with cover hothashes but no hotpreviews."""
+    from sqlalchemy import func
+
     from services.access_filter import PhotoAccessFilter
 
     q = _base_query(db, logic, criteria, session_id=session_id, event_id=event_id)
     q = PhotoAccessFilter.apply(q, requesting_photographer)
 
-    # Lightweight fetch: only 3 columns, no ORM overhead for corrections etc.
+    # One row per day, grouped and counted in SQL: DISTINCT ON keeps the newest
+    # photo of each day as its cover, the window counts the whole day. Memory
+    # follows the number of days, not the number of matches.
+    day = func.date(func.timezone("UTC", Photo.taken_at))
     rows = (
-        q.with_entities(Photo.hothash, Photo.hotpreview_b64, Photo.taken_at)
+        q.with_entities(
+            day.label("day"),
+            func.count().over(partition_by=day).label("count"),
+            Photo.hothash.label("cover_hothash"),
+        )
         .filter(Photo.taken_at.isnot(None))
-        .order_by(Photo.taken_at.asc())  # ascending so last element = newest
+        .order_by(day.desc(), Photo.taken_at.desc(), Photo.hothash.desc())
+        .distinct(day)
         .all()
     )
 
     if not rows:
         return []
 
-    # Group by (year, month, day)
-    day_map: dict[tuple, list] = defaultdict(list)
-    for row in rows:
-        key = (row.taken_at.year, row.taken_at.month, row.taken_at.day)
-        day_map[key].append(row)
-
-    # Build nested structure – iterate keys newest-first so first-seen cover
-    # for each year/month is already the newest day's photo
+    # Build nested structure – rows are newest day first, so the first day seen
+    # for each year/month carries its cover
     year_map: dict[int, dict] = {}
 
-    for (year, month, day) in sorted(day_map.keys(), reverse=True):
-        day_rows = day_map[(year, month, day)]
-        cover = day_rows[-1]  # last in ascending list = newest photo
-        count = len(day_rows)
+    for row in rows:
+        year, month = row.day.year, row.day.month
 
         if year not in year_map:
-            year_map[year] = {"count": 0, "cover": cover, "months": {}}
+            year_map[year] = {"count": 0, "cover": row.cover_hothash, "months": {}}
 
         ym = year_map[year]["months"]
         if month not in ym:
-            ym[month] = {"count": 0, "cover": cover, "days": []}
+            ym[month] = {"count": 0, "cover": row.cover_hothash, "days": []}
 
-        year_map[year]["count"] += count
-        ym[month]["count"] += count
+        year_map[year]["count"] += row.count
+        ym[month]["count"] += row.count
         ym[month]["days"].append({
-            "day": day,
-            "count": count,
-            "cover_hothash": cover.hothash,
-            "cover_hotpreview_b64": cover.hotpreview_b64,
+            "day": row.day.day,
+            "count": row.count,
+            "cover_hothash": row.cover_hothash,
         })
 
     # Serialize – newest year/month first; days already in descending order
@@ -142,15 +602,13 @@ def timeline(
             months.append({
                 "month": month,
                 "count": m["count"],
-                "cover_hothash": m["cover"].hothash,
-                "cover_hotpreview_b64": m["cover"].hotpreview_b64,
+                "cover_hothash": m["cover"],
                 "days": m["days"],
             })
         result.append({
             "year": year,
             "count": y["count"],
-            "cover_hothash": y["cover"].hothash,
-            "cover_hotpreview_b64": y["cover"].hotpreview_b64,
+            "cover_hothash": y["cover"],
             "months": months,
         })
 
@@ -209,34 +667,30 @@ def _criterion_to_clause(c: SearchCriterion):
         if op == "eq" and value:
             return Photo.camera_make == value
         if op == "contains" and value:
-            return Photo.camera_make.ilike(f"%{value}%")
+            return _contains(Photo.camera_make, value)
 
     elif field == "camera_model":
         if op == "eq" and value:
             return Photo.camera_model == value
         if op == "contains" and value:
-            return Photo.camera_model.ilike(f"%{value}%")
+            return _contains(Photo.camera_model, value)
+
+    elif field == "text":
+        if op == "contains" and value:
+            return Photo.id.in_(_text_matches(str(value)))
 
     elif field == "tags":
         if not isinstance(value, list) or not value:
             return None
-        from sqlalchemy import func, select
+        from sqlalchemy import not_
+        # photos.tag_ids mirrors photo_tags; these use its GIN index (see tag_service)
         tag_ids = [uuid.UUID(v) for v in value]
         if op == "any_of":
-            sub = select(PhotoTag.photo_id).where(PhotoTag.tag_id.in_(tag_ids)).scalar_subquery()
-            return Photo.id.in_(sub)
+            return Photo.tag_ids.overlap(tag_ids)
         if op == "all_of":
-            sub = (
-                select(PhotoTag.photo_id)
-                .where(PhotoTag.tag_id.in_(tag_ids))
-                .group_by(PhotoTag.photo_id)
-                .having(func.count(PhotoTag.tag_id.distinct()) == len(tag_ids))
-                .scalar_subquery()
-            )
-            return Photo.id.in_(sub)
+            return Photo.tag_ids.contains(tag_ids)
         if op == "none_of":
-            sub = select(PhotoTag.photo_id).where(PhotoTag.tag_id.in_(tag_ids)).scalar_subquery()
-            return Photo.id.not_in(sub)
+            return not_(Photo.tag_ids.overlap(tag_ids))
 
     elif field == "iso":
         if op == "gte":
@@ -278,7 +732,7 @@ def _criterion_to_clause(c: SearchCriterion):
         if op == "eq" and value:
             return Photo.lens_model == value
         if op == "contains" and value:
-            return Photo.lens_model.ilike(f"%{value}%")
+            return _contains(Photo.lens_model, value)
         if op == "is_null":
             return Photo.lens_model.is_(None)
 
@@ -303,12 +757,10 @@ def _criterion_to_clause(c: SearchCriterion):
             lat = float(value["lat"])
             lng = float(value["lng"])
             r = float(value["radius_km"])
+            from services.photo_service import location_in_box
             lat_delta = r / 111.0
             lng_delta = r / (111.0 * math.cos(math.radians(lat)))
-            bb = and_(
-                Photo.location_lat.between(lat - lat_delta, lat + lat_delta),
-                Photo.location_lng.between(lng - lng_delta, lng + lng_delta),
-            )
+            bb = location_in_box(lng - lng_delta, lat - lat_delta, lng + lng_delta, lat + lat_delta)
             dlat = sfunc.radians(Photo.location_lat - lat)
             dlng = sfunc.radians(Photo.location_lng - lng)
             a = (
@@ -347,6 +799,37 @@ def _criterion_to_clause(c: SearchCriterion):
     return None
 
 
+# Photo columns searched by the free-text criterion (trigram-indexed, d1e2f3a4b053)
+_TEXT_COLUMNS = (Photo.camera_make, Photo.camera_model, Photo.lens_model, Photo.share_caption)
+
+
+def _contains(column, value) -> Any:
+    """Case-insensitive substring match; % and _ in value are literal
+    (backslash is PostgreSQL's default LIKE escape)."""
+    escaped = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%")
+
+
+def _text_matches(value: str):
+    """Ids of photos whose text columns, file paths or event name/description
+    contain value. A UNION of per-table lookups, so each branch can use its
+    trigram index instead of one OR that scans photos."""
+    from sqlalchemy import or_, select, union
+    from sqlalchemy.orm import aliased
+
+    from models.event import Event
+    from models.photo import ImageFile
+
+    p = aliased(Photo)
+    return union(
+        select(p.id).where(or_(*(_contains(getattr(p, c.key), value) for c in _TEXT_COLUMNS))),
+        select(ImageFile.photo_id).where(_contains(ImageFile.file_path, value)),
+        select(p.id).join(Event, Event.id == p.event_id).where(
+            or_(_contains(Event.name, value), _contains(Event.description, value)),
+        ),
+    )
+
+
 def _parse_dt(value: Any) -> datetime:
     if isinstance(value, datetime):
         return value
@@ -0,0 +1,164 @@
+"""Hybrid semantic + structured search (CLIP similarity ranked, criteria filtered).
+
+The worker owns the CLIP vectors (Qdrant, ADR-022) and keeps a small filter
+payload on every point — see clip_payload(). A search goes one of two ways:
+
+    selective criteria    the matching photo ids (at most EXACT_LIMIT) are sent
+                          along and the worker ranks exactly within them
+    everything else       the criteria that map to payload fields are pushed
+                          down as a vector filter; the top hits are re-checked
+                          against the full criteria in SQL, over-fetching until
+                          the page is filled
+
+SQL stays authoritative either way: a stale payload can only cost a hit, never
+show a photo the criteria (or the guest scope) exclude.
+"""
+
+import uuid
+from datetime import timedelta
+
+import httpx
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.photo import Photo
+from schemas.saved_search import SearchCriterion
+
+# Criteria matching at most this many photos are ranked exactly by id
+EXACT_LIMIT = 5000
+# Hits requested per needed result, and growth factor while the page is short
+OVERFETCH = 4
+MAX_CANDIDATES = 4000
+
+_CURSOR_SORT = "semantic"
+
+
+def clip_payload(taken_at, photographer_id, event_id, rating, deleted_at) -> dict:
+    """Filterable fields stored with a photo's CLIP point."""
+    return {
+        "taken_at": taken_at.timestamp() if taken_at else None,
+        "photographer_id": str(photographer_id),
+        "event_id": str(event_id) if event_id else None,
+        "rating": rating,
+        "deleted": deleted_at is not None,
+    }
+
+
+def payload_filter(
+    logic: str, criteria: list[SearchCriterion], date_filter: str | None, requesting_photographer,
+) -> list[dict]:
+    """Vector-filter conditions implied by the search (all must hold).
+
+    Only criteria on payload fields translate; under OR logic none of them can
+    be pushed down alone, so only the fixed conditions are sent.
+    """
+    from services.search_service import _parse_dt
+
+    must = [{"key": "deleted", "match": False}]
+    if requesting_photographer is not None and requesting_photographer.access_level != "owner":
+        must.append({"key": "photographer_id", "match": str(requesting_photographer.id)})
+    if date_filter:
+        start = _parse_dt(date_filter).replace(hour=0, minute=0, second=0, microsecond=0)
+        must.append({"key": "taken_at", "gte": start.timestamp(), "lt": (start + timedelta(days=1)).timestamp()})
+    if logic != "OR":
+        must += [c for crit in criteria if (c := _condition(crit, _parse_dt)) is not None]
+    return must
+
+
+def _condition(c: SearchCriterion, parse_dt) -> dict | None:
+    field, op, value = c.field, c.operator, c.value
+    if field == "rating":
+        if op == "eq":
+            return {"key": "rating", "match": value}
+        if op in ("gte", "lte"):
+            return {"key": "rating", op: value}
+        if op == "is_null":
+            return {"key": "rating", "is_null": True}
+    elif field == "taken_at":
+        if op == "after" and value:
+            return {"key": "taken_at", "gte": parse_dt(value).timestamp()}
+        if op == "before" and value:
+            return {"key": "taken_at", "lte": parse_dt(value).timestamp()}
+        if op == "between" and isinstance(value, list) and len(value) == 2:
+            return {"key": "taken_at", "gte": parse_dt(value[0]).timestamp(), "lte": parse_dt(value[1]).timestamp()}
+    elif field in ("photographer_id", "event_id"):
+        if op == "eq" and value:
+            return {"key": field, "match": str(uuid.UUID(value))}
+        if op == "neq" and value:
+            return {"key": field, "except": [str(uuid.UUID(value))]}
+        if op == "is_null":
+            return {"key": field, "is_null": True}
+    return None
+
+
+def _worker_search(q: str, limit: int, must: list[dict], ids: list[str] | None = None) -> list[uuid.UUID]:
+    """Photo ids of the worker's top `limit` hits, best first."""
+    if not settings.ai_search_url:
+        raise HTTPException(status_code=503, detail="AI_SEARCH_URL ikke konfigurert")
+    url = settings.ai_search_url.rstrip("/") + "/search"
+    try:
+        resp = httpx.post(url, json={"q": q, "limit": limit, "must": must, "ids": ids}, timeout=15)
+        resp.raise_for_status()
+    except httpx.ConnectError:
+        raise HTTPException(status_code=503, detail="Søketjenesten er ikke tilgjengelig")
+    except httpx.HTTPStatusError as exc:
+        raise HTTPException(status_code=502, detail=str(exc))
+    return [uuid.UUID(hit["id"]) for hit in resp.json()]
+
+
+def search(
+    db: Session,
+    q: str,
+    logic: str,
+    criteria: list[SearchCriterion],
+    limit: int = 100,
+    offset: int = 0,
+    date_filter: str | None = None,
+    requesting_photographer=None,
+    include_hotpreview: bool = True,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """Return (list items, next_cursor) for one page, most similar first."""
+    from services import photo_cursor
+    from services.photo_service import list_item_query, list_items
+    from services.search_service import _execute_query
+
+    if cursor:
+        key = photo_cursor.decode_key(cursor, _CURSOR_SORT)
+        if len(key) != 1 or not isinstance(key[0], int) or key[0] < 0:
+            raise HTTPException(status_code=422, detail="Invalid cursor")
+        offset = key[0]
+    wanted = offset + limit + 1  # one extra tells whether a next page exists
+
+    matches = _execute_query(db, logic, criteria, date_filter, requesting_photographer, db.query(Photo.id))
+    selective = None
+    guest = requesting_photographer is not None and requesting_photographer.access_level != "owner"
+    if criteria or date_filter or guest:
+        selective = [str(i) for (i,) in matches.limit(EXACT_LIMIT + 1)]
+        if len(selective) > EXACT_LIMIT:
+            selective = None
+
+    if selective is not None:
+        ranked = _worker_search(q, wanted, [], ids=selective) if selective else []
+    else:
+        must = payload_filter(logic, criteria, date_filter, requesting_photographer)
+        candidates = min(MAX_CANDIDATES, max(100, OVERFETCH * wanted))
+        while True:
+            hits = _worker_search(q, candidates, must)
+            valid = {i for (i,) in matches.filter(Photo.id.in_(hits))} if hits else set()
+            ranked = [i for i in hits if i in valid]
+            if len(ranked) >= wanted or len(hits) < candidates or candidates >= MAX_CANDIDATES:
+                break
+            candidates = min(MAX_CANDIDATES, candidates * OVERFETCH)
+
+    page_ids = ranked[offset:offset + limit]
+    by_id = {
+        row.id: row
+        for row in list_item_query(db, include_hotpreview).filter(Photo.id.in_(page_ids))
+    } if page_ids else {}
+    rows = [by_id[str(i)] for i in page_ids if str(i) in by_id]  # ids are selected as text
+    next_cursor = None
+    if len(ranked) > offset + limit:
+        next_cursor = photo_cursor.encode_key(_CURSOR_SORT, [offset + limit])
+    return list_items(rows), next_cursor
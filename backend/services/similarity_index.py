@@ -0,0 +1,159 @@
+"""Perceptual-hash similarity lookups (ADR-004) on an in-memory HashIndex.
+
+One index per hash kind, built on first use from the photos' hash columns (one
+streamed query) and kept for the life of the process. Registration and the
+hash backfill add photos through photo_added(); nothing else is tracked, so
+every hit is re-checked in SQL — not deleted, visible to the requester — and a
+photo removed since the build never shows up in a result.
+"""
+
+import threading
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from models.photo import Photo
+from utils.hash_index import HashIndex, to_unsigned
+
+KINDS = {"dct": Photo.dct_perceptual_hash, "difference": Photo.difference_hash}
+
+# Past this the probed buckets cover most of the library and a lookup is a scan
+MAX_DISTANCE = 16
+
+_KEY_DTYPE = "V32"  # hothash as its 32 raw SHA-256 bytes
+_U64 = (1 << 64) - 1
+_IN_CHUNK = 10_000
+
+_lock = threading.Lock()
+_indexes: dict[str, HashIndex] = {}
+
+
+def _column(kind: str):
+    if kind not in KINDS:
+        raise HTTPException(status_code=422, detail=f"Unknown hash kind: {kind}")
+    return KINDS[kind]
+
+
+def _index(db: Session, kind: str) -> HashIndex:
+    index = _indexes.get(kind)
+    if index is None:
+        with _lock:
+            index = _indexes.get(kind)
+            if index is None:
+                index = _indexes[kind] = _load(db, KINDS[kind])
+    return index
+
+
+def _load(db: Session, column) -> HashIndex:
+    keys, hashes = [], []
+    rows = db.query(Photo.hothash, column).filter(column.isnot(None)).execution_options(yield_per=50_000)
+    for hothash, h in rows:
+        keys.append(bytes.fromhex(hothash))
+        hashes.append(h)
+    return HashIndex(to_unsigned(hashes), keys, key_dtype=_KEY_DTYPE)
+
+
+def photo_added(hothash: str, dct_hash: int | None, diff_hash: int | None) -> None:
+    """Add a newly hashed photo to the indexes already loaded (call after commit).
+
+    Takes the build lock, so a photo committed while an index loads is added
+    once the load is done.
+    """
+    with _lock:
+        for kind, h in (("dct", dct_hash), ("difference", diff_hash)):
+            index = _indexes.get(kind)
+            if index is not None and h is not None:
+                index.add(bytes.fromhex(hothash), h & _U64)
+
+
+def reset() -> None:
+    """Drop the loaded indexes; the next lookup rebuilds them from photos."""
+    with _lock:
+        _indexes.clear()
+
+
+def _visible(db: Session, hothashes, requesting_photographer) -> set[str]:
+    """The given photos that exist, are not deleted and are visible to the requester."""
+    from services.access_filter import PhotoAccessFilter
+
+    hothashes = list(hothashes)
+    visible = set()
+    for i in range(0, len(hothashes), _IN_CHUNK):
+        q = db.query(Photo.hothash).filter(
+            Photo.hothash.in_(hothashes[i:i + _IN_CHUNK]), Photo.deleted_at.is_(None),
+        )
+        visible.update(h for (h,) in PhotoAccessFilter.apply(q, requesting_photographer))
+    return visible
+
+
+def _neighbours(index: HashIndex, hothash: str, h: int, max_distance: int) -> dict[str, int]:
+    """{hothash: distance} of the other photos within max_distance, nearest first."""
+    found = {}
+    for key, distance in index.within(h & _U64, max_distance):
+        other = bytes(key).hex()
+        if other != hothash:
+            found.setdefault(other, distance)  # a key can be in the index twice
+    return found
+
+
+def similar(
+    db: Session,
+    hothash: str,
+    kind: str = "dct",
+    max_distance: int = 10,
+    limit: int = 100,
+    requesting_photographer=None,
+) -> list[dict]:
+    """Photos within max_distance of hothash's hash, nearest first.
+
+    Empty when the photo has no hash of that kind yet.
+    """
+    from services.access_filter import PhotoAccessFilter
+
+    column = _column(kind)
+    q = db.query(column).filter(Photo.hothash == hothash, Photo.deleted_at.is_(None))
+    row = PhotoAccessFilter.apply(q, requesting_photographer).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Photo not found")
+    if row[0] is None:
+        return []
+    found = _neighbours(_index(db, kind), hothash, row[0], max_distance)
+    visible = _visible(db, found, requesting_photographer)
+    return [{"hothash": h, "distance": d} for h, d in found.items() if h in visible][:limit]
+
+
+def similar_pairs(
+    db: Session,
+    kind: str = "dct",
+    max_distance: int = 6,
+    hothashes: list[str] | None = None,
+    limit: int = 1000,
+    requesting_photographer=None,
+) -> list[dict]:
+    """Unordered pairs of photos within max_distance, closest first.
+
+    With hothashes, only pairs with at least one photo among them (one lookup
+    per listed photo); without, every pair in the library (one lookup per
+    photo — seconds for a large library).
+    """
+    from services.access_filter import PhotoAccessFilter
+
+    column = _column(kind)
+    index = _index(db, kind)
+    pairs: dict[tuple[str, str], int] = {}
+    if hothashes is not None:
+        q = db.query(Photo.hothash, column).filter(
+            Photo.hothash.in_(set(hothashes)), Photo.deleted_at.is_(None), column.isnot(None),
+        )
+        for hothash, h in PhotoAccessFilter.apply(q, requesting_photographer):
+            for other, distance in _neighbours(index, hothash, h, max_distance).items():
+                pairs[tuple(sorted((hothash, other)))] = distance
+    else:
+        for a, b, distance in index.pairs(max_distance):
+            a, b = bytes(a).hex(), bytes(b).hex()
+            if a != b:
+                pairs[tuple(sorted((a, b)))] = distance
+
+    visible = _visible(db, {h for pair in pairs for h in pair}, requesting_photographer)
+    ranked = sorted((d, a, b) for (a, b), d in pairs.items() if a in visible and b in visible)
+    return [{"a": a, "b": b, "distance": d} for d, a, b in ranked[:limit]]
@@ -25,7 +25,11 @@ def _stack_out(stack: Stack) -> StackOut:
 def _load_stack(db: Session, stack_id: uuid.UUID) -> Stack:
     stack = (
         db.query(Stack)
-        .options(selectinload(Stack.photos).selectinload(Photo.correction))
+        .options(
+            selectinload(Stack.photos).options(
+                selectinload(Photo.correction), selectinload(Photo.hotpreview),
+            )
+        )
         .filter(Stack.id == stack_id)
         .first()
     )
@@ -73,7 +77,7 @@ def create(db: Session, data: StackCreate) -> StackOut:
 def list_all(db: Session) -> list[StackOut]:
     stacks = (
         db.query(Stack)
-        .options(selectinload(Stack.photos))
+        .options(selectinload(Stack.photos).selectinload(Photo.hotpreview))
         .order_by(Stack.created_at.desc())
         .all()
     )
@@ -9,6 +9,21 @@ from models.tag import PhotoTag, Tag
 from schemas.tag import TagCreate, TagMergeResult, TagOut, TagRename, TagSimilar
 
 
+# photos.tag_ids mirrors photo_tags (sorted) so tag criteria can use its GIN
+# index. Every write to photo_tags recomputes the arrays of the photos it touched.
+_REFRESH_TAG_IDS = """
+    UPDATE photos p SET tag_ids = ARRAY(
+        SELECT pt.tag_id FROM photo_tags pt WHERE pt.photo_id = p.id ORDER BY pt.tag_id
+    )
+    WHERE {where}
+"""
+
+
+def _refresh_tag_ids(db: Session, where: str, params: dict) -> None:
+    db.flush()
+    db.execute(text(_REFRESH_TAG_IDS.format(where=where)), params)
+
+
 def _slugify(name: str) -> str:
     return re.sub(r"\s+", " ", name.strip()).lower()
 
@@ -95,6 +110,11 @@ def rename(db: Session, tag_id: uuid.UUID, data: TagRename) -> TagOut:
 
 def delete_tag(db: Session, tag_id: uuid.UUID) -> None:
     tag = get_or_404(db, tag_id)
+    db.execute(
+        text("UPDATE photos SET tag_ids = array_remove(tag_ids, CAST(:tag AS uuid)) "
+             "WHERE tag_ids @> ARRAY[CAST(:tag AS uuid)]"),
+        {"tag": str(tag_id)},
+    )
     db.delete(tag)
     db.commit()
 
@@ -122,6 +142,7 @@ def merge(db: Session, source_id: uuid.UUID, target_id: uuid.UUID) -> TagMergeRe
     db.execute(
         delete(PhotoTag).where(PhotoTag.tag_id == source_id)
     )
+    _refresh_tag_ids(db, "p.tag_ids @> ARRAY[CAST(:source AS uuid)]", {"source": str(source_id)})
     db.delete(source)
     db.commit()
 
@@ -163,6 +184,8 @@ def add_tag_to_photos(db: Session, tag_id: uuid.UUID, hothashes: list[str]) -> i
         if not exists:
             db.add(PhotoTag(photo_id=pid, tag_id=tag_id))
             added += 1
+    if added:
+        _refresh_tag_ids(db, "p.id = ANY(CAST(:ids AS uuid[]))", {"ids": [str(p) for p in photo_ids]})
     db.commit()
     return added
 
@@ -177,5 +200,7 @@ def remove_tag_from_photos(db: Session, tag_id: uuid.UUID, hothashes: list[str])
     result = db.execute(
         delete(PhotoTag).where(PhotoTag.tag_id == tag_id, PhotoTag.photo_id.in_(photo_ids))
     )
+    if result.rowcount:
+        _refresh_tag_ids(db, "p.id = ANY(CAST(:ids AS uuid[]))", {"ids": [str(p) for p in photo_ids]})
     db.commit()
     return result.rowcount
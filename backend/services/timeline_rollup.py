@@ -0,0 +1,151 @@
+"""Per-day timeline rollup (timeline_days, timeline_day_events).
+
+The zoomable timeline (ADR-033) reads year/month/day buckets and event
+balloons from the rollup instead of grouping every photo on each call, so
+its cost follows the number of days, not the number of photos.
+
+The rollup is kept in step by the code paths that change what it counts —
+call these before committing:
+
+    photo_added(db, photo)                  registration: O(1) upsert
+    days = days_of(photos)                  before changing taken_at / event_id /
+    ...mutate...                            deleted_at on existing photos
+    refresh(db, days | days_of(photos))     recount just those days
+
+Deleting an event needs nothing: its timeline_day_events rows cascade and
+the per-day totals are unchanged. rebuild() recomputes everything from
+photos and repairs any drift (POST /photos/timeline/rebuild).
+
+Days are UTC calendar days of taken_at. refresh and photo_added take a
+transaction-scoped advisory lock per day (in day order) before touching its
+rows: a recount racing another recount or an upsert of the same day would
+otherwise fail on the primary key, and merging the two would lose a count.
+"""
+
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from models.photo import Photo
+
+_DAY = "(p.taken_at AT TIME ZONE 'UTC')::date"
+
+# Photos within the given days, found by taken_at ranges so the listing index applies
+_PHOTOS_IN_DAYS = f"""
+    FROM unnest(CAST(:days AS date[])) AS d(day)
+    JOIN photos p
+      ON p.taken_at >= d.day::timestamp AT TIME ZONE 'UTC'
+     AND p.taken_at < (d.day + 1)::timestamp AT TIME ZONE 'UTC'
+    WHERE p.deleted_at IS NULL
+"""
+
+_ALL_PHOTOS = """
+    FROM photos p
+    WHERE p.deleted_at IS NULL AND p.taken_at IS NOT NULL
+"""
+
+
+# First key of the per-day advisory locks (the second is the day's ordinal)
+_LOCK_NAMESPACE = 0x7464  # "td"
+
+
+def _lock_days(db: Session, days: Iterable[date]) -> None:
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(:namespace, d) FROM unnest(CAST(:days AS integer[])) AS d"),
+        {"namespace": _LOCK_NAMESPACE, "days": sorted(day.toordinal() for day in days)},
+    )
+
+
+def _insert_days(source: str) -> str:
+    return f"""
+        INSERT INTO timeline_days (day, count, cover_hothash, cover_taken_at)
+        SELECT {_DAY}, count(*),
+               (array_agg(p.hothash ORDER BY p.taken_at DESC, p.hothash))[1],
+               max(p.taken_at)
+        {source}
+        GROUP BY 1
+    """
+
+
+def _insert_day_events(source: str) -> str:
+    return f"""
+        INSERT INTO timeline_day_events (day, event_id, count, first_taken_at, last_taken_at)
+        SELECT {_DAY}, p.event_id, count(*), min(p.taken_at), max(p.taken_at)
+        {source} AND p.event_id IS NOT NULL
+        GROUP BY 1, 2
+    """
+
+
+def day_of(taken_at: datetime) -> date:
+    if taken_at.tzinfo is None:  # naive values are UTC, as stored
+        return taken_at.date()
+    return taken_at.astimezone(timezone.utc).date()
+
+
+def days_of(photos: Iterable[Photo]) -> set[date]:
+    """The rollup days the photos currently count towards (dated photos only)."""
+    return {day_of(p.taken_at) for p in photos if p.taken_at is not None}
+
+
+def refresh(db: Session, days: set[date]) -> None:
+    """Recount the given days from photos. Flushes pending changes first."""
+    if not days:
+        return
+    db.flush()
+    _lock_days(db, days)
+    params = {"days": sorted(days)}
+    db.execute(text("DELETE FROM timeline_days WHERE day = ANY(:days)"), params)
+    db.execute(text("DELETE FROM timeline_day_events WHERE day = ANY(:days)"), params)
+    db.execute(text(_insert_days(_PHOTOS_IN_DAYS)), params)
+    db.execute(text(_insert_day_events(_PHOTOS_IN_DAYS)), params)
+
+
+def photo_added(db: Session, photo: Photo) -> None:
+    """Count a newly registered photo without recounting its day."""
+    if photo.taken_at is None or photo.deleted_at is not None:
+        return
+    params = {
+        "day": day_of(photo.taken_at), "taken_at": photo.taken_at,
+        "hothash": photo.hothash, "event_id": photo.event_id,
+    }
+    _lock_days(db, [params["day"]])
+    db.execute(text("""
+        INSERT INTO timeline_days (day, count, cover_hothash, cover_taken_at)
+        VALUES (:day, 1, :hothash, :taken_at)
+        ON CONFLICT (day) DO UPDATE SET
+            count = timeline_days.count + 1,
+            cover_hothash = CASE WHEN EXCLUDED.cover_taken_at > timeline_days.cover_taken_at
+                                 THEN EXCLUDED.cover_hothash ELSE timeline_days.cover_hothash END,
+            cover_taken_at = GREATEST(timeline_days.cover_taken_at, EXCLUDED.cover_taken_at)
+    """), params)
+    if photo.event_id is not None:
+        db.execute(text("""
+            INSERT INTO timeline_day_events (day, event_id, count, first_taken_at, last_taken_at)
+            VALUES (:day, :event_id, 1, :taken_at, :taken_at)
+            ON CONFLICT (day, event_id) DO UPDATE SET
+                count = timeline_day_events.count + 1,
+                first_taken_at = LEAST(timeline_day_events.first_taken_at, EXCLUDED.first_taken_at),
+                last_taken_at = GREATEST(timeline_day_events.last_taken_at, EXCLUDED.last_taken_at)
+        """), params)
+
+
+def rebuild(db: Session) -> tuple[int, int]:
+    """Recompute the whole rollup from photos. Returns (days, event days)."""
+    db.flush()
+    db.execute(text("DELETE FROM timeline_day_events"))
+    db.execute(text("DELETE FROM timeline_days"))
+    days = db.execute(text(_insert_days(_ALL_PHOTOS))).rowcount
+    event_days = db.execute(text(_insert_day_events(_ALL_PHOTOS))).rowcount
+    return days, event_days
+
+
+def day_range(from_date: datetime | None, to_date: datetime | None) -> tuple[date | None, date | None]:
+    """Timeline query bounds (taken_at >= from_date, < to_date) as inclusive rollup days."""
+    first = day_of(from_date) if from_date else None
+    last = None
+    if to_date:
+        end = to_date.astimezone(timezone.utc) if to_date.tzinfo else to_date
+        last = end.date() - timedelta(days=1) if end.time() == datetime.min.time() else end.date()
+    return first, last
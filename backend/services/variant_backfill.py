@@ -0,0 +1,58 @@
+"""Background backfill of coldpreview variants (POST /photos/build-coldpreview-variants).
+
+A chunked job (services/chunked_job.py) over all photos. Each chunk's missing
+300/600 px variants are rendered from the coldpreviews on disk on the process
+pool. A job resumed after a restart skips the variants of its last chunk that
+are already on disk.
+
+Photos without a coldpreview file are counted as missing_coldpreview, those
+whose coldpreview cannot be decoded as failed.
+"""
+
+import uuid
+from concurrent.futures import Executor
+from functools import partial
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from models.coldpreview_variant_job import ColdpreviewVariantJob
+from models.photo import Photo
+from services import chunked_job
+
+
+def _pending(db: Session):
+    return db.query(Photo.id, Photo.hothash)
+
+
+def _process(db: Session, job: ColdpreviewVariantJob, rows: list, pool: Executor) -> None:
+    from core.config import settings as app_settings
+    from utils.previews import coldpreview_exists, try_write_coldpreview_variants
+
+    coldpreview_dir = app_settings.coldpreview_dir
+    present = [r.hothash for r in rows if coldpreview_exists(r.hothash, coldpreview_dir)]
+    write = partial(try_write_coldpreview_variants, coldpreview_dir=coldpreview_dir)
+    counts = chunked_job.pool_map(pool, write, present)
+    job.missing_coldpreview += len(rows) - len(present)
+    job.failed += sum(1 for n in counts if n is None)
+    job.written += sum(n for n in counts if n)
+    job.photos_updated += sum(1 for n in counts if n)
+
+
+KIND = chunked_job.JobKind(ColdpreviewVariantJob, "Coldpreview variant job", _pending, _process)
+
+
+def start(db: Session) -> ColdpreviewVariantJob:
+    """Start a backfill job, or return the one already pending or running."""
+    return chunked_job.start(db, KIND)
+
+
+def get_or_404(db: Session, job_id: uuid.UUID) -> ColdpreviewVariantJob:
+    return chunked_job.get_or_404(db, KIND, job_id)
+
+
+def resume_interrupted() -> None:
+    chunked_job.resume_interrupted(KIND)
+
+
+def run(job_id: uuid.UUID, session_factory: sessionmaker) -> None:
+    chunked_job.run(KIND, job_id, session_factory)
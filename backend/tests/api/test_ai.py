@@ -0,0 +1,147 @@
+"""Tests for /ai worker endpoints and the hybrid POST /searches/semantic."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from models.photo import Photo
+from models.photographer import Photographer
+
+
+def _make_photos(db, n=6):
+    """n photos, hothash f"{i:064x}", rating i % 3 + 1, taken i days after 2024-01-01."""
+    from models.kind import Kind
+
+    kind_id = db.query(Kind).filter(Kind.is_default == True).first().id
+    photographer = Photographer(name="Test")
+    db.add(photographer)
+    db.flush()
+    photos = [
+        Photo(
+            hothash=f"{i:064x}", hotpreview_b64="AA==", rating=i % 3 + 1,
+            taken_at=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(days=i),
+            photographer_id=photographer.id, kind_id=kind_id,
+        )
+        for i in range(n)
+    ]
+    db.add_all(photos)
+    db.commit()
+    return photos
+
+
+def _index_clip(client, photos):
+    """Play the worker: take the clip jobs and report them done with their payloads."""
+    jobs = client.get("/ai/jobs", params={"capability": "clip", "limit": 200}).json()
+    assert {j["hothash"] for j in jobs} == {p.hothash for p in photos}
+    client.post("/ai/results", json={"results": [
+        {"hothash": j["hothash"], "capability": "clip", "status": "done", "qdrant_id": j["photo_id"],
+         "payload": j["payload"]}
+        for j in jobs
+    ]})
+    return {j["hothash"]: j["payload"] for j in jobs}
+
+
+def test_clip_payload_resyncs_after_photo_changes(client, db):
+    photos = _make_photos(db, 2)
+    payloads = _index_clip(client, photos)
+    assert payloads[photos[0].hothash] == {
+        "taken_at": datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp(),
+        "photographer_id": str(photos[0].photographer_id), "event_id": None, "rating": 1, "deleted": False,
+    }
+    assert client.get("/ai/payloads").json() == []
+
+    client.post("/photos/batch/rating", json={"hothashes": [photos[0].hothash], "rating": 5})
+    client.post(f"/photos/{photos[0].hothash}/delete")
+    updates = client.get("/ai/payloads").json()
+    assert [u["photo_id"] for u in updates] == [str(photos[0].id)]
+    assert updates[0]["payload"]["rating"] == 5
+    assert updates[0]["payload"]["deleted"] is True
+
+    # An ack for an older version leaves the newer change pending
+    client.post("/photos/batch/rating", json={"hothashes": [photos[0].hothash], "rating": 4})
+    client.post("/ai/payloads", json={"synced": [{"photo_id": u["photo_id"], "version": u["version"]} for u in updates]})
+    latest = client.get("/ai/payloads").json()
+    assert [u["payload"]["rating"] for u in latest] == [4]
+    client.post("/ai/payloads", json={"synced": [{"photo_id": u["photo_id"], "version": u["version"]} for u in latest]})
+    assert client.get("/ai/payloads").json() == []
+
+
+def test_clip_result_with_outdated_payload_stays_pending(client, db):
+    photos = _make_photos(db, 1)
+    job = client.get("/ai/jobs", params={"capability": "clip"}).json()[0]
+    client.post("/photos/batch/rating", json={"hothashes": [photos[0].hothash], "rating": 5})
+    client.post("/ai/results", json={"results": [
+        {"hothash": job["hothash"], "capability": "clip", "status": "done", "payload": job["payload"]},
+    ]})
+    assert [u["payload"]["rating"] for u in client.get("/ai/payloads").json()] == [5]
+
+
+@pytest.fixture
+def fake_worker(db, monkeypatch):
+    """Rank every photo by descending hothash; honours ids, ignores the payload filter."""
+    from services import semantic_search
+
+    calls = []
+
+    def search(q, limit, must, ids=None):
+        calls.append({"limit": limit, "must": must, "ids": ids})
+        ranked = [i for (i,) in db.query(Photo.id).order_by(Photo.hothash.desc())]
+        return [i for i in ranked if ids is None or str(i) in ids][:limit]
+
+    monkeypatch.setattr(semantic_search, "_worker_search", search)
+    return calls
+
+
+def _pages(client, body):
+    hothashes, cursor = [], None
+    while True:
+        r = client.post("/searches/semantic", json={**body, "cursor": cursor})
+        assert r.status_code == 200
+        hothashes += [x["hothash"] for x in r.json()]
+        cursor = r.headers.get("x-next-cursor")
+        if cursor is None:
+            return hothashes
+
+
+def test_semantic_search_ranks_within_selective_criteria(client, db, fake_worker):
+    _make_photos(db)
+    h = [f"{i:064x}" for i in range(6)]
+    body = {"q": "fjell", "criteria": [{"field": "rating", "operator": "gte", "value": 2}], "limit": 2}
+    assert _pages(client, body) == [h[5], h[4], h[2], h[1]]
+    assert all(c["ids"] is not None for c in fake_worker)
+
+
+def test_semantic_search_overfetches_with_payload_filter(client, db, fake_worker, monkeypatch):
+    from services import semantic_search
+
+    monkeypatch.setattr(semantic_search, "EXACT_LIMIT", 0)
+    monkeypatch.setattr(semantic_search, "MAX_CANDIDATES", 50)
+    _make_photos(db, 60)
+    body = {"q": "fjell", "criteria": [{"field": "rating", "operator": "eq", "value": 3}], "limit": 5}
+    expected = [f"{i:064x}" for i in range(59, -1, -1) if i % 3 == 2]
+    assert _pages(client, body) == expected[:17]  # the 50 candidates hold 17 matches
+    assert fake_worker[0]["ids"] is None
+    assert {"key": "rating", "match": 3} in fake_worker[0]["must"]
+    assert {"key": "deleted", "match": False} in fake_worker[0]["must"]
+
+
+def test_semantic_payload_filter_translates_criteria():
+    from types import SimpleNamespace
+
+    from schemas.saved_search import SearchCriterion
+    from services.semantic_search import payload_filter
+
+    criteria = [
+        SearchCriterion(field="rating", operator="gte", value=4),
+        SearchCriterion(field="taken_at", operator="after", value="2024-01-01T00:00:00+00:00"),
+        SearchCriterion(field="event_id", operator="is_null", value=None),
+        SearchCriterion(field="camera_model", operator="eq", value="X100"),
+    ]
+    guest = SimpleNamespace(id="g", access_level="guest")
+    assert payload_filter("AND", criteria, None, guest) == [
+        {"key": "deleted", "match": False},
+        {"key": "photographer_id", "match": "g"},
+        {"key": "rating", "gte": 4},
+        {"key": "taken_at", "gte": datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()},
+        {"key": "event_id", "is_null": True},
+    ]
+    assert payload_filter("OR", criteria, None, None) == [{"key": "deleted", "match": False}]
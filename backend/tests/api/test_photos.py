@@ -1,4 +1,5 @@
 """Tests for GET /photos and GET /photos/{hothash}."""
+import uuid
 from datetime import datetime, timezone
 
 import pytest
@@ -200,3 +201,586 @@ def test_check_hothashes_preserves_order(client, db):
     data = r.json()
     assert data["known"] == ["zzz", "aaa"]
     assert data["unknown"] == ["mmm", "nnn"]
+
+
+# ---------------------------------------------------------------------------
+# Coldpreview variants (300/600 px)
+# ---------------------------------------------------------------------------
+
+def _make_large_photo(db, tmp_path, photographer_id):
+    from PIL import Image
+    path = tmp_path / "large.jpg"
+    Image.new("RGB", (1800, 1200), (30, 140, 90)).save(str(path), format="JPEG")
+    return _make_photo(db, photographer_id, str(path))
+
+
+def _open_response_image(r):
+    import io
+    from PIL import Image
+    return Image.open(io.BytesIO(r.content))
+
+
+def _build_variants(photo):
+    from utils.previews import write_coldpreview_variants
+    write_coldpreview_variants(photo.hothash, app_settings.coldpreview_dir)
+
+
+def test_backfill_job_builds_coldpreview_variants(client, db, tmp_path, monkeypatch):
+    from sqlalchemy.orm import sessionmaker
+
+    from services import chunked_job, variant_backfill
+    from utils.previews import coldpreview_variant_path
+
+    submitted = []
+    monkeypatch.setattr(chunked_job, "_submit", lambda kind, job_id: submitted.append(job_id))
+    monkeypatch.setattr(chunked_job, "CHUNK_ROWS", 1)
+    monkeypatch.setattr(chunked_job, "WORKERS", 1)
+    p = _make_photographer(db)
+    photo = _make_large_photo(db, tmp_path, p.id)
+    _make_photo_with_hash(db, p.id, "f" * 64)  # no coldpreview on disk
+    factory = sessionmaker(db.get_bind(), expire_on_commit=False)
+
+    r = client.post("/photos/build-coldpreview-variants")
+    assert r.status_code == 202
+    job = r.json()
+    assert (job["status"], job["total"], job["processed"]) == ("pending", 2, 0)
+    assert client.post("/photos/build-coldpreview-variants").json()["id"] == job["id"]  # one job at a time
+
+    variant_backfill.run(submitted[0], factory)
+    done = client.get(f"/photos/build-coldpreview-variants/{job['id']}").json()
+    assert {k: done[k] for k in ("status", "processed", "written", "photos_updated", "missing_coldpreview", "failed")} == {
+        "status": "completed", "processed": 2, "written": 2, "photos_updated": 1, "missing_coldpreview": 1, "failed": 0,
+    }
+    for px in (300, 600):
+        assert coldpreview_variant_path(photo.hothash, app_settings.coldpreview_dir, px).exists()
+
+    again = client.post("/photos/build-coldpreview-variants").json()
+    variant_backfill.run(submitted[1], factory)
+    assert client.get(f"/photos/build-coldpreview-variants/{again['id']}").json()["written"] == 0
+    assert client.get(f"/photos/build-coldpreview-variants/{uuid.uuid4()}").status_code == 404
+
+
+def test_coldpreview_max_px_serves_smallest_variant(client, db, tmp_path):
+    p = _make_photographer(db)
+    photo = _make_large_photo(db, tmp_path, p.id)
+    _build_variants(photo)
+
+    r = client.get(f"/photos/{photo.hothash}/coldpreview", params={"max_px": 400})
+    assert r.status_code == 200
+    assert _open_response_image(r).size == (600, 400)
+    small_etag = r.headers["etag"]
+
+    r = client.get(f"/photos/{photo.hothash}/coldpreview", params={"max_px": 1000})
+    assert _open_response_image(r).size == (1200, 800)
+    assert r.headers["etag"] != small_etag
+
+
+def test_coldpreview_max_px_accounts_for_crop(client, db, tmp_path):
+    from models.photo import PhotoCorrection
+    p = _make_photographer(db)
+    photo = _make_large_photo(db, tmp_path, p.id)
+    _build_variants(photo)
+    db.add(PhotoCorrection(photo_id=photo.id, crop_left=0.25, crop_right=0.25))
+    db.commit()
+
+    # Half the width is cropped away — the 300 px variant would end up 150 px wide
+    r = client.get(f"/photos/{photo.hothash}/coldpreview", params={"max_px": 300})
+    assert _open_response_image(r).size == (300, 400)
+
+
+def test_download_small_uses_variant_without_resampling(client, db, tmp_path):
+    p = _make_photographer(db)
+    photo = _make_large_photo(db, tmp_path, p.id)
+    _build_variants(photo)
+
+    r = client.get(f"/photos/{photo.hothash}/download", params={"size": "small"})
+    assert r.status_code == 200
+    assert _open_response_image(r).size == (600, 400)
+
+
+# ---------------------------------------------------------------------------
+# Coldpreview render cache and conditional requests
+# ---------------------------------------------------------------------------
+
+def test_coldpreview_if_none_match_returns_304(client, db, sample_image_path):
+    p = _make_photographer(db)
+    photo = _make_photo(db, p.id, sample_image_path)
+
+    r = client.get(f"/photos/{photo.hothash}/coldpreview")
+    etag = r.headers["etag"]
+
+    r = client.get(f"/photos/{photo.hothash}/coldpreview", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+
+    r = client.get(f"/photos/{photo.hothash}/coldpreview", headers={"If-None-Match": '"other"'})
+    assert r.status_code == 200
+
+
+def test_coldpreview_render_is_cached(client, db, sample_image_path, monkeypatch):
+    from services import photo_service
+    p = _make_photographer(db)
+    photo = _make_photo(db, p.id, sample_image_path)
+    client.patch(f"/photos/{photo.hothash}/correction", json={"rotation": 90})
+
+    renders = []
+    original = photo_service._open_and_correct
+    monkeypatch.setattr(
+        photo_service, "_open_and_correct",
+        lambda *a: renders.append(1) or original(*a),
+    )
+    first = client.get(f"/photos/{photo.hothash}/coldpreview")
+    second = client.get(f"/photos/{photo.hothash}/coldpreview")
+    assert first.content == second.content
+    assert len(renders) == 1
+
+
+def test_coldpreview_etag_changes_with_correction_and_photographer(client, db, sample_image_path):
+    p = _make_photographer(db)
+    photo = _make_photo(db, p.id, sample_image_path)
+    etag = client.get(f"/photos/{photo.hothash}/coldpreview").headers["etag"]
+
+    p.name = "Renamed Photographer"
+    db.commit()
+    renamed = client.get(f"/photos/{photo.hothash}/coldpreview").headers["etag"]
+    assert renamed != etag
+
+    client.patch(f"/photos/{photo.hothash}/correction", json={"rotation": 90})
+    corrected = client.get(f"/photos/{photo.hothash}/coldpreview").headers["etag"]
+    assert corrected not in (etag, renamed)
+
+
+def test_uncorrected_coldpreview_is_not_reencoded(client, db, sample_image_path, monkeypatch):
+    import io
+    import piexif
+    from PIL import Image
+    from services import photo_service
+    from utils.previews import coldpreview_variant_path
+
+    p = _make_photographer(db)
+    photo = _make_photo(db, p.id, sample_image_path)
+    monkeypatch.setattr(photo_service, "_open_and_correct", lambda *a: pytest.fail("decoded"))
+
+    r = client.get(f"/photos/{photo.hothash}/coldpreview")
+    assert r.status_code == 200
+
+    stored = coldpreview_variant_path(photo.hothash, app_settings.coldpreview_dir).read_bytes()
+    stripped = io.BytesIO()
+    piexif.remove(r.content, stripped)
+    original = io.BytesIO()
+    piexif.remove(stored, original)
+    # Same entropy-coded image data — only the EXIF segment differs
+    assert stripped.getvalue().endswith(original.getvalue()[original.getvalue().index(b"\xff\xdb"):])
+    assert Image.open(io.BytesIO(r.content)).getexif()[0x013B] == p.name  # Artist
+
+
+def test_list_photos_without_hotpreview(client, db, sample_image_path):
+    p = _make_photographer(db)
+    _make_photo(db, p.id, sample_image_path)
+
+    item = client.get("/photos", params={"include_hotpreview": "false"}).json()[0]
+    assert item["hotpreview_b64"] is None
+    assert client.get("/photos").json()[0]["hotpreview_b64"]
+
+
+def test_hotpreview_pack(client, db, sample_image_path, tmp_path):
+    import base64
+    import struct
+    from PIL import Image
+
+    p = _make_photographer(db)
+    photo = _make_photo(db, p.id, sample_image_path)
+    other_path = tmp_path / "other.jpg"
+    Image.new("RGB", (120, 80), (200, 30, 30)).save(other_path, "JPEG")
+    other = _make_photo(db, p.id, str(other_path))
+
+    unknown = "0" * 64
+    r = client.get(
+        "/photos/hotpreviews",
+        params=[("hothash", other.hothash), ("hothash", unknown), ("hothash", photo.hothash)],
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/vnd.hotprevue.hotpreview-pack"
+    assert r.headers["cache-control"] == "no-store"  # the unknown photo may be registered later
+
+    entries, pos, data = [], 0, r.content
+    while pos < len(data):
+        hothash = data[pos:pos + 64].decode("ascii")
+        (length,) = struct.unpack(">I", data[pos + 64:pos + 68])
+        entries.append((hothash, data[pos + 68:pos + 68 + length]))
+        pos += 68 + length
+
+    assert [h for h, _ in entries] == [other.hothash, photo.hothash]  # request order, unknown skipped
+    assert entries[1][1] == base64.b64decode(photo.hotpreview_b64)
+
+    r = client.get("/photos/hotpreviews", params=[("hothash", photo.hothash), ("hothash", photo.hothash)])
+    assert r.headers["cache-control"] == "private, max-age=31536000, immutable"
+
+
+def test_hotpreview_pack_limit(client):
+    params = [("hothash", f"{i:064x}") for i in range(101)]
+    assert client.get("/photos/hotpreviews", params=params).status_code == 422
+
+
+@pytest.mark.parametrize("sort", [
+    "taken_at_desc", "taken_at_asc", "registered_at_desc", "registered_at_asc", "rating_desc", "rating_asc",
+])
+def test_list_photos_cursor_pages_match_full_listing(client, sort, sorted_photos):
+    full = [x["hothash"] for x in client.get("/photos", params={"sort": sort}).json()]
+    assert len(full) == 7
+
+    paged, cursor = [], None
+    while True:
+        params = {"sort": sort, "limit": 2, "include_hotpreview": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/photos", params=params)
+        paged += [x["hothash"] for x in r.json()]
+        cursor = r.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert paged == full
+
+
+def test_list_photos_cursor_errors(client, sorted_photos):
+    cursor = client.get("/photos", params={"sort": "rating_desc", "limit": 2}).headers["x-next-cursor"]
+    assert client.get("/photos", params={"sort": "taken_at_desc", "cursor": cursor}).status_code == 422
+    assert client.get("/photos", params={"cursor": "garbage"}).status_code == 422
+    assert client.get("/photos", params={"sort": "random", "cursor": cursor}).status_code == 422
+
+
+@pytest.mark.parametrize("sort", ["taken_at_desc", "rating_asc", "registered_at_desc"])
+def test_photo_neighbours(client, sort, sorted_photos):
+    full = [x["hothash"] for x in client.get("/photos", params={"sort": sort}).json()]
+
+    for i, h in enumerate(full):
+        r = client.get(f"/photos/{h}/neighbours", params={"sort": sort, "n": 2})
+        assert r.status_code == 200
+        body = r.json()
+        assert [x["hothash"] for x in body["prev"]] == full[max(0, i - 2):i][::-1]
+        assert [x["hothash"] for x in body["next"]] == full[i + 1:i + 3]
+
+
+def test_random_sort_is_seeded_and_pages_stably(client, db, sorted_photos):
+    for photo in sorted_photos:
+        db.refresh(photo)
+    by_key = sorted(sorted_photos, key=lambda x: (x.shuffle_key, str(x.id)))
+    # Seed in the middle of the key range: the shuffle wraps around once
+    seed = by_key[3].shuffle_key
+    expected = [x.hothash for x in by_key[3:] + by_key[:3]]
+
+    full = [x["hothash"] for x in client.get("/photos", params={"sort": "random", "seed": seed}).json()]
+    assert full == expected
+
+    paged, cursor = [], None
+    while True:
+        params = {"sort": "random", "seed": seed, "limit": 2} if cursor is None else {"sort": "random", "limit": 2, "cursor": cursor}
+        r = client.get("/photos", params=params)
+        paged += [x["hothash"] for x in r.json()]
+        cursor = r.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert paged == expected
+
+    for i, h in enumerate(expected):
+        body = client.get(f"/photos/{h}/neighbours", params={"sort": "random", "seed": seed, "n": 2}).json()
+        assert [x["hothash"] for x in body["prev"]] == expected[max(0, i - 2):i][::-1]
+        assert [x["hothash"] for x in body["next"]] == expected[i + 1:i + 3]
+
+    search = client.post("/searches/execute", json={"sort": "random", "seed": seed}).json()
+    assert [x["hothash"] for x in search] == expected
+
+    unseeded = client.get("/photos", params={"sort": "random"}).json()
+    assert sorted(x["hothash"] for x in unseeded) == sorted(expected)
+    assert client.get(f"/photos/{expected[0]}/neighbours", params={"sort": "random"}).status_code == 422
+
+
+def test_list_item_projection_matches_schema(client, db, sample_image_path, sorted_photos):
+    from schemas.photo import PhotoListItem
+
+    other = sorted_photos[0]
+    photo = _make_photo(db, other.photographer_id, sample_image_path)
+    client.patch(f"/photos/{photo.hothash}/correction", json={
+        "rotation": 90, "flip_horizontal": True, "crop_left": 0.1, "exposure_ev": -0.5,
+    })
+
+    listed = {x["hothash"]: x for x in client.get("/photos").json()}
+    for h in (photo.hothash, other.hothash):
+        db.expire_all()
+        orm = db.query(Photo).filter(Photo.hothash == h).one()
+        assert listed[h] == PhotoListItem.model_validate(orm).model_dump(mode="json")
+    assert listed[photo.hothash]["has_correction"] is True
+    assert listed[other.hothash]["flip_horizontal"] is False
+
+
+def test_list_photos_compression_is_negotiated(client, sorted_photos):
+    gz = client.get("/photos", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/photos", headers={"Accept-Encoding": "identity"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    assert gz.json() == plain.json()
+    assert "Accept-Encoding" in gz.headers["vary"]
+
+
+def test_list_photos_skips_compression_for_hotpreview_heavy_bodies(client, db, sorted_photos):
+    import base64
+    import os
+
+    for photo in sorted_photos:
+        photo.hotpreview_b64 = base64.b64encode(os.urandom(5000)).decode("ascii")
+    db.commit()
+
+    with_previews = client.get("/photos", headers={"Accept-Encoding": "gzip"})
+    metadata_only = client.get("/photos", params={"include_hotpreview": "false"}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in with_previews.headers
+    assert metadata_only.headers["content-encoding"] == "gzip"
+
+
+def test_list_photos_standard_encoder_matches_fast(client, monkeypatch, sorted_photos):
+    fast = client.get("/photos")
+    monkeypatch.setattr(app_settings, "fast_responses", False)
+    standard = client.get("/photos")
+    assert "content-encoding" not in standard.headers
+    assert fast.json() == standard.json()
+    assert fast.json()[0]["taken_at"].endswith("Z")
+
+
+def test_list_photos_msgpack(client, sorted_photos):
+    msgpack = pytest.importorskip("msgpack")
+
+    r = client.get("/photos", headers={"Accept": "application/msgpack"})
+    assert r.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(r.content) == client.get("/photos").json()
+
+
+# ---------------------------------------------------------------------------
+# Timeline rollup
+# ---------------------------------------------------------------------------
+
+def _day_counts(client):
+    return {b["date"]: b["count"] for b in client.get("/photos/timeline", params={"granularity": "day"}).json()}
+
+
+def test_timeline_rollup_rebuild_and_incremental_updates(client, hothashes):
+    # sorted_photos are inserted directly — the rollup is empty until rebuilt
+    assert _day_counts(client) == {}
+
+    r = client.post("/photos/timeline/rebuild")
+    assert r.status_code == 200
+    assert r.json() == {"days": 3, "event_days": 0}
+    assert _day_counts(client) == {"2024-01-01": 2, "2024-01-02": 1, "2024-01-03": 2}
+    assert client.get("/photos/timeline", params={"granularity": "year"}).json() == [
+        {"year": 2024, "month": None, "date": None, "count": 5},
+    ]
+
+    client.post("/photos/batch/taken-at", json={
+        "hothashes": [hothashes[4], hothashes[3]], "taken_at": "2024-01-03T10:00:00Z",
+    })
+    assert _day_counts(client) == {"2024-01-01": 2, "2024-01-03": 4}
+
+    client.post(f"/photos/{hothashes[1]}/delete")
+    assert _day_counts(client) == {"2024-01-01": 1, "2024-01-03": 4}
+    client.post(f"/photos/{hothashes[1]}/restore")
+    assert _day_counts(client) == {"2024-01-01": 2, "2024-01-03": 4}
+
+    event = client.post("/events", json={"name": "Nyttår"}).json()
+    client.post("/photos/batch/event", json={
+        "hothashes": [hothashes[1], hothashes[6], hothashes[0]], "event_id": event["id"],
+    })
+    balloons = client.get("/photos/timeline/events").json()
+    assert [(b["name"], b["count"]) for b in balloons] == [("Nyttår", 3)]
+    assert balloons[0]["from_date"].startswith("2024-01-01")
+    assert balloons[0]["to_date"].startswith("2024-01-03")
+    in_range = client.get("/photos/timeline/events", params={"to_date": "2024-01-02T00:00:00Z"}).json()
+    assert in_range[0]["count"] == 2
+
+    client.patch(f"/photos/{hothashes[0]}", json={"event_id": None})
+    assert client.get("/photos/timeline/events").json()[0]["count"] == 2
+
+    # Incremental state equals a full recount
+    before = _day_counts(client)
+    client.post("/photos/timeline/rebuild")
+    assert _day_counts(client) == before
+
+
+def test_timeline_rollup_recount_waits_for_concurrent_upsert(client, db, sorted_photos):
+    import threading
+    import time
+
+    from sqlalchemy import text
+    from sqlalchemy.orm import sessionmaker
+
+    from services import timeline_rollup
+
+    client.post("/photos/timeline/rebuild")
+    day = datetime(2024, 1, 5, 12, tzinfo=timezone.utc)
+    sessions = sessionmaker(db.get_bind(), expire_on_commit=False)
+
+    with sessions() as registering:
+        added = Photo(hothash="f" * 64, hotpreview_b64="", taken_at=day,
+                      photographer_id=sorted_photos[0].photographer_id, kind_id=sorted_photos[0].kind_id)
+        registering.add(added)
+        registering.flush()
+        timeline_rollup.photo_added(registering, added)  # creates the day row, not yet committed
+
+        errors = []
+
+        def move_to_day():
+            try:
+                with sessions() as moving:
+                    photo = moving.get(Photo, sorted_photos[4].id)
+                    days = timeline_rollup.days_of([photo])
+                    photo.taken_at = day
+                    timeline_rollup.refresh(moving, days | timeline_rollup.days_of([photo]))
+                    moving.commit()
+            except Exception as exc:
+                errors.append(exc)
+
+        mover = threading.Thread(target=move_to_day)
+        mover.start()
+        for _ in range(50):  # until the recount waits on the day
+            if db.execute(text("SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock'")).scalar():
+                break
+            time.sleep(0.1)
+        registering.commit()
+        mover.join()
+
+    assert errors == []
+    assert _day_counts(client)["2024-01-05"] == 2
+
+
+def test_map_clusters(client, db, sorted_photos, hothashes):
+    # Two photos in Oslo, one in Bergen, one in Tromsø; the rest have no location
+    for photo, (lat, lng) in zip(sorted_photos, [(59.91, 10.75), (59.92, 10.76), (60.39, 5.32), (69.65, 18.96)]):
+        photo.location_lat, photo.location_lng = lat, lng
+    db.commit()
+    norway = {"west": 4.0, "south": 57.0, "east": 32.0, "north": 72.0}
+
+    coarse = client.get("/photos/map-clusters", params={"zoom": 0, **norway}).json()
+    assert [(c["count"], c["hothash"]) for c in coarse] == [(4, hothashes[0])]
+
+    fine = client.get("/photos/map-clusters", params={"zoom": 8, **norway}).json()
+    assert [(c["count"], c["hothash"]) for c in fine] == [(2, hothashes[0]), (1, hothashes[2]), (1, hothashes[3])]
+    assert fine[0]["lat"] == pytest.approx(59.915)
+
+    south_only = client.get("/photos/map-clusters", params={"zoom": 8, **norway, "north": 65.0}).json()
+    assert sum(c["count"] for c in south_only) == 3
+    assert client.get("/photos/map-clusters", params={"zoom": 8, **norway, "rating_min": 5}).json()[0]["count"] == 1
+
+    search = {"criteria": [{"field": "location_radius", "operator": "within",
+                            "value": {"lat": 59.91, "lng": 10.75, "radius_km": 5}}]}
+    r = client.post("/searches/map-clusters", json={**search, "zoom": 8, **norway})
+    assert [(c["count"], c["hothash"]) for c in r.json()] == [(2, hothashes[0])]
+    assert len(client.post("/searches/execute", json=search).json()) == 2
+    assert client.get("/photos/map-clusters", params={"zoom": 8, **norway, "south": 80}).status_code == 422
+
+
+@pytest.fixture
+def fresh_similarity_index():
+    """The index lives for the process; start and end each test without one."""
+    from services import similarity_index
+
+    similarity_index.reset()
+    yield
+    similarity_index.reset()
+
+
+def test_similar_photos_by_perceptual_hash(client, db, fresh_similarity_index, sorted_photos, hothashes):
+    for photo, dct in zip(sorted_photos, [0, 0b1, 0b111, -2, -1, None, 0b11]):
+        photo.dct_perceptual_hash = dct
+    db.commit()
+
+    def similar(i, **params):
+        r = client.get(f"/photos/{hothashes[i]}/similar", params=params)
+        assert r.status_code == 200
+        return [(x["hothash"], x["distance"]) for x in r.json()]
+
+    assert similar(0, max_distance=3) == [(hothashes[1], 1), (hothashes[6], 2), (hothashes[2], 3)]
+    assert similar(0, max_distance=3, limit=1) == [(hothashes[1], 1)]
+    assert similar(4, max_distance=1) == [(hothashes[3], 1)]  # signed BIGINT -1 and -2 differ in one bit
+    assert similar(5) == []  # no hash yet
+    assert similar(0, hash="difference") == []
+
+    client.post(f"/photos/{hothashes[1]}/delete")
+    assert similar(0, max_distance=3) == [(hothashes[6], 2), (hothashes[2], 3)]
+
+    pairs = client.post("/photos/similar-pairs", json={"max_distance": 2}).json()
+    assert [(x["a"], x["b"], x["distance"]) for x in pairs] == [
+        (hothashes[2], hothashes[6], 1), (hothashes[3], hothashes[4], 1), (hothashes[0], hothashes[6], 2),
+    ]
+    scoped = client.post("/photos/similar-pairs", json={"max_distance": 2, "hothashes": [hothashes[0]]}).json()
+    assert [(x["a"], x["b"], x["distance"]) for x in scoped] == [(hothashes[0], hothashes[6], 2)]
+
+    assert client.get(f"/photos/{'f' * 64}/similar").status_code == 404
+    assert client.get(f"/photos/{hothashes[0]}/similar", params={"hash": "ahash"}).status_code == 422
+    assert client.get(f"/photos/{hothashes[0]}/similar", params={"max_distance": 17}).status_code == 422
+
+
+def _jpeg(seed: int) -> bytes:
+    import io
+
+    from PIL import Image
+
+    img = Image.new("RGB", (150, 150), color=(seed * 40 % 256, 90, 200 - seed * 20))
+    img.paste((255, 255, 255), (10 * seed, 0, 10 * seed + 40, 150))
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def test_perceptual_hash_backfill_job_resumes_after_interruption(client, db, monkeypatch, sorted_photos):
+    from sqlalchemy.orm import sessionmaker
+
+    from services import chunked_job, hash_backfill
+    from utils.previews import compute_perceptual_hashes
+
+    submitted = []
+    monkeypatch.setattr(chunked_job, "_submit", lambda kind, job_id: submitted.append(job_id))
+    monkeypatch.setattr(chunked_job, "CHUNK_ROWS", 2)
+    monkeypatch.setattr(chunked_job, "WORKERS", 2)
+    for i, photo in enumerate(sorted_photos):
+        if i != 3:  # photo 3 keeps its undecodable hotpreview
+            photo.hotpreview.jpeg = _jpeg(i)
+    sorted_photos[6].dct_perceptual_hash, sorted_photos[6].difference_hash = 1, 2  # already done
+    db.commit()
+
+    r = client.post("/photos/compute-perceptual-hashes")
+    assert r.status_code == 202
+    job = r.json()
+    assert (job["status"], job["total"], job["processed"]) == ("pending", 6, 0)
+    assert submitted == [uuid.UUID(job["id"])]
+    assert client.post("/photos/compute-perceptual-hashes").json()["id"] == job["id"]  # one job at a time
+
+    class Restart(BaseException):
+        pass
+
+    chunk, calls = chunked_job._chunk, []
+
+    def dies_on_second_chunk(db, kind, after):
+        calls.append(after)
+        if len(calls) == 2:
+            raise Restart
+        return chunk(db, kind, after)
+
+    factory = sessionmaker(db.get_bind(), expire_on_commit=False)
+    monkeypatch.setattr(chunked_job, "_chunk", dies_on_second_chunk)
+    with pytest.raises(Restart):
+        hash_backfill.run(submitted[0], factory)
+    interrupted = client.get(f"/photos/compute-perceptual-hashes/{job['id']}").json()
+    assert (interrupted["status"], interrupted["processed"]) == ("running", 2)
+    assert interrupted["updated"] + interrupted["failed"] == 2
+
+    monkeypatch.setattr(chunked_job, "_chunk", chunk)
+    hash_backfill.run(submitted[0], factory)
+    done = client.get(f"/photos/compute-perceptual-hashes/{job['id']}").json()
+    assert (done["status"], done["total"], done["processed"], done["updated"], done["failed"]) == (
+        "completed", 6, 6, 5, 1,
+    )
+    db.expire_all()
+    first = sorted_photos[0]
+    assert (first.dct_perceptual_hash, first.difference_hash) == compute_perceptual_hashes(_jpeg(0))
+    assert sorted_photos[3].dct_perceptual_hash is None
+    assert (sorted_photos[6].dct_perceptual_hash, sorted_photos[6].difference_hash) == (1, 2)
+
+    assert client.get(f"/photos/compute-perceptual-hashes/{uuid.uuid4()}").status_code == 404
@@ -0,0 +1,257 @@
+"""Query-plan regression tests for the photo listing paths.
+
+Seeds a 200k-photo library once per module and runs EXPLAIN on the
+GET /photos query (list item projection + filters + sort + LIMIT) for every
+sort × filter combination, plus the free-text criterion. A sequential scan
+on photos, photo_hotpreviews or image_files means an index from the
+listing-index (f7a8b9c0d049), trigram (d1e2f3a4b053) or tag_ids (a4b5c6d7e056) migration no longer
+matches the query — the test names the combination and prints the plan.
+"""
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from services import photo_cursor, photo_service
+
+LIBRARY_SIZE = 200_000
+PAGE = 100
+
+SORTS = ["taken_at_desc", "taken_at_asc", "registered_at_desc", "registered_at_asc", "rating_desc", "rating_asc"]
+
+# Tables that must be reached through an index on a listing page. photo_corrections
+# is sparse (only edited photos); hashing it for a few hundred filtered rows is fine.
+_INDEXED_TABLES = {"photos", "photo_hotpreviews", "image_files"}
+
+
+@pytest.fixture
+def clean_db():
+    """The module shares one seeded library — no per-test truncation."""
+
+
+@pytest.fixture(scope="module")
+def library(database_url):
+    """Seed LIBRARY_SIZE photos with realistic filter selectivity; yields the ids used by FILTERS."""
+    from models.category import Category
+    from models.event import Event
+    from models.input_session import InputSession
+    from models.kind import Kind
+    from models.photographer import Photographer
+    from tests.conftest import _DATA_TABLES
+
+    engine = create_engine(database_url)
+    ids = SimpleNamespace(
+        owner=uuid.uuid4(), guests=[uuid.uuid4() for _ in range(4)],
+        events=[uuid.uuid4() for _ in range(2000)], sessions=[uuid.uuid4() for _ in range(LIBRARY_SIZE // 500)],
+        categories=[uuid.uuid4() for _ in range(4)], rare_kind=uuid.uuid4(),
+        tags=[uuid.uuid4() for _ in range(500)],
+    )
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {', '.join(_DATA_TABLES)} RESTART IDENTITY CASCADE"))
+        default_kind = conn.execute(text("SELECT id FROM kinds WHERE is_default")).scalar()
+        conn.execute(insert(Kind), [{"id": ids.rare_kind, "name": "Plan test"}])
+        conn.execute(insert(Photographer), [{"id": ids.owner, "name": "Owner"}] + [
+            {"id": g, "name": f"Guest {n}", "access_level": "guest"} for n, g in enumerate(ids.guests)
+        ])
+        conn.execute(insert(Event), [{"id": e, "name": "Event", "kind_id": default_kind} for e in ids.events])
+        conn.execute(insert(InputSession), [
+            {"id": s, "name": "Session", "source_path": "/import", "default_photographer_id": ids.owner}
+            for s in ids.sessions
+        ])
+        conn.execute(insert(Category), [
+            {"id": c, "name": f"Category {n}", "excluded_from_stream": n == 0} for n, c in enumerate(ids.categories)
+        ])
+        # 5 % guests, every other photo in a 50-photo event, 500 per session,
+        # 1 % rare kind, 10 % categorized, 30 % rated, 2 % undated, 0.5 % deleted,
+        # 40 % geotagged, spread over southern Norway, 30 % with one to three of 500 tags
+        conn.execute(text("""
+            INSERT INTO photos (
+                id, hothash, kind_id, photographer_id, event_id, input_session_id, category_id,
+                taken_at, rating, deleted_at, registered_at, location_lat, location_lng,
+                taken_at_source, taken_at_accuracy, is_stack_cover, is_shared, share_downloads, share_views,
+                tag_ids
+            )
+            SELECT
+                gen_random_uuid(),
+                md5(i::text) || md5((-i)::text),
+                CASE WHEN i % 100 = 0 THEN CAST(:rare_kind AS uuid) ELSE CAST(:default_kind AS uuid) END,
+                CASE WHEN i % 20 = 0 THEN (CAST(:guests AS uuid[]))[1 + (i / 20) % 4]
+                     ELSE CAST(:owner AS uuid) END,
+                CASE WHEN i % 2 = 0 THEN (CAST(:events AS uuid[]))[1 + (i / 100) % 2000] END,
+                (CAST(:sessions AS uuid[]))[1 + i / 500],
+                CASE WHEN i % 10 = 0 THEN (CAST(:categories AS uuid[]))[1 + (i / 10) % 4] END,
+                CASE WHEN i % 50 <> 0 THEN TIMESTAMPTZ '2010-01-01' + i * INTERVAL '17 minutes' END,
+                CASE WHEN i % 10 < 3 THEN 1 + i % 5 END,
+                CASE WHEN i % 200 = 0 THEN now() END,
+                TIMESTAMPTZ '2024-01-01' + i * INTERVAL '1 second',
+                CASE WHEN i % 5 < 2 THEN 58 + (i::bigint * 7919 % 5000) / 1000.0 END,
+                CASE WHEN i % 5 < 2 THEN 5 + (i::bigint * 104729 % 7000) / 1000.0 END,
+                0, 'second', false, false, true, 0,
+                CASE WHEN i % 10 < 3 THEN (CAST(:tags AS uuid[]))[1 + i % 500 : 1 + i % 500 + i % 3]
+                     ELSE '{}' END
+            FROM generate_series(0, :n - 1) AS i
+        """), {
+            "n": LIBRARY_SIZE, "rare_kind": ids.rare_kind, "default_kind": default_kind, "owner": ids.owner,
+            "guests": [str(g) for g in ids.guests], "events": [str(e) for e in ids.events],
+            "sessions": [str(s) for s in ids.sessions], "categories": [str(c) for c in ids.categories],
+            "tags": [str(t) for t in ids.tags],
+        })
+        conn.execute(text("INSERT INTO photo_hotpreviews (photo_id, jpeg) SELECT id, '\\xffd8ffd9' FROM photos"))
+        conn.execute(text(
+            "INSERT INTO image_files (id, photo_id, file_path, file_type, is_master, exif_data) "
+            "SELECT gen_random_uuid(), id, '/bilder/' || left(hothash, 2) || '/IMG_' || hothash || '.jpg', "
+            "'JPEG', true, '{}' FROM photos"
+        ))
+        conn.execute(text(
+            "INSERT INTO photo_corrections (photo_id, rotation, updated_at) "
+            "SELECT id, 90, now() FROM photos WHERE get_byte(decode(hothash, 'hex'), 0) < 26"
+        ))
+        ids.hothashes = conn.execute(text("SELECT hothash FROM photos LIMIT 50")).scalars().all()
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(
+            text("VACUUM ANALYZE photos, photo_hotpreviews, photo_corrections, image_files, events")
+        )
+
+    yield ids
+
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {', '.join(_DATA_TABLES)} RESTART IDENTITY CASCADE"))
+        conn.execute(text("DELETE FROM kinds WHERE id = :id"), {"id": ids.rare_kind})
+    engine.dispose()
+
+
+FILTERS = {
+    "none": lambda ids: {},
+    "guest": lambda ids: {"requesting_photographer": SimpleNamespace(id=ids.guests[1], access_level="guest")},
+    "event": lambda ids: {"event_id": ids.events[7]},
+    "session": lambda ids: {"session_id": ids.sessions[42]},
+    "kind": lambda ids: {"kind_ids": [ids.rare_kind]},
+    "category": lambda ids: {"category_id": ids.categories[2]},
+    "in_stream": lambda ids: {"in_stream": True},
+    "rating": lambda ids: {"rating_min": 4},
+    "taken_range": lambda ids: {
+        "taken_after": datetime(2012, 3, 1, tzinfo=timezone.utc),
+        "taken_before": datetime(2012, 4, 1, tzinfo=timezone.utc),
+    },
+    "deleted": lambda ids: {"deleted": True},
+    "stacks_collapsed": lambda ids: {"stacks_collapsed": True},
+    "hothashes": lambda ids: {"hothashes": ids.hothashes},
+}
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in _INDEXED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found += _seq_scans(child)
+    return found
+
+
+def _explain(db: Session, q) -> dict:
+    compiled = q.statement.compile(dialect=db.bind.dialect, compile_kwargs={"render_postcompile": True})
+    return db.connection().exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params,
+    ).scalar()[0]["Plan"]
+
+
+def _assert_indexed(db: Session, q, label: str) -> None:
+    import json
+
+    plan = _explain(db, q)
+    scans = _seq_scans(plan)
+    assert not scans, f"{label}: sequential scan on {', '.join(scans)}\n{json.dumps(plan, indent=1)}"
+
+
+@pytest.mark.parametrize("filter_name", FILTERS)
+@pytest.mark.parametrize("sort", SORTS)
+def test_listing_page_uses_indexes(library, db, sort, filter_name):
+    q = photo_service._list_query(db, photo_service.list_item_query(db), **FILTERS[filter_name](library))
+    q = photo_cursor.order_by(q, sort).limit(PAGE)
+    _assert_indexed(db, q, f"sort={sort} filter={filter_name}")
+
+
+@pytest.mark.parametrize("sort", SORTS)
+def test_cursor_page_uses_indexes(library, db, sort):
+    from models.photo import Photo
+
+    middle = db.query(Photo).filter(Photo.deleted_at.is_(None)).order_by(Photo.hothash).first()
+    q = photo_service._list_query(db, photo_service.list_item_query(db))
+    q = photo_cursor.after(photo_cursor.order_by(q, sort), sort, photo_cursor.key_of(middle, sort)).limit(PAGE)
+    _assert_indexed(db, q, f"sort={sort} cursor")
+
+
+@pytest.mark.parametrize("filter_name", FILTERS)
+def test_shuffle_page_uses_indexes(library, db, filter_name):
+    q = photo_service._list_query(db, photo_service.list_item_query(db), **FILTERS[filter_name](library))
+    for n, segment in enumerate(photo_cursor._shuffle_segments(q, seed=1_000_000_007)):
+        _assert_indexed(db, segment.limit(PAGE), f"sort=random filter={filter_name} segment={n}")
+
+
+def test_input_session_listing_uses_indexes(library, db):
+    from models.photo import Photo
+
+    q = photo_service.list_item_query(db).filter(Photo.input_session_id == library.sessions[3])
+    _assert_indexed(db, photo_cursor.order_by(q, "registered_at_asc").limit(PAGE), "input session")
+
+
+def test_text_search_uses_trigram_indexes(library, db):
+    from schemas.saved_search import SearchCriterion
+    from services import search_service
+
+    criteria = [SearchCriterion(field="text", operator="contains", value="IMG_abc12")]
+    q = search_service._execute_query(db, "AND", criteria, None, None, photo_service.list_item_query(db))
+    _assert_indexed(db, photo_cursor.order_by(q, "taken_at_desc").limit(PAGE), "text search")
+
+
+def test_map_clusters_use_spatial_index(library, db):
+    from sqlalchemy import func
+
+    q = photo_service._list_query(db).with_entities(func.count()).filter(
+        photo_service.location_in_box(10.6, 59.8, 10.9, 60.0),  # Oslo
+    )
+    _assert_indexed(db, q, "map box")
+
+
+def test_location_radius_uses_spatial_index(library, db):
+    from schemas.saved_search import SearchCriterion
+    from services import search_service
+
+    criteria = [SearchCriterion(field="location_radius", operator="within",
+                                value={"lat": 59.91, "lng": 10.75, "radius_km": 3})]
+    q = search_service._execute_query(db, "AND", criteria, None, None, photo_service.list_item_query(db))
+    _assert_indexed(db, photo_cursor.order_by(q, "taken_at_desc").limit(PAGE), "location radius")
+
+
+@pytest.mark.parametrize("logic", ["AND", "OR"])
+def test_tag_criteria_use_gin_index(library, db, logic):
+    from schemas.saved_search import SearchCriterion
+    from services import search_service
+
+    tags = [str(t) for t in library.tags]
+    criteria = [
+        SearchCriterion(field="tags", operator="any_of", value=tags[10:12]),
+        SearchCriterion(field="tags", operator="all_of", value=tags[20:22]),
+    ]
+    q = search_service._execute_query(db, logic, criteria, None, None, photo_service.list_item_query(db))
+    _assert_indexed(db, photo_cursor.order_by(q, "taken_at_desc").limit(PAGE), f"tags {logic}")
+
+
+def test_export_file_lookups_use_index(library, db):
+    from schemas.saved_search import SearchCriterion
+    from services import search_export
+
+    criteria = [SearchCriterion(field="event_id", operator="eq", value=str(library.events[7]))]
+    q = search_export.export_query(db, "AND", criteria, "taken_at_desc", None, None)
+    _assert_indexed(db, q, "export")
+
+
+def test_hash_backfill_chunk_uses_index(library, db):
+    from models.photo import Photo
+    from services import chunked_job, hash_backfill
+
+    middle = db.query(Photo.id).order_by(Photo.id).offset(LIBRARY_SIZE // 2).first()[0]
+    _assert_indexed(db, chunked_job.chunk_query(hash_backfill._pending(db), middle), "hash backfill")
@@ -40,7 +40,7 @@ def _create_session(client, photographer_id, source_path="/photos", event_id=Non
     return r.json()["id"]
 
 
-def _upload_group(client, session_id, image_path, master_path=None, companions=None):
+def _upload_group(client, session_id, image_path, master_path=None, companions=None, **extra):
     """Upload a single file group as a GroupPayload JSON."""
     if master_path is None:
         master_path = image_path
@@ -65,6 +65,7 @@ def _upload_group(client, session_id, image_path, master_path=None, companions=N
         "height": height,
         "taken_at": taken_at_dt.isoformat() if taken_at_dt else None,
         "companions": companions or [],
+        **extra,
     }
     return client.post(f"/input-sessions/{session_id}/groups", json=payload)
 
@@ -116,6 +117,30 @@ def test_register_group_basic(client, sample_image_path):
     assert photos[0]["photographer_id"] == photographer_id
 
 
+def test_register_group_stores_coldpreview_source(client, sample_image_path):
+    photographer_id = _create_photographer(client)
+    session_id = _create_session(client, photographer_id)
+
+    r = _upload_group(client, session_id, sample_image_path, coldpreview_source="embedded")
+    assert r.status_code == 201
+
+    detail = client.get(f"/photos/{r.json()['hothash']}").json()
+    assert detail["coldpreview_source"] == "embedded"
+
+
+def test_register_group_keeps_undecodable_coldpreview(client, sample_image_path):
+    photographer_id = _create_photographer(client)
+    session_id = _create_session(client, photographer_id)
+
+    not_a_jpeg = base64.b64encode(b"not a jpeg").decode("ascii")
+    r = _upload_group(client, session_id, sample_image_path, coldpreview_b64=not_a_jpeg)
+    assert r.status_code == 201
+    assert r.json()["status"] == "registered"
+    session = client.get(f"/input-sessions/{session_id}").json()
+    assert session["error_count"] == 0
+    assert len(client.get("/photos").json()) == 1
+
+
 def test_register_group_already_registered(client, sample_image_path):
     photographer_id = _create_photographer(client)
     session_id = _create_session(client, photographer_id)
@@ -178,6 +203,20 @@ def test_register_group_with_event(client, sample_image_path):
     assert photos[0]["event_id"] == event["id"]
 
 
+def test_register_group_counts_in_timeline(client, sample_image_path):
+    photographer_id = _create_photographer(client)
+    event = client.post("/events", json={"name": "Summer Trip"}).json()
+    session_id = _create_session(client, photographer_id, event_id=event["id"])
+
+    _upload_group(client, session_id, sample_image_path, master_path="/photos/img.jpg",
+                  taken_at="2023-07-14T23:30:00+00:00")
+
+    days = client.get("/photos/timeline", params={"granularity": "day"}).json()
+    assert [(d["date"], d["count"]) for d in days] == [("2023-07-14", 1)]
+    balloons = client.get("/photos/timeline/events").json()
+    assert [(b["id"], b["count"]) for b in balloons] == [(event["id"], 1)]
+
+
 def test_register_group_status_becomes_uploading(client, sample_image_path):
     photographer_id = _create_photographer(client)
     session_id = _create_session(client, photographer_id)
@@ -260,3 +299,21 @@ def test_coldpreview_endpoint(client, sample_image_path):
     assert r.status_code == 200
     assert r.headers["content-type"] == "image/jpeg"
     assert len(r.content) > 0
+
+
+def test_registered_photo_joins_loaded_similarity_index(client, sample_image_path, tmp_path):
+    from PIL import Image
+
+    from services import similarity_index
+
+    similarity_index.reset()
+    photographer_id = _create_photographer(client)
+    session_id = _create_session(client, photographer_id)
+    first = _upload_group(client, session_id, sample_image_path, dct_perceptual_hash=0b1010).json()["hothash"]
+    assert client.get(f"/photos/{first}/similar").json() == []  # loads the index
+
+    other_path = tmp_path / "other.jpg"
+    Image.new("RGB", (200, 200), color=(1, 2, 3)).save(str(other_path), format="JPEG")
+    second = _upload_group(client, session_id, str(other_path), dct_perceptual_hash=0b1011).json()["hothash"]
+    assert client.get(f"/photos/{first}/similar").json() == [{"hothash": second, "distance": 1}]
+    similarity_index.reset()
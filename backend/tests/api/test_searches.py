@@ -0,0 +1,281 @@
+"""Tests for /searches — execute, facets, timeline, export and the cached results."""
+import uuid
+
+from models.photo import ImageFile
+
+
+def test_search_cursor_and_neighbours(client, sorted_photos):
+    req = {"logic": "AND", "criteria": [], "sort": "taken_at_asc"}
+    full = [x["hothash"] for x in client.post("/searches/execute", json=req).json()]
+
+    r = client.post("/searches/execute", json={**req, "limit": 4})
+    rest = client.post("/searches/execute", json={**req, "limit": 4, "cursor": r.headers["x-next-cursor"]})
+    assert [x["hothash"] for x in r.json() + rest.json()] == full
+    assert "x-next-cursor" not in rest.headers
+
+    body = client.post("/searches/neighbours", json={**req, "hothash": full[3], "n": 1}).json()
+    assert [x["hothash"] for x in body["prev"]] == [full[2]]
+    assert [x["hothash"] for x in body["next"]] == [full[4]]
+
+
+def test_search_timeline_tree(client, hothashes):
+    r = client.post("/searches/timeline", json={"logic": "AND", "criteria": []})
+    assert r.status_code == 200
+    assert r.json() == [{
+        "year": 2024, "count": 5, "cover_hothash": hothashes[2], "cover_hotpreview_b64": "AA==",
+        "months": [{
+            "month": 1, "count": 5, "cover_hothash": hothashes[2], "cover_hotpreview_b64": "AA==",
+            "days": [
+                {"day": 3, "count": 2, "cover_hothash": hothashes[2], "cover_hotpreview_b64": "AA=="},
+                {"day": 2, "count": 1, "cover_hothash": hothashes[4], "cover_hotpreview_b64": "AA=="},
+                {"day": 1, "count": 2, "cover_hothash": hothashes[6], "cover_hotpreview_b64": "AA=="},
+            ],
+        }],
+    }]
+
+
+def test_search_facets_and_total(client, sorted_photos, hothashes):
+    tag = client.post("/tags", json={"name": "Natur"}).json()
+    client.post(f"/tags/{tag['id']}/add-to-photos", json={"hothashes": [hothashes[0], hothashes[1], hothashes[3]]})
+    search = {"logic": "AND", "criteria": [{"field": "rating", "operator": "gte", "value": 3}]}
+
+    r = client.post("/searches/facets", json=search)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total"] == 4  # photos 0, 2, 3, 6
+    f = data["facets"]
+    assert f["rating"] == [{"value": 3, "label": None, "count": 2}, {"value": 5, "label": None, "count": 2}]
+    assert f["year"] == [{"value": 2024, "label": None, "count": 3}, {"value": None, "label": None, "count": 1}]
+    photographer_id = str(sorted_photos[0].photographer_id)
+    assert f["photographer"] == [{"value": photographer_id, "label": "Test Photographer", "count": 4}]
+    assert f["event"] == [{"value": None, "label": None, "count": 4}]
+    assert f["tags"] == [{"value": tag["id"], "label": tag["name"], "count": 2}]
+
+    r = client.post("/searches/execute", json={**search, "limit": 1, "total": "exact"})
+    assert r.headers["X-Total-Count"] == "4"
+    assert int(client.post("/searches/execute", json={**search, "total": "estimate"}).headers["X-Total-Count"]) >= 0
+    assert client.post("/searches/execute", json={**search, "total": "guess"}).status_code == 422
+
+    # Any change to the library invalidates cached counts
+    client.post("/photos/batch/rating", json={"hothashes": [hothashes[1]], "rating": 4})
+    assert client.post("/searches/facets", json=search).json()["total"] == 5
+    r = client.post("/searches/execute", json={**search, "limit": 1, "total": "exact"})
+    assert r.headers["X-Total-Count"] == "5"
+
+
+def test_search_tag_criteria(client, hothashes):
+    natur = client.post("/tags", json={"name": "Natur"}).json()["id"]
+    fjell = client.post("/tags", json={"name": "Fjell"}).json()["id"]
+    client.post(f"/tags/{natur}/add-to-photos", json={"hothashes": [hothashes[0], hothashes[1], hothashes[2]]})
+    client.post(f"/tags/{fjell}/add-to-photos", json={"hothashes": [hothashes[1], hothashes[2], hothashes[3]]})
+
+    def found(*criteria, logic="AND"):
+        r = client.post("/searches/execute", json={"logic": logic, "criteria": [
+            {"field": "tags", "operator": op, "value": value} for op, value in criteria
+        ]})
+        return {x["hothash"] for x in r.json()}
+
+    assert found(("any_of", [natur, fjell])) == set(hothashes[:4])
+    assert found(("all_of", [natur, fjell])) == {hothashes[1], hothashes[2]}
+    assert found(("none_of", [natur, fjell])) == set(hothashes[4:])
+    assert found(("all_of", [natur]), ("none_of", [fjell])) == {hothashes[0]}
+    assert found(("all_of", [natur, fjell]), ("none_of", [natur]), logic="OR") == set(hothashes[1:])
+
+
+def test_search_export_streams_ndjson_and_csv(client, db, monkeypatch, sorted_photos, hothashes):
+    import csv
+    import io
+    import json
+
+    from services import search_export
+
+    monkeypatch.setattr(search_export, "CHUNK_ROWS", 2)
+    db.add_all([
+        ImageFile(photo_id=sorted_photos[0].id, file_path="/bilder/a.jpg", file_type="JPEG", is_master=True,
+                  exif_data={"Model": "X100"}),
+        ImageFile(photo_id=sorted_photos[0].id, file_path="/bilder/a.xmp", file_type="XMP", is_master=False),
+    ])
+    db.commit()
+    tag = client.post("/tags", json={"name": "Natur"}).json()
+    client.post(f"/tags/{tag['id']}/add-to-photos", json={"hothashes": [hothashes[0], hothashes[3]]})
+    search = {"logic": "AND", "criteria": [{"field": "rating", "operator": "gte", "value": 3}], "sort": "taken_at_asc"}
+    expected = [x["hothash"] for x in client.post("/searches/execute", json=search).json()]
+
+    r = client.post("/searches/export", json=search)
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["hothash"] for row in rows] == expected
+    first = next(row for row in rows if row["hothash"] == hothashes[0])
+    assert first["photographer"] == "Test Photographer"
+    assert first["tags"] == ["Natur"]
+    assert first["file_paths"] == ["/bilder/a.jpg", "/bilder/a.xmp"]
+    assert first["exif"] == {"Model": "X100"}
+    assert first["taken_at"] == "2024-01-03T00:00:00Z"
+
+    saved = client.post("/searches", json={"name": "Gode", **search}).json()
+    r = client.get(f"/searches/{saved['id']}/export", params={"format": "csv", "sort": "taken_at_asc"})
+    assert r.headers["content-disposition"] == 'attachment; filename="Gode.csv"'
+    table = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["hothash"] for row in table] == expected
+    row = next(row for row in table if row["hothash"] == hothashes[0])
+    assert row["file_paths"] == "/bilder/a.jpg|/bilder/a.xmp"
+    assert json.loads(row["exif"]) == {"Model": "X100"}
+    assert client.post("/searches/export", json={**search, "format": "xml"}).status_code == 422
+
+    saved = client.post("/searches", json={"name": "Łódź tur", **search}).json()
+    r = client.get(f"/searches/{saved['id']}/export")
+    assert r.status_code == 200
+    assert r.headers["content-disposition"] == (
+        "attachment; filename=\"__d_ tur.ndjson\"; filename*=UTF-8''%C5%81%C3%B3d%C5%BA%20tur.ndjson"
+    )
+
+
+def test_saved_search_pages_from_cached_order(client, monkeypatch, hothashes):
+    from services import search_service
+
+    search = {"logic": "AND", "criteria": [{"field": "rating", "operator": "gte", "value": 3}]}
+    saved = client.post("/searches", json={"name": "Gode", **search}).json()
+    req = {"search_id": saved["id"], "sort": "taken_at_asc"}
+    expected = [x["hothash"] for x in client.post("/searches/execute", json={**search, "sort": "taken_at_asc"}).json()]
+
+    runs = []
+    ordered_ids = search_service._ordered_ids
+    monkeypatch.setattr(search_service, "_ordered_ids", lambda *a: runs.append(1) or ordered_ids(*a))
+
+    r = client.post("/searches/execute", json={**req, "limit": 3, "total": "exact"})
+    assert r.headers["X-Total-Count"] == "4"
+    rest = client.post("/searches/execute", json={**req, "limit": 3, "cursor": r.headers["x-next-cursor"]})
+    assert "x-next-cursor" not in rest.headers
+    assert [x["hothash"] for x in r.json() + rest.json()] == expected
+    offset = client.post("/searches/execute", json={**req, "limit": 2, "offset": 2}).json()
+    assert [x["hothash"] for x in offset] == expected[2:4]
+    assert len(runs) == 1  # one search, three pages
+
+    # Writes bump the library generation and the next open re-runs the search
+    client.post("/photos/batch/rating", json={"hothashes": [hothashes[1]], "rating": 4})
+    assert len(client.post("/searches/execute", json=req).json()) == 5
+    assert len(runs) == 2
+
+    r = client.post("/searches/timeline", json={"search_id": saved["id"]})
+    assert r.json()[0]["count"] == 4  # photo 3 is undated
+    cached = client.post("/searches/timeline", json={"search_id": saved["id"]}).json()
+    assert cached == r.json()
+    assert cached[0]["months"][0]["days"][0]["cover_hotpreview_b64"]
+    # Hotpreviews are added per request; the cached tree only names the covers
+    assert "cover_hotpreview_b64" not in repr(list(search_service._result_cache._entries.values()))
+    assert client.post("/searches/execute", json={"search_id": str(uuid.uuid4())}).status_code == 404
+
+
+def test_library_generation_moves_once_per_commit_without_blocking_writers(db, database_url, sorted_photos):
+    from sqlalchemy import create_engine, text
+
+    from models.library_generation import current_generation, fold_log
+
+    before, _ = current_generation(db)
+
+    engine = create_engine(database_url)
+    with engine.connect() as a, engine.connect() as b:
+        a.execute(text("UPDATE photos SET rating = 1 WHERE id = :id"), {"id": sorted_photos[0].id})
+        a.execute(text("UPDATE photos SET rating = 1 WHERE id = :id"), {"id": sorted_photos[2].id})
+        # A counter row would be locked by a until its commit
+        b.execute(text("SET lock_timeout = '2s'"))
+        b.execute(text("UPDATE photos SET rating = 2 WHERE id = :id"), {"id": sorted_photos[1].id})
+        assert current_generation(db)[0] == before  # nothing committed yet
+        b.commit()  # commits in the opposite order of its first write
+        assert current_generation(db)[0] == before + 1
+        a.commit()
+        assert current_generation(db)[0] == before + 2  # once per transaction
+        b.execute(text("TRUNCATE photo_corrections"))
+        assert current_generation(db)[0] == before + 2
+        b.commit()
+    engine.dispose()
+    assert current_generation(db)[0] == before + 3
+    fold_log(db)
+    assert current_generation(db) == (before + 3, 0)  # folding leaves the generation as it was
+
+
+def test_search_cache_reads_generation_and_results_in_one_snapshot(db, database_url, monkeypatch, sorted_photos):
+    """A writer committing between the generation read and the cached query must not
+    leave its rows out of a result stored under the new generation."""
+    from sqlalchemy import create_engine, text
+
+    from models import library_generation
+    from schemas.saved_search import SearchCriterion
+    from services import search_service
+
+    criteria = [SearchCriterion(field="rating", operator="gte", value=1)]
+
+    engine = create_engine(database_url)
+    with engine.connect() as writer:
+        writer.execute(text("UPDATE photos SET rating = 5 WHERE id = :id"), {"id": sorted_photos[1].id})  # unrated
+        read = library_generation.current_generation
+
+        def read_then_commit(snapshot):
+            generation = read(snapshot)
+            writer.commit()  # lands after the generation was read, before the count
+            return generation
+
+        monkeypatch.setattr(library_generation, "current_generation", read_then_commit)
+        assert search_service.total(db, "AND", criteria) == 5  # the snapshot predates the commit
+        monkeypatch.setattr(library_generation, "current_generation", read)
+    engine.dispose()
+    assert search_service.total(db, "AND", criteria) == 6
+
+
+def test_search_free_text_matches_and_ranks(client, db, sorted_photos, hothashes):
+    from models.event import Event
+
+    trip = Event(name="Hyttetur Jotunheimen", kind_id=sorted_photos[0].kind_id)
+    db.add(trip)
+    db.flush()
+    sorted_photos[0].camera_model = "Canon EOS R5"
+    sorted_photos[1].event_id = trip.id
+    sorted_photos[2].share_caption = "Solnedgang over Jotunheimen"
+    sorted_photos[5].lens_model = "Jotunheim 50mm"
+    db.add(ImageFile(photo_id=sorted_photos[3].id, file_path="/bilder/2024/jotunheimen/img_0001.jpg",
+                     file_type="JPEG", is_master=True))
+    db.add(ImageFile(photo_id=sorted_photos[4].id, file_path="/bilder/2024/100%_ferdig/img_0002.jpg",
+                     file_type="JPEG", is_master=True))
+    db.commit()
+
+    def search(value, **extra):
+        req = {"criteria": [{"field": "text", "operator": "contains", "value": value}], **extra}
+        return [x["hothash"] for x in client.post("/searches/execute", json=req).json()]
+
+    assert set(search("jotunheim")) == {hothashes[1], hothashes[2], hothashes[3], hothashes[5]}
+    assert search("eos r5") == [hothashes[0]]
+    assert search("100%_") == [hothashes[4]]
+    assert search("0%x") == []  # % and _ are literal, not wildcards
+
+    ranked = search("jotunheim", sort="relevance")
+    assert ranked[0] == hothashes[5]  # the whole word ranks above a prefix of "Jotunheimen"
+    assert set(ranked) == {hothashes[1], hothashes[2], hothashes[3], hothashes[5]}
+    paged, cursor = [], None
+    while True:
+        req = {"criteria": [{"field": "text", "operator": "contains", "value": "jotunheim"}],
+               "sort": "relevance", "limit": 1, **({"cursor": cursor} if cursor else {})}
+        r = client.post("/searches/execute", json=req)
+        paged += [x["hothash"] for x in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert paged == ranked
+
+    r = client.post("/searches/neighbours", json={
+        "criteria": [{"field": "text", "operator": "contains", "value": "jotunheim"}],
+        "sort": "relevance", "hothash": ranked[1], "n": 5,
+    }).json()
+    assert [x["hothash"] for x in r["prev"]] == [ranked[0]]
+    assert [x["hothash"] for x in r["next"]] == ranked[2:]
+    assert client.post("/searches/execute", json={"sort": "relevance"}).status_code == 422
+
+
+def test_search_cache_sees_new_companion_paths(client, hothashes):
+    search = {"criteria": [{"field": "text", "operator": "contains", "value": "gaustatoppen"}]}
+    assert client.post("/searches/facets", json=search).json()["total"] == 0
+
+    companion = {"path": "/bilder/gaustatoppen/img_0003.cr2", "type": "RAW"}
+    r = client.post(f"/photos/{hothashes[2]}/companions", json=companion)
+    assert r.status_code == 201
+    assert client.post("/searches/facets", json=search).json()["total"] == 1
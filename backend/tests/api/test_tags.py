@@ -210,6 +210,33 @@ def test_merge_nonexistent_source_returns_404(client):
     assert r.status_code == 404
 
 
+def test_photo_tag_ids_follow_every_tag_write(client, db, default_kind_id):
+    from models.photo import Photo
+
+    a, b, c = _create(client, "Fjell"), _create(client, "Fjord"), _create(client, "Fjøs")
+    p1, p2 = _make_photo(db, default_kind_id), _make_photo(db, default_kind_id)
+
+    def tag_ids(h):
+        db.expire_all()
+        return {str(t) for t in db.query(Photo.tag_ids).filter(Photo.hothash == h).scalar()}
+
+    for tag in (a, b):
+        client.post(f"/tags/{tag['id']}/add-to-photos", json={"hothashes": [p1, p2]})
+    client.post(f"/tags/{c['id']}/add-to-photos", json={"hothashes": [p1]})
+    assert tag_ids(p1) == {a["id"], b["id"], c["id"]}
+
+    client.post(f"/tags/{b['id']}/remove-from-photos", json={"hothashes": [p2]})
+    assert tag_ids(p2) == {a["id"]}
+
+    client.post(f"/tags/{a['id']}/merge-into/{c['id']}")
+    assert tag_ids(p1) == {b["id"], c["id"]}
+    assert tag_ids(p2) == {c["id"]}
+
+    client.delete(f"/tags/{c['id']}")
+    assert tag_ids(p1) == {b["id"]}
+    assert tag_ids(p2) == set()
+
+
 # ---------------------------------------------------------------------------
 # Similar (pg_trgm)
 # ---------------------------------------------------------------------------
@@ -91,11 +91,12 @@ def run_migrations(database_url):
 # ---------------------------------------------------------------------------
 
 _DATA_TABLES = (
-    "photo_corrections", "image_files", "duplicate_files",
-    "collection_items", "session_errors", "photo_tags",
+    "photo_corrections", "photo_hotpreviews", "image_files", "duplicate_files",
+    "collection_items", "session_errors", "photo_tags", "timeline_day_events", "timeline_days",
     "photos", "input_sessions", "collections",
     "events", "categories", "photographers", "system_settings", "tags", "stacks",
-    "machine_tokens", "machine_invite_codes", "machines",
+    "machine_tokens", "machine_invite_codes", "machines", "perceptual_hash_jobs",
+    "coldpreview_variant_jobs",
 )
 
 # kinds are configuration — not truncated between tests (default kind seeded by migration)
@@ -210,3 +211,40 @@ def sample_image_path(tmp_path):
     path = tmp_path / "test_image.jpg"
     img.save(str(path), format="JPEG")
     return str(path)
+
+
+@pytest.fixture
+def sorted_photos(db):
+    """Seven photos of one photographer with duplicate and NULL taken_at/rating values.
+
+    Photo i has hothash f"{i:064x}"; taken_at days (3, 1, 3, -, 2, -, 1) of
+    January 2024 and ratings (5, -, 3, 5, -, 1, 3).
+    """
+    from datetime import datetime, timezone
+
+    from models.kind import Kind
+    from models.photo import Photo
+    from models.photographer import Photographer
+
+    photographer = Photographer(name="Test Photographer")
+    db.add(photographer)
+    db.flush()
+    kind_id = db.query(Kind).filter(Kind.is_default == True).first().id
+    taken = [datetime(2024, 1, d, tzinfo=timezone.utc) if d else None for d in (3, 1, 3, None, 2, None, 1)]
+    ratings = [5, None, 3, 5, None, 1, 3]
+    photos = [
+        Photo(
+            hothash=f"{i:064x}", hotpreview_b64="AA==",
+            taken_at=t, rating=r, photographer_id=photographer.id, kind_id=kind_id,
+        )
+        for i, (t, r) in enumerate(zip(taken, ratings))
+    ]
+    db.add_all(photos)
+    db.commit()
+    return photos
+
+
+@pytest.fixture
+def hothashes(sorted_photos):
+    """Hothashes of sorted_photos, by index."""
+    return [photo.hothash for photo in sorted_photos]
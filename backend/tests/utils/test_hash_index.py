@@ -0,0 +1,73 @@
+"""Unit tests for utils/hash_index.py — multi-index Hamming search, checked against a plain scan."""
+
+import numpy as np
+import pytest
+
+from utils import hash_index
+from utils.hash_index import HashIndex, popcount, to_unsigned
+
+
+def _scan(hashes, q, r):
+    d = popcount(np.asarray(hashes, dtype=np.uint64) ^ np.uint64(q))
+    return sorted((int(d[i]), i) for i in np.nonzero(d <= r)[0])
+
+
+def _clustered(rng, n):
+    """n hashes: random centres, each with near copies a few bit flips away."""
+    centres = rng.integers(0, 2**64, size=n // 4, dtype=np.uint64)
+    hashes = []
+    for c in centres.tolist():
+        hashes.append(c)
+        for _ in range(3):
+            flips = rng.choice(64, size=rng.integers(1, 14), replace=False)
+            hashes.append(c ^ int(sum(1 << int(b) for b in flips)))
+    return hashes
+
+
+@pytest.mark.parametrize("r", [0, 3, 4, 7, 10, 13, 16])
+def test_within_matches_scan(r):
+    rng = np.random.default_rng(r)
+    hashes = _clustered(rng, 4000)
+    index = HashIndex(hashes, range(len(hashes)))
+    for q in hashes[::97]:
+        assert sorted((d, k) for k, d in index.within(q, r)) == _scan(hashes, q, r)
+
+
+def test_within_orders_nearest_first():
+    index = HashIndex([0b111, 0b1, 0, 0b11], ["c", "a", "exact", "b"])
+    assert index.within(0, 3) == [("exact", 0), ("a", 1), ("b", 2), ("c", 3)]
+    assert index.within(0, 1) == [("exact", 0), ("a", 1)]
+
+
+def test_add_goes_to_tail_then_rebuilds(monkeypatch):
+    monkeypatch.setattr(hash_index, "TAIL_LIMIT", 8)
+    rng = np.random.default_rng(1)
+    hashes = _clustered(rng, 40)
+    index = HashIndex(hashes[:10], range(10))
+    for i in range(10, len(hashes)):
+        index.add(i, hashes[i])
+        assert len(index) == i + 1
+    assert len(index._state[0]) == 40 - (40 - 10) % 8  # the last partial tail is still unsorted
+    for q in hashes:
+        assert sorted((d, k) for k, d in index.within(q, 9)) == _scan(hashes, q, 9)
+
+
+def test_pairs_matches_scan():
+    rng = np.random.default_rng(2)
+    hashes = _clustered(rng, 400)
+    index = HashIndex(hashes[:300], range(300))
+    for i in range(300, 400):
+        index.add(i, hashes[i])
+    expected = {(i, j, d) for i in range(400) for d, j in _scan(hashes, hashes[i], 8) if j > i}
+    assert set(index.pairs(8)) == expected
+
+
+def test_to_unsigned_round_trips_signed_bigint():
+    signed = [-1, -(2**63), 2**63 - 1, 0]
+    assert to_unsigned(signed).tolist() == [2**64 - 1, 2**63, 2**63 - 1, 0]
+
+
+def test_void_keys_keep_leading_zero_bytes():
+    keys = [bytes(32), bytes.fromhex("ff" * 32)]
+    index = HashIndex([5, 6], keys, key_dtype="V32")
+    assert [bytes(k) for k, _ in index.within(5, 0)] == [bytes(32)]
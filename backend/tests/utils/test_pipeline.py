@@ -0,0 +1,129 @@
+"""Unit tests for utils/pipeline.py — decode-once registration pipeline.
+
+The pipeline must produce exactly the same artefacts as the standalone
+functions; otherwise hothashes would change for already registered photos.
+The JPEG coldpreview is the exception (see utils/pipeline.py): past 2× max_px
+generate_coldpreview() decodes DCT-scaled while the pipeline downsamples its
+full decode, so the two are compared by size and PSNR instead of bytes.
+"""
+
+import io
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.exif import extract_camera_fields, extract_exif
+from utils.pipeline import PipelineError, RegistrationPipeline
+from utils.previews import generate_coldpreview, generate_hotpreview
+from utils.quality import compute_quality_metrics
+
+
+def _gradient_jpeg(path: Path, size=(640, 400), orientation: int | None = None) -> str:
+    img = Image.new("RGB", size)
+    img.putdata([((x * 255) // size[0], (y * 255) // size[1], 96)
+                 for y in range(size[1]) for x in range(size[0])])
+    exif = Image.Exif()
+    exif[0x010F] = "TestMake"   # Make
+    exif[0x0110] = "TestModel"  # Model
+    if orientation is not None:
+        exif[0x0112] = orientation
+    img.save(str(path), format="JPEG", quality=92, exif=exif.tobytes())
+    return str(path)
+
+
+def _textured_jpeg(path: Path, size=(4000, 3000)) -> str:
+    """Large enough that generate_coldpreview() decodes it at 1/2 scale."""
+    y, x = np.mgrid[0:size[1], 0:size[0]]
+    arr = np.stack([
+        127 + 100 * np.sin(x / 37) * np.cos(y / 53),
+        127 + 100 * np.sin((x + y) / 91),
+        127 + 60 * np.cos(x / 13),
+    ], axis=-1)
+    Image.fromarray(arr.clip(0, 255).astype(np.uint8)).save(str(path), quality=92)
+    return str(path)
+
+
+def _psnr(a: Image.Image, b: Image.Image) -> float:
+    mse = np.mean((np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255 ** 2 / mse)
+
+
+def _assert_parity(file_path: str, tmp_path: Path) -> None:
+    result = RegistrationPipeline(file_path).run()
+
+    jpeg_bytes, hothash, width, height = generate_hotpreview(file_path)
+    assert result.hotpreview_bytes == jpeg_bytes
+    assert result.hothash == hothash
+    assert (result.width, result.height) == (width, height)
+
+    cold_path = generate_coldpreview(file_path, hothash, str(tmp_path / "cold"))
+    pipeline_cold = Image.open(io.BytesIO(result.coldpreview_bytes)).convert("RGB")
+    standalone_cold = Image.open(cold_path).convert("RGB")
+    assert pipeline_cold.size == standalone_cold.size
+    assert _psnr(pipeline_cold, standalone_cold) > 35
+
+    assert result.exif == extract_exif(file_path)
+    assert result.camera_fields == extract_camera_fields(file_path)
+    assert result.quality == compute_quality_metrics(file_path)
+
+
+class TestPipelineParity:
+    def test_jpeg_matches_standalone_functions(self, tmp_path):
+        _assert_parity(_gradient_jpeg(tmp_path / "a.jpg"), tmp_path)
+
+    def test_rotated_jpeg_matches_standalone_functions(self, tmp_path):
+        """Orientation 6: hotpreview is transposed, coldpreview is not."""
+        path = _gradient_jpeg(tmp_path / "rot.jpg", orientation=6)
+        _assert_parity(path, tmp_path)
+        result = RegistrationPipeline(path).run()
+        assert (result.width, result.height) == (400, 640)
+        assert Image.open(io.BytesIO(result.coldpreview_bytes)).size == (640, 400)
+
+    def test_png_with_alpha_matches_standalone_functions(self, tmp_path):
+        path = tmp_path / "alpha.png"
+        Image.new("RGBA", (300, 200), (200, 40, 40, 128)).save(str(path))
+        _assert_parity(str(path), tmp_path)
+
+    def test_large_jpeg_coldpreview_close_to_draft_decode(self, tmp_path):
+        _assert_parity(_textured_jpeg(tmp_path / "large.jpg"), tmp_path)
+
+
+class TestPipelineResult:
+    def test_reports_stage_timings(self, tmp_path):
+        result = RegistrationPipeline(_gradient_jpeg(tmp_path / "a.jpg")).run()
+        for stage in ("read", "exif", "decode", "quality", "hotpreview", "coldpreview", "total"):
+            assert stage in result.timings
+            assert result.timings[stage] >= 0
+
+    def test_coldpreview_respects_max_px(self, tmp_path):
+        path = _gradient_jpeg(tmp_path / "a.jpg", size=(1000, 500))
+        result = RegistrationPipeline(path, coldpreview_max_px=400).run()
+        assert Image.open(io.BytesIO(result.coldpreview_bytes)).size == (400, 200)
+
+    def test_camera_fields_from_header(self, tmp_path):
+        result = RegistrationPipeline(_gradient_jpeg(tmp_path / "a.jpg")).run()
+        assert result.camera_fields["camera_make"] == "TestMake"
+        assert result.camera_fields["camera_model"] == "TestModel"
+
+    def test_missing_file_raises_read_stage_error(self, tmp_path):
+        with pytest.raises(PipelineError) as exc_info:
+            RegistrationPipeline(str(tmp_path / "missing.jpg")).run()
+        assert exc_info.value.stage == "read"
+
+    def test_corrupt_file_raises_decode_stage_error(self, tmp_path):
+        path = tmp_path / "corrupt.jpg"
+        path.write_bytes(b"not a jpeg")
+        with pytest.raises(PipelineError) as exc_info:
+            RegistrationPipeline(str(path)).run()
+        assert exc_info.value.stage == "decode"
+
+
+@pytest.mark.real_images
+class TestPipelineRealImages:
+    def test_jpeg_matches_standalone_functions(self, real_image_dir, tmp_path):
+        _assert_parity(str(real_image_dir / "nikon_d800.JPG"), tmp_path)
+
+    def test_nef_matches_standalone_functions(self, real_image_dir, tmp_path):
+        _assert_parity(str(real_image_dir / "nikon_d800.NEF"), tmp_path)
@@ -193,3 +193,137 @@ class TestPerceptualHashes:
         # Same shot → should be visually near-identical
         assert hamming(dct_jpg, dct_nef) <= 15, f"DCT Hamming distance too large: {hamming(dct_jpg, dct_nef)}"
         assert hamming(diff_jpg, diff_nef) <= 15, f"Diff Hamming distance too large: {hamming(diff_jpg, diff_nef)}"
+
+
+# ---------------------------------------------------------------------------
+# JPEG draft decoding — synthetic images, no real camera files needed
+# ---------------------------------------------------------------------------
+
+def _textured_jpeg(path: Path, size=(4000, 3000)) -> str:
+    import numpy as np
+    y, x = np.mgrid[0:size[1], 0:size[0]].astype(np.float32)
+    arr = np.stack([
+        127 + 100 * np.sin(x / 37) * np.cos(y / 53),
+        127 + 100 * np.sin((x + y) / 91),
+        127 + 60 * np.cos(x / 13),
+    ], axis=-1)
+    Image.fromarray(arr.clip(0, 255).astype(np.uint8)).save(str(path), quality=92)
+    return str(path)
+
+
+def _psnr(a: Image.Image, b: Image.Image) -> float:
+    import numpy as np
+    mse = np.mean((np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255 ** 2 / mse)
+
+
+class TestJpegDraftDecoding:
+    def test_draft_scale_still_covers_target(self, tmp_path):
+        from utils.previews import _draft_to_cover
+        with Image.open(_textured_jpeg(tmp_path / "a.jpg")) as f:
+            _draft_to_cover(f, 1200)
+            assert f.size == (2000, 1500)  # 1/2 scale: 1/4 would be 1000 px < 1200
+
+    def test_small_jpeg_is_not_drafted(self, tmp_path):
+        from utils.previews import _draft_to_cover
+        with Image.open(_textured_jpeg(tmp_path / "a.jpg", size=(1000, 800))) as f:
+            _draft_to_cover(f, 1200)
+            assert f.size == (1000, 800)
+
+    def test_coldpreview_close_to_full_decode(self, tmp_path):
+        path = _textured_jpeg(tmp_path / "a.jpg")
+        cold = Image.open(generate_coldpreview(path, "ab" * 32, str(tmp_path / "cold")))
+        assert cold.size == (1200, 900)
+
+        with Image.open(path) as f:
+            reference = f.convert("RGB").resize((1200, 900), Image.LANCZOS)
+        assert _psnr(cold.convert("RGB"), reference) > 35
+
+    def test_scaled_preview_respects_maxpx(self, tmp_path):
+        from utils.previews import generate_preview
+        data = generate_preview(_textured_jpeg(tmp_path / "a.jpg"), maxpx=800)
+        assert Image.open(io.BytesIO(data)).size == (800, 600)
+
+    def test_hotpreview_uses_full_decode(self, tmp_path):
+        """hothash must be independent of draft decoding — see module docstring."""
+        import hashlib
+        path = _textured_jpeg(tmp_path / "a.jpg")
+        jpeg_bytes, hothash, _, _ = generate_hotpreview(path)
+
+        with Image.open(path) as f:
+            f.load()  # forces full-resolution decode
+            img = f.convert("RGB")
+        img.thumbnail((150, 150), Image.LANCZOS)
+        left, top = (img.width - 150) // 2, (img.height - 150) // 2
+        img = img.crop((left, top, left + 150, top + 150))
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=80, optimize=True)
+        assert hothash == hashlib.sha256(buf.getvalue()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# RAW coldpreview tiers — tier selection on a stand-in for rawpy.RawPy
+# ---------------------------------------------------------------------------
+
+class _FakeRaw:
+    """Minimal rawpy.RawPy stand-in: sizes + postprocess()."""
+
+    def __init__(self, width=6000, height=4000, flip=0):
+        from types import SimpleNamespace
+        self.sizes = SimpleNamespace(width=width, height=height, flip=flip)
+        self.postprocess_calls = []
+
+    def postprocess(self, half_size=False, **kwargs):
+        import numpy as np
+        self.postprocess_calls.append(half_size)
+        div = 2 if half_size else 1
+        return np.zeros((self.sizes.height // div, self.sizes.width // div, 3), dtype=np.uint8)
+
+
+def _jpeg_bytes(size) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, (90, 120, 150)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+class TestRawColdpreviewTiers:
+    def test_large_embedded_preview_is_used(self):
+        from utils.previews import _raw_coldpreview_source
+        raw = _FakeRaw()
+        img, tier = _raw_coldpreview_source(raw, _jpeg_bytes((1620, 1080)), 1200)
+        assert tier == "embedded"
+        assert img.size == (1620, 1080)
+        assert raw.postprocess_calls == []
+
+    def test_small_embedded_preview_falls_back_to_half_size(self):
+        from utils.previews import _raw_coldpreview_source
+        raw = _FakeRaw()
+        img, tier = _raw_coldpreview_source(raw, _jpeg_bytes((640, 424)), 1200)
+        assert tier == "half_size"
+        assert img.size == (3000, 2000)
+        assert raw.postprocess_calls == [True]
+
+    def test_letterboxed_preview_is_rejected(self):
+        from utils.previews import _raw_coldpreview_source
+        _, tier = _raw_coldpreview_source(_FakeRaw(), _jpeg_bytes((1600, 1200)), 1200)
+        assert tier == "half_size"
+
+    def test_small_sensor_uses_full_decode(self):
+        from utils.previews import _raw_coldpreview_source
+        raw = _FakeRaw(width=2000, height=1500)
+        _, tier = _raw_coldpreview_source(raw, None, 1200)
+        assert tier == "full"
+        assert raw.postprocess_calls == [False]
+
+    def test_full_quality_forces_full_decode(self):
+        from utils.previews import _raw_coldpreview_source
+        raw = _FakeRaw()
+        _, tier = _raw_coldpreview_source(raw, _jpeg_bytes((6000, 4000)), 1200, full_quality=True)
+        assert tier == "full"
+        assert raw.postprocess_calls == [False]
+
+    def test_embedded_preview_follows_libraw_rotation(self):
+        from utils.previews import _raw_coldpreview_source
+        img, tier = _raw_coldpreview_source(_FakeRaw(flip=6), _jpeg_bytes((1620, 1080)), 1200)
+        assert tier == "embedded"
+        assert img.size == (1080, 1620)
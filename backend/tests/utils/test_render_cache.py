@@ -0,0 +1,69 @@
+"""Unit tests for utils/render_cache.py — on-disk LRU render cache."""
+
+import threading
+import time
+
+from utils.render_cache import RenderCache
+
+
+def _key(n: int) -> str:
+    return f"{n:064x}"
+
+
+class TestRenderCache:
+    def test_miss_renders_and_hit_reads_from_disk(self, tmp_path):
+        cache = RenderCache(tmp_path, max_bytes=1_000)
+        calls = []
+        assert cache.get_or_render(_key(1), lambda: calls.append(1) or b"abc") == b"abc"
+        assert cache.path_for(_key(1)).read_bytes() == b"abc"
+        assert cache.get_or_render(_key(1), lambda: b"never") == b"abc"
+        assert calls == [1]
+
+    def test_hit_survives_eviction_before_it_is_sent(self, tmp_path):
+        cache = RenderCache(tmp_path, max_bytes=150)
+        cache.put(_key(1), b"x" * 100)
+        jpeg = cache.get(_key(1))
+        cache.put(_key(2), b"y" * 100)        # evicts 1 while its response is in flight
+        assert not cache.path_for(_key(1)).exists()
+        assert jpeg == b"x" * 100
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = RenderCache(tmp_path, max_bytes=250)
+        cache.put(_key(1), b"x" * 100)
+        cache.put(_key(2), b"x" * 100)
+        cache.get(_key(1))                    # 1 is now more recent than 2
+        cache.put(_key(3), b"x" * 100)        # over budget → evict 2
+
+        assert cache.get(_key(1)) is not None
+        assert cache.get(_key(2)) is None
+        assert cache.get(_key(3)) is not None
+        assert cache.total_bytes == 200
+
+    def test_index_is_rebuilt_from_disk(self, tmp_path):
+        RenderCache(tmp_path, max_bytes=1_000).put(_key(1), b"x" * 100)
+        cache = RenderCache(tmp_path, max_bytes=1_000)
+        assert cache.total_bytes == 100
+        assert cache.get(_key(1)) is not None
+
+    def test_concurrent_renders_are_coalesced(self, tmp_path):
+        cache = RenderCache(tmp_path, max_bytes=1_000)
+        calls = []
+
+        def slow_render() -> bytes:
+            calls.append(1)
+            time.sleep(0.2)
+            return b"rendered"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_render(_key(7), slow_render)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert len(results) == 8
+        assert results == [b"rendered"] * 8
@@ -0,0 +1,41 @@
+"""Unit tests for utils/result_cache.py — in-memory LRU result cache."""
+
+from utils.result_cache import ResultCache
+
+
+class TestResultCache:
+    def test_computes_once_per_key(self):
+        cache = ResultCache(max_entries=4)
+        calls = []
+        assert cache.get_or_compute("a", lambda: calls.append(1) or 42) == 42
+        assert cache.get_or_compute("a", lambda: 0) == 42
+        assert calls == [1]
+
+    def test_caches_falsy_values(self):
+        cache = ResultCache(max_entries=4)
+        cache.put("empty", [])
+        assert cache.get_or_compute("empty", lambda: ["computed"]) == []
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(max_entries=2)
+        cache.put(1, "one")
+        cache.put(2, "two")
+        cache.get(1)            # 1 is now more recent than 2
+        cache.put(3, "three")   # over capacity → evict 2
+
+        assert cache.get(1) == "one"
+        assert cache.get(2) is None
+        assert cache.get(3) == "three"
+        assert len(cache) == 2
+
+    def test_evicts_down_to_max_weight(self):
+        cache = ResultCache(max_entries=10, max_weight=10, weigh=len)
+        cache.put("a", b"x" * 4)
+        cache.put("b", b"x" * 4)
+        cache.put("c", b"x" * 4)   # 12 > 10 → evict a
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+
+        cache.put("huge", b"x" * 11)  # heavier than the whole cache → not stored
+        assert cache.get("huge") is None
+        assert len(cache) == 2
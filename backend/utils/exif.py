@@ -7,10 +7,13 @@ Two backends:
 Public API:
     extract_exif(file_path)          → curated dict stored in ImageFile.exif_data (JSONB)
     extract_camera_fields(file_path) → dict of dedicated Photo column values
+    extract_exif_and_camera_fields(file_path, data)
+                                     → both of the above from a single header parse
     extract_taken_at(exif_data)      → datetime | None  (reads from curated dict)
     extract_gps(exif_data)           → (lat, lng) | (None, None)  (reads from curated dict)
 """
 
+import io
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -83,6 +86,24 @@ def extract_camera_fields(file_path: str) -> dict:
     return _extract_camera_fields_pillow(file_path)
 
 
+def extract_exif_and_camera_fields(file_path: str, data: bytes | None = None) -> tuple[dict, dict]:
+    """Return (extract_exif(...), extract_camera_fields(...)) from one header parse.
+
+    The extension of file_path selects the backend. When *data* (the file's
+    bytes) is given, EXIF is parsed from memory and the file is not reopened.
+    """
+    source = io.BytesIO(data) if data is not None else None
+    if _is_raw(file_path):
+        tags = _exifread_tags(file_path, source)
+        if not tags:
+            return {}, {}
+        return _exifread_build_curated(tags), _exifread_build_camera_fields(tags)
+    raw = _pillow_read_raw(file_path, source)
+    if not raw:
+        return {}, {}
+    return _pillow_build_curated(raw), _pillow_build_camera_fields(raw)
+
+
 def extract_taken_at(exif_data: dict) -> datetime | None:
     """Parse taken_at from the curated exif dict (date_time_original field)."""
     raw_dt = exif_data.get("date_time_original")
@@ -117,9 +138,9 @@ def _extract_camera_fields_pillow(file_path: str) -> dict:
     return _pillow_build_camera_fields(raw)
 
 
-def _pillow_read_raw(file_path: str) -> dict | None:
+def _pillow_read_raw(file_path: str, fileobj: io.BytesIO | None = None) -> dict | None:
     try:
-        with Image.open(file_path) as img:
+        with Image.open(fileobj or file_path) as img:
             return img._getexif()  # type: ignore[attr-defined]
     except Exception as exc:
         log.warning("Pillow: could not read EXIF from %s: %s", file_path, exc)
@@ -231,11 +252,14 @@ def _extract_camera_fields_raw(file_path: str) -> dict:
     return _exifread_build_camera_fields(tags)
 
 
-def _exifread_tags(file_path: str) -> dict | None:
+def _exifread_tags(file_path: str, fileobj: io.BytesIO | None = None) -> dict | None:
     try:
         import exifread
-        with open(file_path, "rb") as f:
-            tags = exifread.process_file(f, details=True)
+        if fileobj is not None:
+            tags = exifread.process_file(fileobj, details=True)
+        else:
+            with open(file_path, "rb") as f:
+                tags = exifread.process_file(f, details=True)
         return tags if tags else None
     except Exception as exc:
         log.warning("exifread: could not read EXIF from %s: %s", file_path, exc)
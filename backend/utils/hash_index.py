@@ -0,0 +1,180 @@
+"""In-memory Hamming-distance index over 64-bit perceptual hashes.
+
+Multi-index hashing (Norouzi, Punjani & Fleet, 2012): every hash is cut into
+four 16-bit chunks, and each chunk position gets a table from chunk value to
+the entries holding it. Two hashes within distance r differ in at most r // 4
+bits in at least one chunk (pigeonhole), so a lookup reads, per table, the
+buckets within r // 4 bit flips of the query's chunk and verifies those
+candidates with a popcount. For r < 8 that is 4 × 17 bucket reads instead of a
+scan of every hash.
+
+    index = HashIndex(hashes, keys)
+    index.within(h, 10)         # [(key, distance), ...] nearest first
+    index.add(key, h)
+
+Each table is a sorted array of entry positions plus 65 537 bucket offsets,
+built in one pass. add() appends to a small unsorted tail that lookups scan
+directly; the tables are rebuilt once the tail passes TAIL_LIMIT.
+
+Hashes are unsigned here; photos store them as signed BIGINT (see
+to_unsigned). Lookups may run concurrently; add() must be serialised by the
+caller.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from functools import lru_cache
+
+import numpy as np
+
+CHUNKS = 4
+CHUNK_BITS = 16
+_BUCKETS = 1 << CHUNK_BITS
+_CHUNK_MASK = np.uint64(_BUCKETS - 1)
+
+_TABLE_OFFSETS = (np.arange(CHUNKS, dtype=np.int64) * _BUCKETS)[:, None]
+
+# Entries added since the last table build are scanned directly; at this many
+# the tables are rebuilt
+TAIL_LIMIT = 4096
+# Scan every hash instead when a lookup's buckets hold more than 1/8 of them
+SCAN_FRACTION = 8
+
+if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+    def popcount(x: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(x)
+else:
+    _POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(x: np.ndarray) -> np.ndarray:
+        x = np.ascontiguousarray(x, dtype=np.uint64)
+        return _POPCOUNT8[x.view(np.uint8)].reshape(x.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def to_unsigned(hashes: Iterable[int]) -> np.ndarray:
+    """Signed 64-bit hashes (as stored in BIGINT columns) as a uint64 array."""
+    return np.fromiter(hashes, dtype=np.int64).view(np.uint64)
+
+
+@lru_cache(maxsize=None)
+def _flip_masks(bits: int) -> np.ndarray:
+    """All chunk values with at most `bits` bits set, i.e. the XOR masks of a probe."""
+    values = np.arange(_BUCKETS, dtype=np.uint32)
+    return values[popcount(values) <= bits]
+
+
+def _tables(hashes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """The CHUNKS tables stacked: (entry positions, bucket offsets into them).
+
+    Table c holds the positions ordered by chunk c's value; bucket v of table
+    c is order[starts[c * 65536 + v]:starts[c * 65536 + v + 1]].
+    """
+    orders, starts = [], [np.zeros(1, dtype=np.int64)]
+    for c in range(CHUNKS):
+        values = ((hashes >> np.uint64(c * CHUNK_BITS)) & _CHUNK_MASK).astype(np.int64)
+        orders.append(np.argsort(values, kind="stable").astype(np.int32))
+        starts.append(c * len(hashes) + np.cumsum(np.bincount(values, minlength=_BUCKETS)))
+    return np.concatenate(orders), np.concatenate(starts)
+
+
+class HashIndex:
+    def __init__(self, hashes: np.ndarray | Sequence[int], keys: Sequence, key_dtype=object):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        keys = np.asarray(keys, dtype=key_dtype)
+        if keys.shape != hashes.shape:
+            raise ValueError("hashes and keys differ in length")
+        self._state = self._snapshot(hashes, keys)
+
+    @staticmethod
+    def _snapshot(hashes: np.ndarray, keys: np.ndarray) -> tuple:
+        """(hashes, keys, tables, tail hashes, tail keys), replaced as a whole so
+        lookups always see a consistent state. The tail is a preallocated buffer
+        filled up to len(tail keys)."""
+        return hashes, keys, _tables(hashes), np.empty(TAIL_LIMIT, dtype=np.uint64), []
+
+    def __len__(self) -> int:
+        hashes, _, _, _, tail_keys = self._state
+        return len(hashes) + len(tail_keys)
+
+    def add(self, key, h: int) -> None:
+        """Insert one entry (h unsigned). Keys are not deduplicated."""
+        hashes, keys, _, tail_hashes, tail_keys = self._state
+        tail_hashes[len(tail_keys)] = h
+        tail_keys.append(key)  # after the hash: readers go by len(tail_keys)
+        if len(tail_keys) == TAIL_LIMIT:
+            merged_keys = np.empty(TAIL_LIMIT, dtype=keys.dtype)
+            merged_keys[:] = tail_keys
+            self._state = self._snapshot(
+                np.concatenate([hashes, tail_hashes]), np.concatenate([keys, merged_keys]),
+            )
+
+    @staticmethod
+    def _candidates(tables, q: int, bits: int) -> np.ndarray | None:
+        """Positions of entries whose chunk in some table is within `bits` flips of q's.
+
+        May repeat a position. None when the buckets hold more than
+        1 / SCAN_FRACTION of all entries — a plain scan is cheaper then.
+        """
+        masks = _flip_masks(bits)
+        if len(masks) * CHUNKS * SCAN_FRACTION > _BUCKETS:
+            return None  # even evenly filled buckets would be too many
+        order, starts = tables
+        chunks = (np.uint64(q) >> np.arange(0, 64, CHUNK_BITS, dtype=np.uint64)) & _CHUNK_MASK
+        buckets = (masks ^ chunks[:, None]).astype(np.int64) + _TABLE_OFFSETS
+        begin = starts[buckets.ravel()]
+        sizes = starts[buckets.ravel() + 1] - begin
+        total = int(sizes.sum())
+        if total * SCAN_FRACTION > len(order) // CHUNKS:
+            return None
+        # Concatenate the bucket ranges without a Python loop
+        offsets = np.repeat(begin - (np.cumsum(sizes) - sizes), sizes) + np.arange(total)
+        return order[offsets]
+
+    def _lookup(self, state, q: int, max_distance: int) -> tuple[np.ndarray, np.ndarray]:
+        """(positions, distances) of all entries within max_distance of q.
+
+        Positions past the table entries index the tail.
+        """
+        hashes, _, tables, tail_hashes, tail_keys = state
+        positions = self._candidates(tables, q, max_distance // CHUNKS)
+        if positions is None:
+            distances = popcount(hashes ^ np.uint64(q))
+            (positions,) = np.nonzero(distances <= max_distance)
+            distances = distances[positions]
+        else:
+            hit = popcount(hashes[positions] ^ np.uint64(q)) <= max_distance
+            positions = np.unique(positions[hit])
+            distances = popcount(hashes[positions] ^ np.uint64(q))
+        if tail_keys:
+            tail = popcount(tail_hashes[:len(tail_keys)] ^ np.uint64(q))
+            (tail_hit,) = np.nonzero(tail <= max_distance)
+            positions = np.concatenate([positions, tail_hit + len(hashes)])
+            distances = np.concatenate([distances, tail[tail_hit]])
+        return positions, distances
+
+    @staticmethod
+    def _key(state, position: int):
+        hashes, keys, _, _, tail_keys = state
+        return keys[position] if position < len(hashes) else tail_keys[position - len(hashes)]
+
+    def within(self, h: int, max_distance: int) -> list[tuple[object, int]]:
+        """Entries within max_distance of h (unsigned), as (key, distance), nearest first."""
+        state = self._state
+        positions, distances = self._lookup(state, h, max_distance)
+        ranked = np.lexsort((positions, distances))
+        return [(self._key(state, int(positions[i])), int(distances[i])) for i in ranked]
+
+    def pairs(self, max_distance: int) -> Iterator[tuple[object, object, int]]:
+        """Every unordered pair of entries within max_distance, as (key_a, key_b, distance).
+
+        One lookup per entry, so the cost is len(self) lookups — seconds, not
+        milliseconds, for a large library. Entries added meanwhile are not seen.
+        """
+        hashes, keys, tables, tail_hashes, tail_keys = self._state
+        n = len(tail_keys)
+        state = (hashes, keys, tables, tail_hashes[:n], tail_keys[:n])
+        everything = np.concatenate([hashes, tail_hashes[:n]])
+        for a, h in enumerate(everything.tolist()):
+            positions, distances = self._lookup(state, h, max_distance)
+            later = positions > a
+            for b, d in zip(positions[later].tolist(), distances[later].tolist()):
+                yield self._key(state, a), self._key(state, b), d
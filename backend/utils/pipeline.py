@@ -0,0 +1,220 @@
+"""Decode-once registration pipeline.
+
+generate_hotpreview(), generate_coldpreview(), extract_exif(),
+extract_camera_fields() and compute_quality_metrics() each open the master
+file on their own — for RAW files that means up to three full LibRaw
+demosaics per photo. RegistrationPipeline reads the file once, decodes it
+once and derives every registration artefact from that single decode:
+
+    pipeline = RegistrationPipeline(master_path)
+    result = pipeline.run()
+    result.hothash, result.coldpreview_bytes, result.timings, ...
+
+Hotpreview, hothash, EXIF and quality metrics are byte-identical to the
+standalone functions, so hothashes of photos registered before and after
+this pipeline match. The JPEG coldpreview is the one exception: the
+pipeline already holds a full-resolution decode and downsamples that,
+whereas generate_coldpreview() decodes large JPEGs DCT-scaled (draft mode).
+The two differ by a few levels per pixel once the source exceeds 2× max_px.
+
+Decode sources per artefact (same as the standalone functions):
+
+    JPEG/TIFF/PNG/HEIC  hotpreview + quality: EXIF-transposed decode
+                        coldpreview:          untransposed decode
+    RAW                 hotpreview + quality: embedded JPEG (full decode fallback)
+                        coldpreview:          embedded JPEG, half_size or full LibRaw
+                                              decode (PipelineResult.coldpreview_source)
+"""
+
+import io
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from utils.exif import extract_exif_and_camera_fields
+from utils.previews import (
+    COLDPREVIEW_MAX_DEFAULT,
+    COLDPREVIEW_SOURCE_FULL,
+    _is_raw,
+    _raw_coldpreview_source,
+    _raw_embedded_jpeg,
+    _raw_postprocess,
+    _to_rgb,
+    coldpreview_from_image,
+    hotpreview_from_image,
+)
+from utils.quality import quality_metrics_from_image
+
+
+class PipelineError(Exception):
+    """Raised when a pipeline stage fails. `stage` names the failing stage."""
+
+    def __init__(self, stage: str, cause: Exception):
+        super().__init__(f"{stage}: {cause}")
+        self.stage = stage
+        self.cause = cause
+
+
+@dataclass
+class PipelineResult:
+    hotpreview_bytes: bytes
+    hothash: str
+    width: int
+    height: int
+    coldpreview_bytes: bytes
+    exif: dict
+    camera_fields: dict
+    quality: dict[str, float | None]
+    coldpreview_source: str | None = None  # RAW tier, None for other formats
+    timings: dict[str, float] = field(default_factory=dict)  # stage → milliseconds
+
+
+class RegistrationPipeline:
+    """Process one master file with a single read and a single decode.
+
+    Stages (keys in PipelineResult.timings): read, exif, decode, quality,
+    hotpreview, coldpreview, plus total.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        coldpreview_max_px: int = COLDPREVIEW_MAX_DEFAULT,
+        coldpreview_quality: int = 85,
+        coldpreview_full_quality: bool = False,
+    ):
+        self.file_path = file_path
+        self.coldpreview_max_px = coldpreview_max_px
+        self.coldpreview_quality = coldpreview_quality
+        self.coldpreview_full_quality = coldpreview_full_quality
+        self.timings: dict[str, float] = {}
+
+    def run(self) -> PipelineResult:
+        started = time.perf_counter()
+
+        with self._stage("read"):
+            data = Path(self.file_path).read_bytes()
+
+        with self._stage("exif"):
+            exif, camera_fields = extract_exif_and_camera_fields(self.file_path, data)
+
+        if _is_raw(self.file_path):
+            result = self._run_raw(data, exif, camera_fields)
+        else:
+            result = self._run_pillow(data, exif, camera_fields)
+
+        self.timings["total"] = _ms_since(started)
+        result.timings = dict(self.timings)
+        return result
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+
+    def _run_pillow(self, data: bytes, exif: dict, camera_fields: dict) -> PipelineResult:
+        with self._stage("decode"):
+            with Image.open(io.BytesIO(data)) as f:
+                f.load()
+                # exif_transpose always returns a new image, so `upright` can be
+                # thumbnailed in place without touching `original`.
+                transposed = ImageOps.exif_transpose(f)
+                upright = _to_rgb(transposed)
+                original = _to_rgb(f).copy()
+
+        with self._stage("quality"):
+            # compute_quality_metrics() drops alpha rather than compositing it
+            quality = quality_metrics_from_image(
+                upright if transposed.mode == "RGB" else transposed.convert("RGB")
+            )
+
+        width, height = upright.size
+        with self._stage("hotpreview"):
+            hot_bytes, hothash = hotpreview_from_image(upright)
+
+        with self._stage("coldpreview"):
+            cold_bytes = coldpreview_from_image(
+                original, self.coldpreview_max_px, self.coldpreview_quality
+            )
+
+        return PipelineResult(
+            hotpreview_bytes=hot_bytes,
+            hothash=hothash,
+            width=width,
+            height=height,
+            coldpreview_bytes=cold_bytes,
+            exif=exif,
+            camera_fields=camera_fields,
+            quality=quality,
+        )
+
+    def _run_raw(self, data: bytes, exif: dict, camera_fields: dict) -> PipelineResult:
+        import rawpy
+
+        with self._stage("decode"):
+            with rawpy.imread(io.BytesIO(data)) as raw:
+                width, height = raw.sizes.width, raw.sizes.height
+                thumb = _raw_embedded_jpeg(raw)
+                if thumb is None:
+                    # The hotpreview needs the full decode anyway — reuse it
+                    full = _raw_postprocess(raw)
+                    cold_src, cold_source = full, COLDPREVIEW_SOURCE_FULL
+                else:
+                    cold_src, cold_source = _raw_coldpreview_source(
+                        raw, thumb, self.coldpreview_max_px, self.coldpreview_full_quality
+                    )
+
+        with self._stage("quality"):
+            if thumb is not None:
+                quality_img = Image.open(io.BytesIO(thumb)).convert("RGB")
+            else:
+                quality_img = full
+            quality = quality_metrics_from_image(quality_img)
+
+        with self._stage("hotpreview"):
+            if thumb is not None:
+                # Fresh, unloaded image: thumbnail() decodes it in draft mode,
+                # exactly like generate_hotpreview(). Required for hothash parity.
+                hot_src = _to_rgb(Image.open(io.BytesIO(thumb)))
+            else:
+                hot_src = full.copy()
+            hot_bytes, hothash = hotpreview_from_image(hot_src)
+
+        with self._stage("coldpreview"):
+            cold_bytes = coldpreview_from_image(
+                cold_src, self.coldpreview_max_px, self.coldpreview_quality
+            )
+
+        return PipelineResult(
+            hotpreview_bytes=hot_bytes,
+            hothash=hothash,
+            width=width,
+            height=height,
+            coldpreview_bytes=cold_bytes,
+            exif=exif,
+            camera_fields=camera_fields,
+            quality=quality,
+            coldpreview_source=cold_source,
+        )
+
+    # ------------------------------------------------------------------
+    # Timing
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        except PipelineError:
+            raise
+        except Exception as exc:
+            raise PipelineError(name, exc) from exc
+        finally:
+            self.timings[name] = _ms_since(started)
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
@@ -5,12 +5,24 @@ executor if you need to keep an async event loop unblocked for long batches).
 
 RAW files are handled via rawpy (LibRaw):
 - Hotpreview: extracts the embedded JPEG thumbnail (fast) with full-decode fallback.
-- Coldpreview: full LibRaw decode for maximum quality.
+- Coldpreview: tiered, cheapest source that still covers max_px (see
+  _raw_coldpreview_source): the embedded JPEG preview, then a half-size LibRaw
+  decode, then the full LibRaw decode. full_quality=True always uses the full
+  decode. The chosen tier is recorded per photo as Photo.coldpreview_source.
+
+JPEG decode strategy:
+- Coldpreview and scaled previews let libjpeg decode at 1/2, 1/4 or 1/8 scale
+  (Image.draft) — the smallest scale whose longest edge still covers the
+  target — followed by a final LANCZOS resize. See _draft_to_cover().
+- Hotpreview always decodes at full resolution. The hothash is the SHA256 of
+  the hotpreview bytes, so its decode path must never change: a different
+  decode would give every already registered JPEG a new hothash.
 """
 
 import base64
 import hashlib
 import io
+import math
 import os
 from pathlib import Path
 
@@ -21,6 +33,14 @@ from utils.registration import RAW_EXTENSIONS
 HOTPREVIEW_SIZE = (150, 150)
 COLDPREVIEW_MAX_DEFAULT = 1200  # longest edge — override via SystemSettings
 
+# Pre-rendered coldpreview sizes, stored next to <hothash>.jpg as <hothash>_<px>.jpg
+COLDPREVIEW_VARIANTS = (300, 600)
+
+# RAW coldpreview tiers, cheapest first (stored in Photo.coldpreview_source)
+COLDPREVIEW_SOURCE_EMBEDDED = "embedded"
+COLDPREVIEW_SOURCE_HALF_SIZE = "half_size"
+COLDPREVIEW_SOURCE_FULL = "full"
+
 
 def _is_raw(file_path: str) -> bool:
     return Path(file_path).suffix.lower() in RAW_EXTENSIONS
@@ -40,11 +60,26 @@ def generate_hotpreview(file_path: str) -> tuple[bytes, str, int, int]:
         img, orig_w, orig_h = _raw_open_for_thumb(file_path)
     else:
         from PIL import ImageOps
+        # Full-resolution decode on purpose — never draft here (hothash stability).
         with Image.open(file_path) as f:
             img = ImageOps.exif_transpose(f)
             img = _to_rgb(img).copy()
             orig_w, orig_h = img.size
 
+    jpeg_bytes, hothash = hotpreview_from_image(img)
+    return jpeg_bytes, hothash, orig_w, orig_h
+
+
+def hotpreview_from_image(img: Image.Image) -> tuple[bytes, str]:
+    """Render the 150×150 hotpreview from an upright RGB image.
+
+    The image is thumbnailed in place. Pass a not-yet-loaded JPEG (e.g. an
+    embedded RAW thumbnail) exactly as generate_hotpreview() does — Pillow
+    then decodes it in draft mode, and the hothash depends on that.
+
+    Returns:
+        (jpeg_bytes, hothash)
+    """
     img.thumbnail(HOTPREVIEW_SIZE, Image.LANCZOS)
 
     # Centre-crop to exact 150×150
@@ -58,8 +93,7 @@ def generate_hotpreview(file_path: str) -> tuple[bytes, str, int, int]:
     img.save(buf, format="JPEG", quality=80, optimize=True)
     jpeg_bytes = buf.getvalue()
 
-    hothash = hashlib.sha256(jpeg_bytes).hexdigest()
-    return jpeg_bytes, hothash, orig_w, orig_h
+    return jpeg_bytes, hashlib.sha256(jpeg_bytes).hexdigest()
 
 
 def hotpreview_b64(jpeg_bytes: bytes) -> str:
@@ -92,6 +126,19 @@ def compute_perceptual_hashes(jpeg_bytes: bytes) -> tuple[int, int]:
     return dct, diff
 
 
+def try_perceptual_hashes(jpeg_bytes: bytes | None) -> tuple[int, int] | None:
+    """compute_perceptual_hashes, or None when the JPEG is missing or unreadable.
+
+    Module-level and picklable, so it can be mapped over a process pool.
+    """
+    if not jpeg_bytes:
+        return None
+    try:
+        return compute_perceptual_hashes(jpeg_bytes)
+    except Exception:
+        return None
+
+
 def generate_preview(file_path: str, maxpx: int = 1200) -> bytes:
     """Generate a scaled JPEG preview maintaining aspect ratio — no cropping.
 
@@ -102,8 +149,10 @@ def generate_preview(file_path: str, maxpx: int = 1200) -> bytes:
 
     if _is_raw(file_path):
         img, _, _ = _raw_open_for_thumb(file_path)
+        _draft_to_cover(img, maxpx)
     else:
         with Image.open(file_path) as f:
+            _draft_to_cover(f, maxpx)
             img = ImageOps.exif_transpose(f)
             img = _to_rgb(img).copy()
 
@@ -123,10 +172,13 @@ def generate_coldpreview(
     coldpreview_dir: str,
     max_px: int = COLDPREVIEW_MAX_DEFAULT,
     quality: int = 85,
+    full_quality: bool = False,
 ) -> str:
     """Generate a JPEG coldpreview and save it to disk.
 
-    For RAW files: full LibRaw decode for maximum quality.
+    For RAW files: cheapest tier that covers max_px (see _raw_coldpreview_source);
+    full_quality=True forces the full LibRaw decode.
+    For JPEG files: scaled libjpeg decode (see _draft_to_cover).
     Directory layout: <coldpreview_dir>/<hothash[0:2]>/<hothash[2:4]>/<hothash>.jpg
 
     Returns:
@@ -136,24 +188,98 @@ def generate_coldpreview(
     os.makedirs(dest_path.parent, exist_ok=True)
 
     if _is_raw(file_path):
-        img = _raw_open_full(file_path)
+        import rawpy
+
+        with rawpy.imread(file_path) as raw:
+            img, _ = _raw_coldpreview_source(raw, _raw_embedded_jpeg(raw), max_px, full_quality)
     else:
         with Image.open(file_path) as f:
+            _draft_to_cover(f, max_px)
             img = _to_rgb(f).copy()
 
+    dest_path.write_bytes(coldpreview_from_image(img, max_px, quality))
+    return str(dest_path)
+
+
+def coldpreview_from_image(
+    img: Image.Image,
+    max_px: int = COLDPREVIEW_MAX_DEFAULT,
+    quality: int = 85,
+) -> bytes:
+    """Encode a decoded RGB image as coldpreview JPEG bytes (longest edge ≤ max_px)."""
     w, h = img.size
     if max(w, h) > max_px:
         scale = max_px / max(w, h)
         img = img.resize((int(w * scale), int(h * scale)), Image.LANCZOS)
 
-    img.save(str(dest_path), format="JPEG", quality=quality, optimize=True)
-    return str(dest_path)
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality, optimize=True)
+    return buf.getvalue()
 
 
 def coldpreview_exists(hothash: str, coldpreview_dir: str) -> bool:
     return _coldpreview_path(hothash, coldpreview_dir).exists()
 
 
+def coldpreview_variant_path(hothash: str, coldpreview_dir: str, max_px: int | None = None) -> Path:
+    """Path of a coldpreview variant. max_px=None is the coldpreview itself."""
+    path = _coldpreview_path(hothash, coldpreview_dir)
+    if max_px is None:
+        return path
+    return path.with_name(f"{hothash}_{max_px}.jpg")
+
+
+def write_coldpreview_variants(hothash: str, coldpreview_dir: str, quality: int = 85) -> int:
+    """Render the COLDPREVIEW_VARIANTS that are missing for one coldpreview.
+
+    Each variant is rendered from <hothash>.jpg with a DCT-scaled decode.
+    Variants that would not be smaller than the coldpreview are skipped.
+
+    Returns:
+        Number of variant files written.
+    """
+    source = _coldpreview_path(hothash, coldpreview_dir)
+    written = 0
+    for max_px in COLDPREVIEW_VARIANTS:
+        dest = coldpreview_variant_path(hothash, coldpreview_dir, max_px)
+        if dest.exists():
+            continue
+        with Image.open(source) as f:
+            if max(f.size) <= max_px:
+                continue
+            _draft_to_cover(f, max_px)
+            img = _to_rgb(f).copy()
+        dest.write_bytes(coldpreview_from_image(img, max_px, quality))
+        written += 1
+    return written
+
+
+def try_write_coldpreview_variants(hothash: str, coldpreview_dir: str) -> int | None:
+    """write_coldpreview_variants, or None when the coldpreview is unreadable.
+
+    Module-level and picklable, so it can be mapped over a process pool.
+    """
+    try:
+        return write_coldpreview_variants(hothash, coldpreview_dir)
+    except Exception:
+        return None
+
+
+def best_coldpreview_path(hothash: str, coldpreview_dir: str, max_px: int | None = None) -> Path:
+    """Smallest existing coldpreview variant whose longest edge is ≥ max_px.
+
+    Falls back to <hothash>.jpg when max_px is None, exceeds every variant or
+    the variant file is missing (not yet backfilled).
+    """
+    if max_px is not None:
+        for variant_px in sorted(COLDPREVIEW_VARIANTS):
+            if variant_px >= max_px:
+                path = coldpreview_variant_path(hothash, coldpreview_dir, variant_px)
+                if path.exists():
+                    return path
+    return _coldpreview_path(hothash, coldpreview_dir)
+
+
 # ---------------------------------------------------------------------------
 # RAW helpers (rawpy / LibRaw)
 # ---------------------------------------------------------------------------
@@ -170,30 +296,71 @@ def _raw_open_for_thumb(file_path: str) -> tuple[Image.Image, int, int]:
         orig_w = raw.sizes.width
         orig_h = raw.sizes.height
 
-        try:
-            thumb = raw.extract_thumb()
-            if thumb.format == rawpy.ThumbFormat.JPEG:
-                img = Image.open(io.BytesIO(thumb.data))
-                return _to_rgb(img), orig_w, orig_h
-        except Exception:
-            pass
+        thumb = _raw_embedded_jpeg(raw)
+        if thumb is not None:
+            return _to_rgb(Image.open(io.BytesIO(thumb))), orig_w, orig_h
 
         # No embedded thumbnail — full decode
-        rgb = raw.postprocess(use_camera_wb=True, output_bps=8)
+        return _raw_postprocess(raw), orig_w, orig_h
 
-    import numpy as np  # noqa: F401 — Image.fromarray requires numpy
-    img = Image.fromarray(rgb)
-    return _to_rgb(img), orig_w, orig_h
 
+def _raw_coldpreview_source(
+    raw,
+    thumb: bytes | None,
+    max_px: int,
+    full_quality: bool = False,
+) -> tuple[Image.Image, str]:
+    """Pick the cheapest decode of an open rawpy.RawPy that still covers max_px.
+
+    1. Embedded JPEG preview — when its longest edge is ≥ max_px and its aspect
+       ratio matches the sensor output (some cameras letterbox the preview).
+    2. half_size LibRaw decode — 2×2 binning instead of demosaicing, when half
+       the sensor size is still ≥ max_px.
+    3. Full LibRaw decode.
+
+    Tiers 1–2 are skipped when full_quality is set.
 
-def _raw_open_full(file_path: str) -> Image.Image:
-    """Full LibRaw decode for coldpreview quality."""
+    Returns:
+        (RGB image, tier) — tier is one of the COLDPREVIEW_SOURCE_* constants.
+    """
+    sensor = (raw.sizes.width, raw.sizes.height)
+
+    if not full_quality:
+        if thumb is not None:
+            preview = Image.open(io.BytesIO(thumb))
+            if max(preview.size) >= max_px and _same_aspect(preview.size, sensor):
+                _draft_to_cover(preview, max_px)
+                img = _raw_orient(_to_rgb(preview), raw.sizes.flip, sensor)
+                return img, COLDPREVIEW_SOURCE_EMBEDDED
+
+        if max(sensor) // 2 >= max_px:
+            return _raw_postprocess(raw, half_size=True), COLDPREVIEW_SOURCE_HALF_SIZE
+
+    return _raw_postprocess(raw), COLDPREVIEW_SOURCE_FULL
+
+
+def _raw_embedded_jpeg(raw) -> bytes | None:
+    """Return the embedded JPEG thumbnail bytes of an open rawpy.RawPy, or None."""
     import rawpy
 
-    with rawpy.imread(file_path) as raw:
-        rgb = raw.postprocess(use_camera_wb=True, output_bps=8)
+    try:
+        thumb = raw.extract_thumb()
+        if thumb.format == rawpy.ThumbFormat.JPEG:
+            return bytes(thumb.data)
+    except Exception:
+        pass
+    return None
 
-    import numpy as np  # noqa: F401
+
+def _raw_postprocess(raw, half_size: bool = False) -> Image.Image:
+    """LibRaw demosaic of an open rawpy.RawPy to an RGB PIL image.
+
+    half_size=True bins each 2×2 Bayer block into one pixel instead of
+    demosaicing — roughly 4× faster, output is half the sensor size.
+    """
+    rgb = raw.postprocess(use_camera_wb=True, output_bps=8, half_size=half_size)
+
+    import numpy as np  # noqa: F401 — Image.fromarray requires numpy
     return _to_rgb(Image.fromarray(rgb))
 
 
@@ -201,6 +368,44 @@ def _raw_open_full(file_path: str) -> Image.Image:
 # Shared helpers
 # ---------------------------------------------------------------------------
 
+def _draft_to_cover(img: Image.Image, max_px: int) -> None:
+    """Configure a not-yet-loaded JPEG to decode at a reduced DCT scale.
+
+    libjpeg can decode straight to 1/2, 1/4 or 1/8 size at a fraction of the
+    cost of a full decode. Picks the smallest scale whose longest edge is
+    still ≥ max_px, so the caller's LANCZOS resize always downsamples.
+    No-op for other formats, for already loaded images and when the image
+    is no larger than max_px.
+    """
+    if img.format != "JPEG":
+        return
+    w, h = img.size
+    if max(w, h) <= max_px:
+        return
+    scale = max_px / max(w, h)
+    img.draft(None, (math.ceil(w * scale), math.ceil(h * scale)))
+
+
+def _same_aspect(a: tuple[int, int], b: tuple[int, int], tolerance: float = 0.02) -> bool:
+    """True when two sizes have the same aspect ratio, ignoring orientation."""
+    ra = max(a) / min(a)
+    rb = max(b) / min(b)
+    return abs(ra - rb) <= tolerance * rb
+
+
+def _raw_orient(img: Image.Image, flip: int, sensor: tuple[int, int]) -> Image.Image:
+    """Rotate an embedded RAW preview the way LibRaw rotates its own output.
+
+    flip is LibRaw's sizes.flip (0 none, 3 = 180°, 5 = 90° CCW, 6 = 90° CW).
+    Previews some cameras store already rotated are left alone.
+    """
+    if flip == 3:
+        return img.transpose(Image.ROTATE_180)
+    if flip in (5, 6) and (img.width >= img.height) == (sensor[0] >= sensor[1]):
+        return img.transpose(Image.ROTATE_90 if flip == 5 else Image.ROTATE_270)
+    return img
+
+
 def _coldpreview_path(hothash: str, coldpreview_dir: str) -> Path:
     return Path(coldpreview_dir) / hothash[:2] / hothash[2:4] / f"{hothash}.jpg"
 
@@ -50,6 +50,15 @@ def compute_quality_metrics(file_path: str) -> dict[str, float | None]:
         return {"sharpness_score": None, "exposure_mean": None,
                 "exposure_clipping": None, "noise_score": None}
 
+    return quality_metrics_from_image(img)
+
+
+def quality_metrics_from_image(img: Image.Image) -> dict[str, float | None]:
+    """Som compute_quality_metrics(), men fra et allerede dekodet RGB-bilde.
+
+    Bildet må være orientert riktig (EXIF-rotasjon anvendt) og i full
+    oppløsning — støyestimatet bruker 512×512 senterutsnitt før nedskalering.
+    """
     try:
         noise_score = _noise(img)
 
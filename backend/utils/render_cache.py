@@ -0,0 +1,138 @@
+"""Size-bounded on-disk LRU cache for rendered images.
+
+Used by photo_service.serve_coldpreview() so that a corrected coldpreview with
+embedded EXIF is rendered once and then served from disk:
+
+    cache = RenderCache("/data/render-cache", max_bytes=1 << 30)
+    jpeg = cache.get_or_render(key, lambda: render_jpeg())
+
+Keys are hex digests chosen by the caller; the cache never interprets them.
+Layout: <directory>/<key[0:2]>/<key>.jpg
+
+Recency is tracked in memory and mirrored to the file mtime, so LRU order
+survives a restart. Concurrent get_or_render() calls for the same key are
+coalesced: one thread renders, the others wait and read the result.
+
+Hits return the file's bytes, not its path: another request may evict the
+file at any time, so a path could be gone before it is sent.
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+
+class RenderCache:
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._inflight: dict[str, threading.Lock] = {}
+        self._index: OrderedDict[str, int] | None = None  # key → size, oldest first
+        self._total = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.jpg"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached bytes for key and mark them recently used, or None."""
+        path = self.path_for(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(key)
+            return None
+        with self._lock:
+            index = self._load_index()
+            try:
+                os.utime(path)
+            except FileNotFoundError:  # evicted after the read
+                self._forget(key)
+                return data
+            if key in index:
+                index.move_to_end(key)
+            else:
+                index[key] = len(data)
+                self._total += len(data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under key (atomically) and evict down to max_bytes."""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{key}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            index = self._load_index()
+            self._forget(key)
+            index[key] = len(data)
+            self._total += len(data)
+            self._evict(keep=key)
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """Return the cached bytes for key, calling render() once on a miss.
+
+        Concurrent callers with the same key share one render (single-flight).
+        """
+        hit = self.get(key)
+        if hit is not None:
+            return hit
+
+        with self._lock:
+            flight = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with flight:
+                hit = self.get(key)  # rendered by the thread we waited for
+                if hit is None:
+                    hit = render()
+                    self.put(key, hit)
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+        return hit
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._total
+
+    # ------------------------------------------------------------------
+    # Internals — call with self._lock held
+    # ------------------------------------------------------------------
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._index is None:
+            entries = []
+            for path in self.directory.glob("*/*.jpg"):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, path.stem, st.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total = sum(size for _, _, size in entries)
+        return self._index
+
+    def _forget(self, key: str) -> None:
+        if self._index is not None and key in self._index:
+            self._total -= self._index.pop(key)
+
+    def _evict(self, keep: str) -> None:
+        index = self._index
+        while self._total > self.max_bytes and len(index) > 1:
+            key, size = next(iter(index.items()))
+            if key == keep:
+                index.move_to_end(key)
+                continue
+            del index[key]
+            self._total -= size
+            self.path_for(key).unlink(missing_ok=True)
@@ -0,0 +1,81 @@
+"""Small thread-safe in-memory LRU cache for computed query results.
+
+Used by search_service for totals, facet counts and saved-search results:
+
+    cache = ResultCache(max_entries=256)
+    value = cache.get_or_compute(key, lambda: run_query())
+
+With weigh (e.g. len of a bytes value), entries are also evicted until their
+total weight is within max_weight; a single value heavier than max_weight is
+not stored.
+
+Keys are any hashable value chosen by the caller. Callers put a data version
+(see models.library_generation) in the key, so stale entries are never hit
+and simply age out of the LRU order.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int,
+        max_weight: int | None = None,
+        weigh: Callable[[Any], int] | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._weigh = weigh or (lambda value: 0)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._weight = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        weight = self._weigh(value)
+        with self._lock:
+            if key in self._entries:
+                self._weight -= self._weigh(self._entries.pop(key))
+            if self.max_weight is not None and weight > self.max_weight:
+                return
+            self._entries[key] = value
+            self._weight += weight
+            while len(self._entries) > self.max_entries or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._weight -= self._weigh(evicted)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss.
+
+        Concurrent misses for the same key may compute twice; the results are
+        equal, so the last one simply wins.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
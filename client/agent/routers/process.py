@@ -1,18 +1,36 @@
 import base64
 import hashlib
-import tempfile
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 from utils.exif import extract_exif, extract_camera_fields, extract_taken_at, extract_gps
-from utils.previews import generate_hotpreview, hotpreview_b64, generate_coldpreview, generate_preview
-from utils.quality import compute_quality_metrics
+from utils.pipeline import PipelineError, RegistrationPipeline
+from utils.previews import generate_hotpreview, hotpreview_b64, generate_preview
+
+log = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/process", tags=["process"])
 
+# Pipeline stage → error message prefix (kept identical to the old per-step errors)
+_STAGE_ERRORS = {
+    "read": "Lesing feilet",
+    "decode": "Hotpreview feilet",
+    "hotpreview": "Hotpreview feilet",
+    "coldpreview": "Coldpreview feilet",
+    "exif": "EXIF-ekstraksjon feilet",
+}
+
 
 class HashRequest(BaseModel):
     master: str
@@ -44,6 +62,7 @@ def hash_file(req: HashRequest) -> HashResponse:
 class ProcessRequest(BaseModel):
     master: str
     companions: list[str] = []
+    coldpreview_full_quality: bool = False  # RAW: skip embedded/half_size tiers
 
 
 class ProcessResponse(BaseModel):
@@ -61,56 +80,214 @@ class ProcessResponse(BaseModel):
     exposure_mean: float | None
     exposure_clipping: float | None
     noise_score: float | None
+    coldpreview_source: str | None = None  # RAW tier: embedded | half_size | full
+    timings: dict[str, float] = {}  # pipeline stage → milliseconds
 
 
 @router.post("", response_model=ProcessResponse)
 def process(req: ProcessRequest) -> ProcessResponse:
-    master = req.master
-    if not Path(master).exists():
-        raise HTTPException(status_code=404, detail=f"Fil finnes ikke: {master}")
+    return _process_file(req.master, req.coldpreview_full_quality)
 
-    try:
-        jpeg_bytes, hothash, width, height = generate_hotpreview(master)
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"Hotpreview feilet: {exc}")
 
-    try:
-        with tempfile.TemporaryDirectory() as tmp:
-            coldpreview_path = generate_coldpreview(master, hothash, tmp)
-            coldpreview_bytes = Path(coldpreview_path).read_bytes()
-        coldpreview_b64 = base64.b64encode(coldpreview_bytes).decode("ascii")
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"Coldpreview feilet: {exc}")
+def _process_file(master: str, coldpreview_full_quality: bool = False) -> ProcessResponse:
+    if not Path(master).exists():
+        raise HTTPException(status_code=404, detail=f"Fil finnes ikke: {master}")
 
+    # One read, one decode — see utils/pipeline.py
     try:
-        exif = extract_exif(master)
-        camera_fields = extract_camera_fields(master)
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"EXIF-ekstraksjon feilet: {exc}")
+        result = RegistrationPipeline(
+            master, coldpreview_full_quality=coldpreview_full_quality
+        ).run()
+    except PipelineError as exc:
+        prefix = _STAGE_ERRORS.get(exc.stage, "Prosessering feilet")
+        raise HTTPException(status_code=500, detail=f"{prefix}: {exc.cause}")
 
-    taken_at_dt = extract_taken_at(exif)
-    gps_lat, gps_lng = extract_gps(exif)
+    log.debug("process %s: %s", master, result.timings)
 
-    quality = compute_quality_metrics(master)
+    taken_at_dt = extract_taken_at(result.exif)
+    gps_lat, gps_lng = extract_gps(result.exif)
+    quality = result.quality
 
     return ProcessResponse(
-        hothash=hothash,
-        hotpreview_b64=hotpreview_b64(jpeg_bytes),
-        coldpreview_b64=coldpreview_b64,
-        exif=exif,
-        camera_fields=camera_fields,
+        hothash=result.hothash,
+        hotpreview_b64=hotpreview_b64(result.hotpreview_bytes),
+        coldpreview_b64=base64.b64encode(result.coldpreview_bytes).decode("ascii"),
+        exif=result.exif,
+        camera_fields=result.camera_fields,
         taken_at=taken_at_dt.isoformat() if taken_at_dt else None,
         gps_lat=gps_lat,
         gps_lng=gps_lng,
-        width=width,
-        height=height,
+        width=result.width,
+        height=result.height,
         sharpness_score=quality["sharpness_score"],
         exposure_mean=quality["exposure_mean"],
         exposure_clipping=quality["exposure_clipping"],
         noise_score=quality["noise_score"],
+        coldpreview_source=result.coldpreview_source,
+        timings=result.timings,
     )
 
 
+# ─── Batch ────────────────────────────────────────────────────────────────────
+#
+# POST /process/batch fans groups out over a process pool (PIL/rawpy work is
+# CPU-bound and holds the GIL) and streams one NDJSON line per group as soon
+# as it finishes — in completion order, not request order. Lines:
+#
+#   {"event": "started", "batch_id": ..., "total": n, "workers": w}
+#   {"event": "result", "index": i, "master": ..., "result": {ProcessResponse}}
+#   {"event": "error",  "index": i, "master": ..., "status": 404|500, "detail": ...}
+#   {"event": "done", "processed": n, "errors": n, "cancelled": bool}
+#
+# At most max_in_flight groups are submitted at a time, so a batch of
+# thousands of files never queues thousands of pickled results.
+# DELETE /process/batch/{batch_id} cancels: queued groups are dropped,
+# groups already running finish but are not reported.
+
+# spawn, not fork: LibRaw may be built with OpenMP, which is not fork-safe,
+# and the agent process has running threads
+_MP_CONTEXT = "spawn"
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_batch_cancel_events: dict[str, threading.Event] = {}
+
+
+class BatchGroup(BaseModel):
+    master: str
+    companions: list[str] = []
+
+
+class BatchRequest(BaseModel):
+    groups: list[BatchGroup]
+    coldpreview_full_quality: bool = False
+    max_in_flight: int | None = None  # default: 2 × workers
+
+
+def _pool_size() -> int:
+    return os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all batches, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_size(),
+                mp_context=multiprocessing.get_context(_MP_CONTEXT),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool; the next _get_pool() starts a fresh one.
+
+    Only ever called with the pool that failed: shutting down with
+    cancel_futures on the shared replacement would cancel other batches' work.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _batch_worker(index: int, master: str, coldpreview_full_quality: bool) -> dict:
+    """Runs in a pool process. Returns one NDJSON event (never raises)."""
+    try:
+        response = _process_file(master, coldpreview_full_quality)
+    except HTTPException as exc:
+        return {"event": "error", "index": index, "master": master,
+                "status": exc.status_code, "detail": exc.detail}
+    except Exception as exc:
+        return {"event": "error", "index": index, "master": master,
+                "status": 500, "detail": f"Prosessering feilet: {exc}"}
+    return {"event": "result", "index": index, "master": master,
+            "result": response.model_dump()}
+
+
+@router.post("/batch")
+def process_batch(req: BatchRequest) -> StreamingResponse:
+    batch_id = str(uuid.uuid4())
+    cancel_event = threading.Event()
+    _batch_cancel_events[batch_id] = cancel_event
+    return StreamingResponse(
+        _run_batch(batch_id, req, cancel_event),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.delete("/batch/{batch_id}", status_code=204)
+def cancel_batch(batch_id: str):
+    event = _batch_cancel_events.get(batch_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail=f"Batch finnes ikke: {batch_id}")
+    event.set()
+
+
+def _run_batch(batch_id: str, req: BatchRequest, cancel_event: threading.Event):
+    pool = _get_pool()
+    workers = _pool_size()
+    max_in_flight = max(1, req.max_in_flight or 2 * workers)
+    pending = iter(enumerate(req.groups))
+    # future → (index, master, the pool it was submitted to)
+    in_flight: dict[Future, tuple[int, str, ProcessPoolExecutor]] = {}
+    processed = errors = 0
+
+    def submit_next() -> bool:
+        item = next(pending, None)
+        if item is None:
+            return False
+        index, group = item
+        future = pool.submit(_batch_worker, index, group.master, req.coldpreview_full_quality)
+        in_flight[future] = (index, group.master, pool)
+        return True
+
+    try:
+        yield _ndjson({"event": "started", "batch_id": batch_id,
+                       "total": len(req.groups), "workers": workers})
+
+        while len(in_flight) < max_in_flight and submit_next():
+            pass
+
+        while in_flight and not cancel_event.is_set():
+            # Short timeout so cancellation is noticed while long RAW decodes run
+            done, _ = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, master, owner = in_flight.pop(future)
+                try:
+                    event = future.result()
+                except BrokenProcessPool as exc:
+                    # A worker died (e.g. a crash inside LibRaw). Every other future
+                    # of that pool fails the same way; replace the pool only once.
+                    if owner is pool:
+                        _discard_pool(owner)
+                        pool = _get_pool()
+                    event = {"event": "error", "index": index, "master": master,
+                             "status": 500, "detail": f"Prosessering feilet: {exc}"}
+                except CancelledError:
+                    event = {"event": "error", "index": index, "master": master,
+                             "status": 500, "detail": "Prosessering avbrutt"}
+                processed += 1
+                errors += event["event"] == "error"
+                yield _ndjson(event)
+                if not cancel_event.is_set():
+                    submit_next()
+
+        yield _ndjson({"event": "done", "processed": processed, "errors": errors,
+                       "cancelled": cancel_event.is_set()})
+    finally:
+        # Also reached when the client disconnects mid-stream
+        for future in in_flight:
+            future.cancel()
+        _batch_cancel_events.pop(batch_id, None)
+
+
+def _ndjson(event: dict) -> bytes:
+    return (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+
 class ExifOut(BaseModel):
     taken_at: str | None
     camera_make: str | None
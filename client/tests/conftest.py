@@ -0,0 +1,15 @@
+"""Test fixtures for the agent.
+
+Importing agent.main puts backend/ on sys.path, so the routers can import
+backend utils just as when the agent runs.
+"""
+
+import pytest
+from starlette.testclient import TestClient
+
+from agent.main import app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
@@ -0,0 +1,101 @@
+"""Tests for POST /process/batch — the NDJSON stream from the shared process pool.
+
+The pool is forked instead of spawned so its workers inherit the stubbed
+_process_file: "slow…" masters take a while, "crash…" masters kill their worker.
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from agent.routers import process
+
+
+def _fake_process_file(master: str, coldpreview_full_quality: bool = False) -> process.ProcessResponse:
+    if master.startswith("crash"):
+        os._exit(1)
+    if master.startswith("slow"):
+        time.sleep(1)
+    return process.ProcessResponse(
+        hothash=master, hotpreview_b64="", coldpreview_b64="", exif={}, camera_fields={},
+        taken_at=None, gps_lat=None, gps_lng=None, width=1, height=1,
+        sharpness_score=None, exposure_mean=None, exposure_clipping=None, noise_score=None,
+    )
+
+
+@pytest.fixture(autouse=True)
+def fork_pool(monkeypatch):
+    monkeypatch.setattr(process, "_MP_CONTEXT", "fork")
+    monkeypatch.setattr(process, "_pool_size", lambda: 2)
+    monkeypatch.setattr(process, "_process_file", _fake_process_file)
+    monkeypatch.setattr(process, "_pool", None)
+    yield
+    if process._pool is not None:
+        process._pool.shutdown(cancel_futures=True)
+
+
+def _events(client, masters: list[str], **body) -> list[dict]:
+    groups = [{"master": m} for m in masters]
+    with client.stream("POST", "/process/batch", json={"groups": groups, **body}) as r:
+        assert r.status_code == 200
+        return [json.loads(line) for line in r.iter_lines() if line]
+
+
+def test_batch_streams_one_event_per_group(client):
+    masters = [f"/photos/{i}.jpg" for i in range(5)]
+    events = _events(client, masters)
+
+    assert events[0]["event"] == "started"
+    assert events[0]["total"] == 5
+    assert events[0]["workers"] == 2
+    results = {e["index"]: e for e in events[1:-1]}
+    assert sorted(results) == list(range(5))
+    assert all(e["event"] == "result" for e in results.values())
+    assert all(results[i]["result"]["hothash"] == m for i, m in enumerate(masters))
+    assert events[-1] == {"event": "done", "processed": 5, "errors": 0, "cancelled": False}
+
+
+def test_delete_cancels_running_batch(client):
+    statuses = []
+
+    def cancel_when_started():
+        while not process._batch_cancel_events:
+            time.sleep(0.01)
+        (batch_id,) = process._batch_cancel_events
+        statuses.append(client.delete(f"/process/batch/{batch_id}").status_code)
+
+    canceller = threading.Thread(target=cancel_when_started)
+    canceller.start()
+    events = _events(client, [f"slow{i}" for i in range(10)], max_in_flight=2)
+    canceller.join()
+
+    assert statuses == [204]
+    assert events[-1]["event"] == "done"
+    assert events[-1]["cancelled"] is True
+    assert events[-1]["processed"] < 10
+    assert process._batch_cancel_events == {}
+
+
+def test_delete_unknown_batch_is_404(client):
+    assert client.delete("/process/batch/unknown").status_code == 404
+
+
+def test_worker_crash_fails_only_in_flight_groups(client, monkeypatch):
+    # Both in-flight groups go down with the broken pool; the rest run on a
+    # fresh one, which the second BrokenProcessPool must not shut down
+    discarded = []
+    discard = process._discard_pool
+    monkeypatch.setattr(process, "_discard_pool", lambda pool: discarded.append(pool) or discard(pool))
+    first_pool = process._get_pool()
+
+    events = _events(client, ["crash", "slow", "a", "b", "c"], max_in_flight=2)
+
+    by_index = {e["index"]: e for e in events[1:-1]}
+    assert [by_index[i]["event"] for i in range(5)] == ["error", "error", "result", "result", "result"]
+    assert by_index[0]["status"] == 500
+    assert events[-1] == {"event": "done", "processed": 5, "errors": 2, "cancelled": False}
+    assert discarded == [first_pool]
+    assert process._pool is not first_pool
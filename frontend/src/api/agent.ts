@@ -1,4 +1,4 @@
-import { agentFetch } from './agentClient'
+import { AGENT_URL, agentFetch } from './agentClient'
 import type { ScanResult } from '../types/api'
 
 export interface HashResponse {
@@ -23,6 +23,7 @@ export interface ProcessResponse {
   exposure_mean: number | null
   exposure_clipping: number | null
   noise_score: number | null
+  coldpreview_source?: string | null
 }
 
 export function scanDirectory(path: string, recursive = true): Promise<ScanResult> {
@@ -39,9 +40,47 @@ export function hashFile(master_path: string): Promise<HashResponse> {
   })
 }
 
-export function processFile(master_path: string, companions: string[] = []): Promise<ProcessResponse> {
+export function processFile(
+  master_path: string,
+  companions: string[] = [],
+  coldpreviewFullQuality = false,
+): Promise<ProcessResponse> {
   return agentFetch('/process', {
     method: 'POST',
-    body: JSON.stringify({ master: master_path, companions }),
+    body: JSON.stringify({ master: master_path, companions, coldpreview_full_quality: coldpreviewFullQuality }),
   })
 }
+
+export type BatchEvent =
+  | { event: 'started'; batch_id: string; total: number; workers: number }
+  | { event: 'result'; index: number; master: string; result: ProcessResponse }
+  | { event: 'error'; index: number; master: string; status: number; detail: string }
+  | { event: 'done'; processed: number; errors: number; cancelled: boolean }
+
+/** Process many groups in the agent's process pool. Yields NDJSON events in completion order. */
+export async function* processBatch(
+  groups: { master: string; companions: string[] }[],
+  coldpreviewFullQuality = false,
+): AsyncGenerator<BatchEvent> {
+  const response = await fetch(AGENT_URL + '/process/batch', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ groups, coldpreview_full_quality: coldpreviewFullQuality }),
+  })
+  if (!response.ok || !response.body) {
+    throw new Error(`Agent ${response.status}: ${await response.text()}`)
+  }
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += value
+    let newline: number
+    while ((newline = buffer.indexOf('\n')) >= 0) {
+      const line = buffer.slice(0, newline).trim()
+      buffer = buffer.slice(newline + 1)
+      if (line) yield JSON.parse(line) as BatchEvent
+    }
+  }
+}
@@ -29,6 +29,31 @@ function getMachineId(): string {
 
 export { getMachineId }
 
+export interface Page<T> {
+  items: T[]
+  nextCursor: string | null  // fra X-Next-Cursor; null på siste side
+  total: number | null       // fra X-Total-Count; bare når total er bedt om
+}
+
+export async function apiFetchPage<T>(path: string, init?: RequestInit): Promise<Page<T>> {
+  const headers: Record<string, string> = {
+    'X-Machine-ID': getMachineId(),
+    ...(init?.body ? { 'Content-Type': 'application/json' } : {}),
+    ...(init?.headers ?? {}),
+  }
+  const response = await fetch(baseUrl + path, { ...init, headers })
+  if (!response.ok) {
+    const text = await response.text()
+    throw new Error(`${response.status} ${text}`)
+  }
+  const total = response.headers.get('X-Total-Count')
+  return {
+    items: await response.json() as T[],
+    nextCursor: response.headers.get('X-Next-Cursor'),
+    total: total === null ? null : Number(total),
+  }
+}
+
 export async function apiFetch<T>(path: string, init?: RequestInit): Promise<T> {
   const headers: Record<string, string> = {
     'X-Machine-ID': getMachineId(),
@@ -42,6 +42,7 @@ export interface GroupPayload {
   exposure_mean?: number | null
   exposure_clipping?: number | null
   noise_score?: number | null
+  coldpreview_source?: string | null
   companions?: { path: string; type: string }[]
 }
 
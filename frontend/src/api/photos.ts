@@ -1,10 +1,14 @@
-import { apiFetch } from './client'
-import type { PhotoDetail, PhotoListItem, CheckResponse, SharedPhotoOut } from '../types/api'
+import { apiFetch, apiFetchPage, getBaseUrl, getMachineId } from './client'
+import type { Page } from './client'
+import type { PhotoDetail, PhotoListItem, PhotoNeighbours, CheckResponse, MapCluster, PerceptualHashJob, SharedPhotoOut, SimilarPair, SimilarPhoto } from '../types/api'
 
-export function listPhotos(params: {
+export interface ListPhotosParams {
   limit?: number
   offset?: number
+  cursor?: string
   sort?: string
+  /** sort=random: samme seed gir samme stokking (sider og naboer henger sammen) */
+  seed?: number
   hothashes?: string[]
   sessionId?: string
   eventId?: string
@@ -12,11 +16,15 @@ export function listPhotos(params: {
   taken_after?: string
   taken_before?: string
   stacksCollapsed?: boolean
-}): Promise<PhotoListItem[]> {
+  includeHotpreview?: boolean
+}
+
+function listPhotosQuery(params: ListPhotosParams): URLSearchParams {
   const q = new URLSearchParams()
   if (params.limit != null) q.set('limit', String(params.limit))
   if (params.offset != null) q.set('offset', String(params.offset))
   if (params.sort) q.set('sort', params.sort)
+  if (params.seed != null) q.set('seed', String(params.seed))
   if (params.sessionId) q.set('session_id', params.sessionId)
   if (params.eventId) q.set('event_id', params.eventId)
   if (params.kindIds) {
@@ -28,15 +36,117 @@ export function listPhotos(params: {
     for (const h of params.hothashes) q.append('hothash', h)
   }
   if (params.stacksCollapsed) q.set('stacks_collapsed', 'true')
-  return apiFetch<PhotoListItem[]>(`/photos?${q}`)
+  if (params.includeHotpreview === false) q.set('include_hotpreview', 'false')
+  if (params.cursor) q.set('cursor', params.cursor)
+  return q
+}
+
+export function listPhotos(params: ListPhotosParams): Promise<PhotoListItem[]> {
+  return apiFetch<PhotoListItem[]>(`/photos?${listPhotosQuery(params)}`)
+}
+
+/** Én side med keyset-paginering — send nextCursor tilbake som cursor. */
+export function listPhotosPage(params: ListPhotosParams): Promise<Page<PhotoListItem>> {
+  return apiFetchPage<PhotoListItem>(`/photos?${listPhotosQuery(params)}`)
+}
+
+export interface MapBounds {
+  zoom: number
+  west: number
+  south: number
+  east: number
+  north: number
+}
+
+/** Ferdig klyngede kartmarkører for utsnittet — én per rutenettcelle, ikke én per bilde. */
+export function getMapClusters(
+  bounds: MapBounds,
+  params: Omit<ListPhotosParams, 'limit' | 'offset' | 'cursor' | 'sort' | 'seed' | 'includeHotpreview'> = {},
+): Promise<MapCluster[]> {
+  const q = listPhotosQuery(params)
+  for (const [key, value] of Object.entries(bounds)) q.set(key, String(value))
+  return apiFetch<MapCluster[]>(`/photos/map-clusters?${q}`)
+}
+
+/** Opptil n bilder før og etter hothash i samme liste (nærmeste først). */
+export function getNeighbours(
+  hothash: string,
+  params: Omit<ListPhotosParams, 'limit' | 'offset' | 'cursor' | 'hothashes'> & { n?: number },
+): Promise<PhotoNeighbours> {
+  const q = listPhotosQuery(params)
+  if (params.n != null) q.set('n', String(params.n))
+  return apiFetch<PhotoNeighbours>(`/photos/${hothash}/neighbours?${q}`)
+}
+
+// Maks antall hothasher per GET /photos/hotpreviews (samme grense som backend)
+const HOTPREVIEW_PACK_MAX = 100
+
+/**
+ * Henter rå hotpreview-JPEG-er for mange bilder via binærpakken fra
+ * GET /photos/hotpreviews: per bilde hothash (64 ASCII-byte), lengde
+ * (uint32 big-endian) og JPEG-bytes. Ukjente hothasher mangler i resultatet.
+ */
+export async function fetchHotpreviews(hothashes: string[]): Promise<Map<string, Blob>> {
+  const result = new Map<string, Blob>()
+  const decoder = new TextDecoder('ascii')
+  for (let i = 0; i < hothashes.length; i += HOTPREVIEW_PACK_MAX) {
+    const q = new URLSearchParams()
+    for (const h of hothashes.slice(i, i + HOTPREVIEW_PACK_MAX)) q.append('hothash', h)
+    const response = await fetch(`${getBaseUrl()}/photos/hotpreviews?${q}`, {
+      headers: { 'X-Machine-ID': getMachineId() },
+    })
+    if (!response.ok) throw new Error(`${response.status} ${await response.text()}`)
+    const buf = await response.arrayBuffer()
+    const view = new DataView(buf)
+    let pos = 0
+    while (pos < buf.byteLength) {
+      const hothash = decoder.decode(new Uint8Array(buf, pos, 64))
+      const length = view.getUint32(pos + 64)
+      result.set(hothash, new Blob([new Uint8Array(buf, pos + 68, length)], { type: 'image/jpeg' }))
+      pos += 68 + length
+    }
+  }
+  return result
 }
 
 export function getPhoto(hothash: string): Promise<PhotoDetail> {
   return apiFetch<PhotoDetail>(`/photos/${hothash}`)
 }
 
-export function computePerceptualHashes(): Promise<{ updated: number; already_computed: number }> {
-  return apiFetch('/photos/compute-perceptual-hashes', { method: 'POST' })
+export type PerceptualHashKind = 'dct' | 'difference'
+
+/** Visuelt like bilder (perseptuell hash innen maxDistance bits), nærmeste først. */
+export function getSimilarPhotos(
+  hothash: string,
+  params: { maxDistance?: number; hash?: PerceptualHashKind; limit?: number } = {},
+): Promise<SimilarPhoto[]> {
+  const q = new URLSearchParams()
+  if (params.maxDistance != null) q.set('max_distance', String(params.maxDistance))
+  if (params.hash) q.set('hash', params.hash)
+  if (params.limit != null) q.set('limit', String(params.limit))
+  return apiFetch<SimilarPhoto[]>(`/photos/${hothash}/similar?${q}`)
+}
+
+/** Par av like bilder, nærmest først — kun par med minst ett av hothashes når de er gitt. */
+export function getSimilarPairs(req: {
+  hash?: PerceptualHashKind
+  max_distance?: number
+  hothashes?: string[]
+  limit?: number
+} = {}): Promise<SimilarPair[]> {
+  return apiFetch<SimilarPair[]>('/photos/similar-pairs', {
+    method: 'POST',
+    body: JSON.stringify(req),
+  })
+}
+
+/** Starter bakgrunnsjobben som beregner manglende hasher (eller gir jobben som allerede kjører). */
+export function computePerceptualHashes(): Promise<PerceptualHashJob> {
+  return apiFetch<PerceptualHashJob>('/photos/compute-perceptual-hashes', { method: 'POST' })
+}
+
+export function getPerceptualHashJob(jobId: string): Promise<PerceptualHashJob> {
+  return apiFetch<PerceptualHashJob>(`/photos/compute-perceptual-hashes/${jobId}`)
 }
 
 export function patchPhoto(hothash: string, data: {
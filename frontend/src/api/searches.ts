@@ -1,5 +1,7 @@
-import { apiFetch } from './client'
-import type { SavedSearch, SearchCriterion, PhotoListItem, TimelineYear } from '../types/api'
+import { apiFetch, apiFetchPage, getBaseUrl } from './client'
+import type { MapBounds } from './photos'
+import type { Page } from './client'
+import type { MapCluster, SavedSearch, SearchCriterion, SearchFacets, PhotoListItem, PhotoNeighbours, TimelineYear } from '../types/api'
 
 export interface ExecuteSearchRequest {
   logic: 'AND' | 'OR'
@@ -9,6 +11,16 @@ export interface ExecuteSearchRequest {
   offset?: number
   /** Always ANDed with search expression. See docs/decisions/006-timeline.md */
   date_filter?: string  // ISO date "YYYY-MM-DD"
+  /** false: hotpreview_b64 er null — hent miniatyrer med fetchHotpreviews() */
+  include_hotpreview?: boolean
+  /** Keyset-paginering: nextCursor fra forrige side; offset ignoreres da */
+  cursor?: string
+  /** sort=random: samme seed gir samme stokking */
+  seed?: number
+  /** Antall treff i Page.total: 'exact' teller, 'estimate' bruker planleggerens anslag */
+  total?: 'exact' | 'estimate'
+  /** Kjør dette lagrede søket i stedet for logic/criteria; sidene hentes fra serverens cache */
+  search_id?: string
 }
 
 export function listSearches(): Promise<SavedSearch[]> {
@@ -48,11 +60,69 @@ export function executeSearch(req: ExecuteSearchRequest): Promise<PhotoListItem[
   })
 }
 
+export function executeSearchPage(req: ExecuteSearchRequest): Promise<Page<PhotoListItem>> {
+  return apiFetchPage<PhotoListItem>('/searches/execute', {
+    method: 'POST',
+    body: JSON.stringify(req),
+  })
+}
+
+/** Totalt antall treff og fasettellinger — caches på serveren til biblioteket endres. */
+export function fetchSearchFacets(req: {
+  logic: 'AND' | 'OR'
+  criteria: SearchCriterion[]
+  date_filter?: string
+}): Promise<SearchFacets> {
+  return apiFetch<SearchFacets>('/searches/facets', {
+    method: 'POST',
+    body: JSON.stringify(req),
+  })
+}
+
+/** Kriteriesøk rangert etter CLIP-likhet med q (krever AI-worker). */
+export function semanticSearchPage(req: {
+  q: string
+  logic: 'AND' | 'OR'
+  criteria: SearchCriterion[]
+  date_filter?: string
+  limit?: number
+  include_hotpreview?: boolean
+  cursor?: string
+}): Promise<Page<PhotoListItem>> {
+  return apiFetchPage<PhotoListItem>('/searches/semantic', {
+    method: 'POST',
+    body: JSON.stringify(req),
+  })
+}
+
+/** Kartmarkører for søkeresultatet innenfor utsnittet. */
+export function fetchSearchMapClusters(req: {
+  logic: 'AND' | 'OR'
+  criteria: SearchCriterion[]
+  date_filter?: string
+} & MapBounds): Promise<MapCluster[]> {
+  return apiFetch<MapCluster[]>('/searches/map-clusters', {
+    method: 'POST',
+    body: JSON.stringify(req),
+  })
+}
+
+/** Opptil n treff før og etter hothash — quickview kan bla uten å kjøre søket på nytt. */
+export function searchNeighbours(
+  req: Omit<ExecuteSearchRequest, 'limit' | 'offset' | 'cursor'> & { hothash: string; n?: number },
+): Promise<PhotoNeighbours> {
+  return apiFetch<PhotoNeighbours>('/searches/neighbours', {
+    method: 'POST',
+    body: JSON.stringify(req),
+  })
+}
+
 export function fetchTimeline(req: {
   sessionId?: string
   eventId?: string
   logic?: 'AND' | 'OR'
   criteria?: SearchCriterion[]
+  searchId?: string
 }): Promise<TimelineYear[]> {
   return apiFetch<TimelineYear[]>('/searches/timeline', {
     method: 'POST',
@@ -61,6 +131,14 @@ export function fetchTimeline(req: {
       criteria: req.criteria ?? [],
       session_id: req.sessionId ?? null,
       event_id: req.eventId ?? null,
+      search_id: req.searchId ?? null,
     }),
   })
 }
+
+/** Nedlastingslenke for hele resultatet av et lagret søk, strømmet fra serveren. */
+export function savedSearchExportUrl(id: string, format: 'ndjson' | 'csv' = 'csv', sort?: string): string {
+  const params = new URLSearchParams({ format })
+  if (sort) params.set('sort', sort)
+  return `${getBaseUrl()}/searches/${id}/export?${params}`
+}
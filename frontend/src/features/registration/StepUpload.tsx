@@ -1,7 +1,9 @@
 import { useEffect, useRef, useState } from 'react'
 import { registerGroup, completeSession, createSession } from '../../api/inputSessions'
 import { createEvent } from '../../api/events'
-import { processFile } from '../../api/agent'
+import { processBatch } from '../../api/agent'
+import type { ProcessResponse } from '../../api/agent'
+import { getSettings } from '../../api/settings'
 import type { FileGroup, ProcessResult } from '../../types/api'
 import type { FolderMapping, ResolvedEntry } from './registrationTypes'
 
@@ -76,46 +78,74 @@ export default function StepUpload({ unknownGroups, folderMappings, sessionName,
       return
     }
 
-    for (const group of unknownGroups) {
-      setCurrentFile(group.master_path.split(/[\\/]/).pop() ?? group.master_path)
-      try {
-        const processed = await processFile(group.master_path, group.companions.map(c => c.path))
-        const result = await registerGroup(sessionId, {
-          hothash: processed.hothash,
-          hotpreview_b64: processed.hotpreview_b64,
-          coldpreview_b64: processed.coldpreview_b64,
-          master_path: group.master_path,
-          master_type: group.master_type,
-          master_exif: processed.exif,
-          width: processed.width,
-          height: processed.height,
-          taken_at: processed.taken_at,
-          location_lat: processed.gps_lat,
-          location_lng: processed.gps_lng,
-          camera_make: processed.camera_fields.camera_make as string ?? null,
-          camera_model: processed.camera_fields.camera_model as string ?? null,
-          lens_model: processed.camera_fields.lens_model as string ?? null,
-          iso: processed.camera_fields.iso as number ?? null,
-          shutter_speed: processed.camera_fields.shutter_speed as string ?? null,
-          aperture: processed.camera_fields.aperture as number ?? null,
-          focal_length: processed.camera_fields.focal_length as number ?? null,
-          sharpness_score: processed.sharpness_score,
-          exposure_mean: processed.exposure_mean,
-          exposure_clipping: processed.exposure_clipping,
-          noise_score: processed.noise_score,
-          companions: group.companions,
-          event_id: resolveEventId(group.master_path, resolvedEntries),
-        })
-        setProgress(p => ({
-          ...p,
-          done: p.done + 1,
-          registered: p.registered + (result.status === 'registered' ? 1 : 0),
-          duplicates: p.duplicates + (result.status === 'duplicate' ? 1 : 0),
-        }))
-      } catch {
-        setProgress(p => ({ ...p, done: p.done + 1, errors: p.errors + 1 }))
+    const fullQuality = await getSettings()
+      .then(s => s.global_.coldpreview_raw_full_quality)
+      .catch(() => false)
+
+    async function register(group: FileGroup, processed: ProcessResponse) {
+      const result = await registerGroup(sessionId, {
+        hothash: processed.hothash,
+        hotpreview_b64: processed.hotpreview_b64,
+        coldpreview_b64: processed.coldpreview_b64,
+        master_path: group.master_path,
+        master_type: group.master_type,
+        master_exif: processed.exif,
+        width: processed.width,
+        height: processed.height,
+        taken_at: processed.taken_at,
+        location_lat: processed.gps_lat,
+        location_lng: processed.gps_lng,
+        camera_make: processed.camera_fields.camera_make as string ?? null,
+        camera_model: processed.camera_fields.camera_model as string ?? null,
+        lens_model: processed.camera_fields.lens_model as string ?? null,
+        iso: processed.camera_fields.iso as number ?? null,
+        shutter_speed: processed.camera_fields.shutter_speed as string ?? null,
+        aperture: processed.camera_fields.aperture as number ?? null,
+        focal_length: processed.camera_fields.focal_length as number ?? null,
+        sharpness_score: processed.sharpness_score,
+        exposure_mean: processed.exposure_mean,
+        exposure_clipping: processed.exposure_clipping,
+        noise_score: processed.noise_score,
+        coldpreview_source: processed.coldpreview_source ?? null,
+        companions: group.companions,
+        event_id: resolveEventId(group.master_path, resolvedEntries),
+      })
+      setProgress(p => ({
+        ...p,
+        done: p.done + 1,
+        registered: p.registered + (result.status === 'registered' ? 1 : 0),
+        duplicates: p.duplicates + (result.status === 'duplicate' ? 1 : 0),
+      }))
+    }
+
+    function countError() {
+      setProgress(p => ({ ...p, done: p.done + 1, errors: p.errors + 1 }))
+    }
+
+    // The agent processes groups in parallel and streams results as they finish
+    const seen = new Set<number>()
+    try {
+      const batch = unknownGroups.map(g => ({ master: g.master_path, companions: g.companions.map(c => c.path) }))
+      for await (const ev of processBatch(batch, fullQuality)) {
+        if (ev.event !== 'result' && ev.event !== 'error') continue
+        seen.add(ev.index)
+        const group = unknownGroups[ev.index]
+        setCurrentFile(group.master_path.split(/[\\/]/).pop() ?? group.master_path)
+        if (ev.event === 'error') {
+          countError()
+          continue
+        }
+        try {
+          await register(group, ev.result)
+        } catch {
+          countError()
+        }
       }
+    } catch {
+      // Agent stream broke off — whatever was not reported counts as failed
     }
+    unknownGroups.forEach((_, i) => { if (!seen.has(i)) countError() })
+
     try {
       const final = await completeSession(sessionId)
       onDone(final)
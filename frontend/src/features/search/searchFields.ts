@@ -10,6 +10,14 @@ export interface FieldDef {
 }
 
 export const SEARCH_FIELDS: FieldDef[] = [
+  {
+    // Kameradata, bildetekst, filstier og eventnavn — sorter på 'relevance' for rangering
+    field: 'text',
+    label: 'Fritekst',
+    operators: [
+      { operator: 'contains', label: 'Inneholder' },
+    ],
+  },
   {
     field: 'rating',
     label: 'Vurdering',
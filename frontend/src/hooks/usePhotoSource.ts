@@ -1,6 +1,6 @@
 import { useInfiniteQuery, useQuery } from '@tanstack/react-query'
-import { listPhotos } from '../api/photos'
-import { executeSearch } from '../api/searches'
+import { listPhotosPage } from '../api/photos'
+import { executeSearchPage } from '../api/searches'
 import { getSettings } from '../api/settings'
 import useViewStore from '../stores/useViewStore'
 import type { PhotoListItem, SearchCriterion } from '../types/api'
@@ -46,15 +46,15 @@ export function usePhotoSource(params: PhotoSourceParams): PhotoSourceResult {
       : ['photos', { sessionId: params.sessionId, eventId: params.eventId, kindIds: params.kindIds, takenFrom: params.takenFrom, takenTo: params.takenTo, stacksCollapsed }],
     queryFn: ({ pageParam }) =>
       isSearch
-        ? executeSearch({
+        ? executeSearchPage({
             logic: params.logic ?? 'AND',
             criteria: params.criteria!,
             sort: 'taken_at_desc',
             date_filter: params.dateFilter,
             limit,
-            offset: pageParam as number,
+            cursor: pageParam ?? undefined,
           })
-        : listPhotos({
+        : listPhotosPage({
             sort: params.takenFrom ? 'taken_at_asc' : 'taken_at_desc',
             sessionId: params.sessionId,
             eventId: params.eventId,
@@ -63,16 +63,16 @@ export function usePhotoSource(params: PhotoSourceParams): PhotoSourceResult {
             taken_before: params.takenTo,
             stacksCollapsed,
             limit,
-            offset: pageParam as number,
+            cursor: pageParam ?? undefined,
           }),
-    initialPageParam: 0,
-    getNextPageParam: (lastPage, _allPages, lastPageParam) =>
-      lastPage.length < limit ? undefined : (lastPageParam as number) + limit,
+    // Keyset-paginering: hver side peker videre med en cursor (X-Next-Cursor)
+    initialPageParam: null as string | null,
+    getNextPageParam: lastPage => lastPage.nextCursor ?? undefined,
     enabled,
   })
 
   return {
-    photos: query.data?.pages.flat() ?? [],
+    photos: query.data?.pages.flatMap(p => p.items) ?? [],
     isLoading: query.isLoading,
     isError: query.isError,
     hasMore: !!query.hasNextPage,
@@ -234,7 +234,10 @@ function CopyTab() {
       </label>
 
       <SaveRow
-        onSave={() => mutation.mutate({ copy_verify_after_copy: verifyAfterCopy, copy_include_videos: includeVideos })}
+        onSave={() => mutation.mutate({
+          copy_verify_after_copy: verifyAfterCopy,
+          copy_include_videos: includeVideos,
+        })}
         pending={mutation.isPending}
         saved={saved}
       />
@@ -242,6 +245,62 @@ function CopyTab() {
   )
 }
 
+// ─── Tab: Bilder ──────────────────────────────────────────────────────────────
+
+function ImagesTab() {
+  const queryClient = useQueryClient()
+  const { data: settings } = useQuery({ queryKey: ['settings'], queryFn: getSettings })
+
+  const [rawFullQuality, setRawFullQuality] = useState(false)
+  const [saved, setSaved] = useState(false)
+
+  useEffect(() => {
+    if (!settings) return
+    setRawFullQuality(settings.global_.coldpreview_raw_full_quality)
+  }, [settings])
+
+  const mutation = useMutation({
+    mutationFn: patchGlobalSettings,
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ['settings'] })
+      setSaved(true)
+      setTimeout(() => setSaved(false), 2000)
+    },
+  })
+
+  return (
+    <div className="space-y-5">
+      <label className="flex items-start gap-3 cursor-pointer">
+        <input
+          type="checkbox"
+          checked={rawFullQuality}
+          onChange={e => setRawFullQuality(e.target.checked)}
+          className="mt-0.5 rounded"
+        />
+        <div>
+          <p className="text-sm font-medium text-gray-300">Full RAW-dekoding for coldpreview</p>
+          <p className="mt-0.5 text-xs text-gray-500">Bruk alltid full LibRaw-dekoding ved registrering. Tregere; standard er innebygd forhåndsvisning når den er stor nok.</p>
+        </div>
+      </label>
+
+      <SaveRow
+        onSave={() => mutation.mutate({ coldpreview_raw_full_quality: rawFullQuality })}
+        pending={mutation.isPending}
+        saved={saved}
+      />
+
+      <PlaceholderTab items={[
+        'Miniatyrbildestørrelse (hotpreview)',
+        'Forhåndsvisningsstørrelse (coldpreview)',
+        'Kvalitet på forhåndsvisning (JPEG)',
+        'Standard sortering i utvalget',
+        'Vis slettede bilder i utvalget',
+        'Hurtigbufferstørrelse (antall bilder lastet inn i forhånd)',
+      ]} />
+    </div>
+  )
+}
+
 // ─── Tab: Snarveier ───────────────────────────────────────────────────────────
 
 function ShortcutsTab() {
@@ -495,14 +554,7 @@ export default function SettingsPage() {
           </Tabs.Content>
 
           <Tabs.Content value="images" className="p-6 max-w-xl">
-            <PlaceholderTab items={[
-              'Miniatyrbildestørrelse (hotpreview)',
-              'Forhåndsvisningsstørrelse (coldpreview)',
-              'Kvalitet på forhåndsvisning (JPEG)',
-              'Standard sortering i utvalget',
-              'Vis slettede bilder i utvalget',
-              'Hurtigbufferstørrelse (antall bilder lastet inn i forhånd)',
-            ]} />
+            <ImagesTab />
           </Tabs.Content>
 
           <Tabs.Content value="appearance" className="p-6 max-w-xl">
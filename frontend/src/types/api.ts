@@ -133,6 +133,7 @@ export interface GlobalSettings {
   browse_buffer_size: number
   coldpreview_max_px: number
   coldpreview_quality: number
+  coldpreview_raw_full_quality: boolean
   copy_verify_after_copy: boolean
   copy_include_videos: boolean
   public_share_relay_url: string | null
@@ -198,9 +199,14 @@ export interface ProcessResult {
 
 // ─── Photos ───────────────────────────────────────────────────────────────────
 
+export interface PhotoNeighbours {
+  prev: PhotoListItem[]  // nærmeste først
+  next: PhotoListItem[]
+}
+
 export interface PhotoListItem {
   hothash: string
-  hotpreview_b64: string
+  hotpreview_b64: string  // null kun når listet med include_hotpreview=false
   taken_at: string | null
   taken_at_accuracy: string
   rating: number | null
@@ -292,6 +298,7 @@ export interface PhotoDetail extends PhotoListItem {
   exposure_mean: number | null
   exposure_clipping: number | null
   noise_score: number | null
+  coldpreview_source: string | null
   is_shared: boolean
   share_caption: string | null
   share_downloads: boolean
@@ -395,6 +402,37 @@ export interface TimelineMonth {
   days: TimelineDay[]
 }
 
+export interface MapCluster {
+  lat: number      // tyngdepunkt
+  lng: number
+  count: number
+  hothash: string  // ett av bildene i klyngen, til markørbildet
+}
+
+export interface PerceptualHashJob {
+  id: string
+  status: 'pending' | 'running' | 'completed' | 'failed'
+  total: number      // bilder uten hash da jobben (sist) startet
+  processed: number
+  updated: number
+  failed: number     // manglende eller uleselig hotpreview
+  started_at: string
+  progressed_at: string | null
+  completed_at: string | null
+  error: string | null
+}
+
+export interface SimilarPhoto {
+  hothash: string
+  distance: number  // Hamming-avstand mellom de perseptuelle hashene (0–64)
+}
+
+export interface SimilarPair {
+  a: string  // a < b
+  b: string
+  distance: number
+}
+
 export interface TimelineYear {
   year: number
   count: number
@@ -421,6 +459,17 @@ export interface SavedSearch {
   updated_at: string
 }
 
+export interface FacetBucket {
+  value: string | number | null  // null = bilder uten verdi
+  label: string | null           // visningsnavn for photographer, event og tags
+  count: number
+}
+
+export interface SearchFacets {
+  total: number
+  facets: Record<'camera_model' | 'lens_model' | 'rating' | 'year' | 'photographer' | 'event' | 'tags', FacetBucket[]>
+}
+
 // ─── Shortcuts ────────────────────────────────────────────────────────────────
 
 export interface Shortcut {
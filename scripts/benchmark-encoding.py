@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Sammenlign responskoderne for bulk-endepunktene (core/encoding.py).
+
+Måler koding av syntetiske fotolister (samme form som GET /photos):
+
+  standard   FastAPI-veien: pydantic JSON-modus + json.dumps (FAST_RESPONSES=false)
+  pydantic   pydantic-core dump_json i ett kall (GET /photos før orjson)
+  orjson     dagens standard
+  msgpack    Accept: application/msgpack (krever msgpack)
+
+og komprimering av orjson-kroppen med gzip og zstd (krever zstandard).
+Trenger ingen database.
+
+Bruk:
+    python scripts/benchmark-encoding.py
+    python scripts/benchmark-encoding.py --sizes 1000 10000 --repeat 5
+    python scripts/benchmark-encoding.py --no-hotpreview   # kun metadata
+"""
+
+import argparse
+import base64
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from core import encoding  # noqa: E402
+
+_pydantic_adapter = TypeAdapter(list[dict])
+
+
+def _hotpreview() -> str:
+    # ~5 KB tilfeldige bytes per bilde — komprimeres omtrent like dårlig som en JPEG
+    return base64.b64encode(os.urandom(5000)).decode("ascii")
+
+
+def _items(n: int, hotpreview: bool) -> list[dict]:
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    kind_id, photographer_id = str(uuid.uuid4()), str(uuid.uuid4())
+    return [
+        {
+            "hothash": uuid.uuid4().hex * 2, "hotpreview_b64": _hotpreview() if hotpreview else None,
+            "taken_at": start + timedelta(minutes=i), "taken_at_accuracy": "second",
+            "rating": i % 6 or None, "kind_id": kind_id, "category_id": None, "event_id": None,
+            "photographer_id": photographer_id, "location_lat": 59.91 + i / 1e5, "location_lng": 10.75,
+            "location_accuracy": "gps", "stack_id": None, "is_stack_cover": False, "deleted_at": None,
+            "has_correction": i % 10 == 0, "rotation": 90 if i % 10 == 0 else None, "flip_horizontal": False,
+            "crop_left": None, "crop_top": None, "crop_right": None, "crop_bottom": None, "exposure_ev": None,
+            "width": 6000, "height": 4000, "dct_perceptual_hash": i * 7919, "difference_hash": i * 104729,
+            "camera_make": "Benchmark", "camera_model": "B1", "lens_model": "50mm F1.8", "iso": 100 + i % 3200,
+            "shutter_speed": "1/250", "aperture": 2.8, "focal_length": 50.0,
+        }
+        for i in range(n)
+    ]
+
+
+def _time(fn, repeat: int) -> tuple[float, bytes]:
+    runs, out = [], b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        runs.append(time.perf_counter() - t0)
+    return statistics.median(runs) * 1000, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-hotpreview", action="store_true", help="mål uten hotpreview_b64")
+    args = parser.parse_args()
+
+    encoders = {
+        "standard": encoding.dump_json_standard,
+        "pydantic": _pydantic_adapter.dump_json,
+        "orjson": encoding.dump_json,
+    }
+    if encoding.msgpack is not None:
+        encoders["msgpack"] = encoding.dump_msgpack
+    else:
+        print("msgpack ikke installert — hopper over (pip install msgpack)")
+
+    compressors = {"gzip": lambda b: encoding.gzip.compress(b, compresslevel=encoding._GZIP_LEVEL, mtime=0)}
+    if encoding.zstandard is not None:
+        zstd = encoding.zstandard.ZstdCompressor(level=encoding._ZSTD_LEVEL)
+        compressors["zstd"] = zstd.compress
+    else:
+        print("zstandard ikke installert — hopper over (pip install zstandard)")
+
+    print(f"{'rader':>8} {'koder':<10} {'ms':>8} {'MB':>8}")
+    for size in args.sizes:
+        items = _items(size, not args.no_hotpreview)
+        baseline = None
+        for name, fn in encoders.items():
+            ms, body = _time(lambda: fn(items), args.repeat)
+            baseline = baseline or ms
+            print(f"{size:>8} {name:<10} {ms:>8.1f} {len(body) / 1e6:>8.2f}   {baseline / ms:.1f}×")
+        body = encoding.dump_json(items)
+        for name, fn in compressors.items():
+            ms, packed = _time(lambda: fn(body), args.repeat)
+            print(f"{size:>8} {'+' + name:<10} {ms:>8.1f} {len(packed) / 1e6:>8.2f}   {len(body) / len(packed):.1f}× mindre")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Sammenlign likhetsoppslag i perseptuelle hasher (utils/hash_index.py, ADR-004).
+
+Måler per oppslag, for hver Hamming-avstand:
+
+  mih    HashIndex.within — multi-index-hashing over fire 16-bits biter
+  scan   NumPy-popcount over alle hashene (det indeksen erstatter)
+
+og kontrollerer at begge finner de samme bildene. Hashene er syntetiske:
+tilfeldige sentre med noen nære kopier hver, omtrent som serier og
+NEF/JPEG-par. Viser også byggetid og tid for alle par (--pairs-size bilder).
+Trenger ingen database.
+
+Bruk:
+    python scripts/benchmark-hash-index.py
+    python scripts/benchmark-hash-index.py --sizes 100000 500000 --distances 4 10
+    python scripts/benchmark-hash-index.py --queries 2000 --pairs-size 0   # uten par
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from utils.hash_index import HashIndex, popcount  # noqa: E402
+
+
+def _hashes(n: int, rng) -> np.ndarray:
+    # Hver fjerde hash er et senter; de tre neste er kopier med 1–12 bits snudd
+    centres = rng.integers(0, 2**64, size=(n + 3) // 4, dtype=np.uint64)
+    flips = np.zeros((len(centres), 4), dtype=np.uint64)
+    for copy in range(1, 4):
+        for _ in range(12):
+            bit = rng.integers(0, 64, size=len(centres), dtype=np.uint64)
+            keep = rng.random(len(centres)) < 0.5
+            flips[:, copy] ^= np.where(keep, np.uint64(1) << bit, np.uint64(0))
+    return (centres[:, None] ^ flips).ravel()[:n]
+
+
+def _scan(hashes: np.ndarray, q: int, r: int) -> np.ndarray:
+    (hits,) = np.nonzero(popcount(hashes ^ np.uint64(q)) <= r)
+    return hits
+
+
+def _time(fn, queries: list[int]) -> tuple[float, list]:
+    runs, out = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        out.append(fn(q))
+        runs.append(time.perf_counter() - t0)
+    return statistics.median(runs) * 1e6, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50000, 500000])
+    parser.add_argument("--distances", type=int, nargs="+", default=[0, 4, 6, 10, 12, 16])
+    parser.add_argument("--queries", type=int, default=500, help="oppslag per avstand")
+    parser.add_argument("--pairs-size", type=int, default=20000, help="bilder i par-målingen (0 = hopp over)")
+    args = parser.parse_args()
+    rng = np.random.default_rng(4)
+
+    print(f"{'bilder':>8} {'avstand':>8} {'mih µs':>9} {'scan µs':>9} {'treff':>7}")
+    for size in args.sizes:
+        hashes = _hashes(size, rng)
+        t0 = time.perf_counter()
+        index = HashIndex(hashes, np.arange(size), key_dtype=np.int64)
+        print(f"{size:>8} bygget på {(time.perf_counter() - t0) * 1000:.0f} ms")
+        queries = hashes[rng.integers(0, size, size=args.queries)].tolist()
+        for r in args.distances:
+            index.within(queries[0], r)  # bygger probe-maskene for avstanden
+            mih_us, found = _time(lambda q: index.within(q, r), queries)
+            scan_us, expected = _time(lambda q: _scan(hashes, q, r), queries)
+            for hits, scanned in zip(found, expected):
+                assert sorted(k for k, _ in hits) == scanned.tolist(), f"ulikt svar ved avstand {r}"
+            hits = statistics.mean(len(h) for h in found)
+            print(f"{size:>8} {r:>8} {mih_us:>9.0f} {scan_us:>9.0f} {hits:>7.1f}   {scan_us / mih_us:.1f}×")
+
+    if args.pairs_size:
+        hashes = _hashes(args.pairs_size, rng)
+        index = HashIndex(hashes, np.arange(args.pairs_size), key_dtype=np.int64)
+        for r in (6, 10):
+            t0 = time.perf_counter()
+            pairs = sum(1 for _ in index.pairs(r))
+            print(f"alle par, {args.pairs_size} bilder, avstand {r}: {pairs} par på {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Sammenlign full JPEG-dekoding med skalert dekoding (Image.draft).
+
+For hver målstørrelse måles full dekoding + LANCZOS mot draft-dekoding + LANCZOS,
+med tid (median av --repeat kjøringer) og PSNR mot full dekoding som referanse.
+
+Bruk:
+    python scripts/benchmark-jpeg-draft.py                    # syntetisk 6000×4000-bilde
+    python scripts/benchmark-jpeg-draft.py bilde1.jpg ...     # egne JPEG-filer
+    python scripts/benchmark-jpeg-draft.py --sizes 300 1200 --repeat 10
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from utils.previews import _draft_to_cover, _to_rgb  # noqa: E402
+
+
+def _synthetic_jpeg(dest: Path, size=(6000, 4000)) -> Path:
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:size[1], 0:size[0]].astype(np.float32)
+    arr = np.stack([
+        127 + 100 * np.sin(x / 37) * np.cos(y / 53),
+        127 + 100 * np.sin((x + y) / 91),
+        127 + 60 * np.cos(x / 13),
+    ], axis=-1) + rng.normal(0, 6, (size[1], size[0], 3))
+    Image.fromarray(arr.clip(0, 255).astype(np.uint8)).save(dest, quality=92)
+    return dest
+
+
+def _render(path: Path, max_px: int, draft: bool) -> Image.Image:
+    with Image.open(path) as f:
+        if draft:
+            _draft_to_cover(f, max_px)
+        img = _to_rgb(f).copy()
+    img.thumbnail((max_px, max_px), Image.LANCZOS)
+    return img
+
+
+def _time(path: Path, max_px: int, draft: bool, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _render(path, max_px, draft)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _psnr(a: Image.Image, b: Image.Image) -> float:
+    if a.size != b.size:
+        b = b.resize(a.size, Image.LANCZOS)
+    mse = np.mean((np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255 ** 2 / mse)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("images", nargs="*", type=Path, help="JPEG-filer (standard: syntetisk bilde)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[150, 1200, 1600])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        images = args.images or [_synthetic_jpeg(Path(tmp) / "synthetic.jpg")]
+        print(f"{'bilde':<24} {'max_px':>6} {'full ms':>9} {'draft ms':>9} {'faktor':>7} {'PSNR dB':>8}")
+        for path in images:
+            for max_px in args.sizes:
+                full_ms = _time(path, max_px, False, args.repeat)
+                draft_ms = _time(path, max_px, True, args.repeat)
+                psnr = _psnr(_render(path, max_px, False), _render(path, max_px, True))
+                print(f"{path.name[:24]:<24} {max_px:>6} {full_ms:>9.1f} {draft_ms:>9.1f} "
+                      f"{full_ms / draft_ms:>6.1f}× {psnr:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
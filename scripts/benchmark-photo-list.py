@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Sammenlign ORM-basert og projeksjonsbasert serialisering av fotolister.
+
+«orm» er den gamle veien for GET /photos: Photo-objekter med selectinload av
+korreksjon og hotpreview, PhotoListItem.model_validate() per rad og FastAPIs
+response_model-validering + JSON-koding. «projeksjon» er dagens vei:
+kolonneprojeksjon med flat korreksjons-join og én samlet orjson-koding
+(photo_service.list_item_query / core.encoding.dump_json).
+
+Syntetiske bilder settes inn i en transaksjon som rulles tilbake til slutt —
+databasen endres ikke. Krever DATABASE_URL (samme som backend).
+
+Bruk:
+    DATABASE_URL=postgresql+psycopg2://... python scripts/benchmark-photo-list.py
+    python scripts/benchmark-photo-list.py --sizes 1000 10000 50000 --repeat 3
+    python scripts/benchmark-photo-list.py --no-hotpreview   # kun metadata (include_hotpreview=false)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import importlib  # noqa: E402
+import pkgutil  # noqa: E402
+
+import models  # noqa: E402
+
+# Alle modeller må være registrert før mapperne konfigureres (som i alembic/env.py)
+for _m in pkgutil.iter_modules(models.__path__):
+    importlib.import_module(f"models.{_m.name}")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert, text  # noqa: E402
+from sqlalchemy.orm import Session, selectinload  # noqa: E402
+
+from core import encoding  # noqa: E402
+from models.kind import Kind  # noqa: E402
+from models.photo import Photo, PhotoCorrection, PhotoHotpreview  # noqa: E402
+from models.photographer import Photographer  # noqa: E402
+from schemas.photo import PhotoListItem  # noqa: E402
+from services import photo_cursor, photo_service  # noqa: E402
+
+_HOTPREVIEW = bytes(range(256)) * 20  # ~5 KB, som en typisk 150×150 JPEG
+
+
+def _seed(db: Session, n: int) -> None:
+    kind_id = db.query(Kind.id).filter(Kind.is_default.is_(True)).scalar()
+    photographer = Photographer(name=f"benchmark-{uuid.uuid4().hex[:8]}")
+    db.add(photographer)
+    db.flush()
+
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    ids = [uuid.uuid4() for _ in range(n)]
+    db.execute(insert(Photo), [
+        {
+            "id": pid, "hothash": uuid.uuid4().hex * 2, "photographer_id": photographer.id,
+            "kind_id": kind_id, "taken_at": start + timedelta(minutes=i), "rating": i % 6 or None,
+            "camera_make": "Benchmark", "camera_model": "B1", "iso": 100 + i % 3200,
+            "width": 6000, "height": 4000, "taken_at_source": 0, "taken_at_accuracy": "second",
+            "is_stack_cover": False, "is_shared": False, "share_downloads": True, "share_views": 0,
+        }
+        for i, pid in enumerate(ids)
+    ])
+    db.execute(insert(PhotoHotpreview), [{"photo_id": pid, "jpeg": _HOTPREVIEW} for pid in ids])
+    # Hvert tiende bilde har en korreksjon
+    db.execute(insert(PhotoCorrection), [
+        {"photo_id": pid, "rotation": 90, "flip_horizontal": False, "crop_left": 0.1}
+        for pid in ids[::10]
+    ])
+    db.flush()
+    # Uten ferske statistikker velger planleggeren nested loop over «tomme» tabeller
+    db.execute(text("ANALYZE photos, photo_corrections, photo_hotpreviews"))
+
+
+def _orm_path(db: Session, limit: int, include_hotpreview: bool) -> bytes:
+    q = db.query(Photo).options(
+        selectinload(Photo.correction), photo_service.hotpreview_loader(include_hotpreview),
+    )
+    photos = photo_cursor.order_by(q, "taken_at_desc").limit(limit).all()
+    items = [PhotoListItem.model_validate(p) for p in photos]
+    # Som FastAPI med response_model: valider igjen, dump til python, json.dumps
+    adapter = TypeAdapter(list[PhotoListItem])
+    content = adapter.dump_python(adapter.validate_python(items), mode="json")
+    db.expunge_all()
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _projection_path(db: Session, limit: int, include_hotpreview: bool) -> bytes:
+    q = photo_service.list_item_query(db, include_hotpreview)
+    rows = photo_cursor.order_by(q, "taken_at_desc").limit(limit).all()
+    return encoding.dump_json(photo_service.list_items(rows))
+
+
+def _time(fn, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return statistics.median(runs) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-hotpreview", action="store_true", help="mål uten hotpreview_b64")
+    args = parser.parse_args()
+
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        sys.exit("DATABASE_URL må være satt")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        trans = conn.begin()
+        db = Session(bind=conn)
+        try:
+            seeded = 0
+            print(f"{'rader':>8} {'orm ms':>10} {'projeksjon ms':>14} {'faktor':>8} {'MB':>7}")
+            for size in sorted(args.sizes):
+                _seed(db, size - seeded)
+                seeded = size
+                hot = not args.no_hotpreview
+                orm_ms = _time(lambda: _orm_path(db, size, hot), args.repeat)
+                proj_ms = _time(lambda: _projection_path(db, size, hot), args.repeat)
+                mb = len(_projection_path(db, size, hot)) / 1e6
+                print(f"{size:>8} {orm_ms:>10.0f} {proj_ms:>14.0f} {orm_ms / proj_ms:>7.1f}× {mb:>7.1f}")
+        finally:
+            db.close()
+            trans.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 """CLIP embedding generation via open-clip-torch (ViT-B-32, 512-dim).
 
 Point IDs in Qdrant are the photo UUID strings.
-Payload: { hothash, indexed_at }
+Payload: { hothash, indexed_at } plus the backend's filter fields
+{ taken_at (epoch seconds), photographer_id, event_id, rating, deleted },
+kept in step via GET/POST /ai/payloads.
 """
 
 import io
@@ -13,7 +15,7 @@ import open_clip
 import torch
 from PIL import Image
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct
+from qdrant_client.models import PayloadSchemaType, PointStruct
 
 log = logging.getLogger(__name__)
 
@@ -21,6 +23,15 @@ COLLECTION = "hotprevue_clip"
 MODEL_NAME = "ViT-B-32"
 PRETRAINED = "openai"
 
+# Filter fields the backend's hybrid search pushes down (see search_server.py)
+PAYLOAD_INDEXES = {
+    "taken_at": PayloadSchemaType.FLOAT,
+    "photographer_id": PayloadSchemaType.KEYWORD,
+    "event_id": PayloadSchemaType.KEYWORD,
+    "rating": PayloadSchemaType.INTEGER,
+    "deleted": PayloadSchemaType.BOOL,
+}
+
 
 class CLIPIndexer:
     def __init__(self, qdrant_url: str) -> None:
@@ -32,8 +43,17 @@ class CLIPIndexer:
         )
         self._model.eval()
         log.info("CLIP ready")
+        self._ensure_payload_indexes()
+
+    def _ensure_payload_indexes(self) -> None:
+        if not self._qdrant.collection_exists(COLLECTION):
+            return
+        existing = self._qdrant.get_collection(COLLECTION).payload_schema
+        for field, schema in PAYLOAD_INDEXES.items():
+            if field not in existing:
+                self._qdrant.create_payload_index(COLLECTION, field_name=field, field_schema=schema)
 
-    def index(self, photo_id: str, hothash: str, jpeg_bytes: bytes) -> str:
+    def index(self, photo_id: str, hothash: str, jpeg_bytes: bytes, payload: dict | None = None) -> str:
         """Embed a JPEG image and upsert into Qdrant.
 
         Returns the Qdrant point ID (= photo_id).
@@ -48,12 +68,20 @@ class CLIPIndexer:
                 PointStruct(
                     id=point_id,
                     vector=embedding.tolist(),
-                    payload={"hothash": hothash, "indexed_at": datetime.now(timezone.utc).isoformat()},
+                    payload={
+                        **(payload or {}),
+                        "hothash": hothash,
+                        "indexed_at": datetime.now(timezone.utc).isoformat(),
+                    },
                 )
             ],
         )
         return point_id
 
+    def set_payload(self, photo_id: str, payload: dict) -> None:
+        """Overwrite the filter fields of an existing point (vector untouched)."""
+        self._qdrant.set_payload(collection_name=COLLECTION, payload=payload, points=[str(photo_id)])
+
     def _embed(self, jpeg_bytes: bytes) -> np.ndarray:
         img = Image.open(io.BytesIO(jpeg_bytes)).convert("RGB")
         tensor = self._preprocess(img).unsqueeze(0).to(self._device)
@@ -2,6 +2,8 @@
 
 Runs as a daemon thread inside the worker process.
 Exposes GET /search?q=<text>&limit=<n> → [{hothash, score}]
+and POST /search {q, limit, must, ids} → [{id, hothash, score}], filtered on
+the payload fields in clip.PAYLOAD_INDEXES (the backend's hybrid search).
 """
 
 import logging
@@ -20,6 +22,20 @@ class SearchResult(BaseModel):
     score: float
 
 
+class FilteredSearchRequest(BaseModel):
+    q: str
+    limit: int = 100
+    # Conditions that must all hold: {"key", and one of "match", "except",
+    # "gte"/"gt"/"lte"/"lt", "is_null"}
+    must: list[dict] = []
+    # Rank only these points (photo ids) — used when the filter is selective
+    ids: list[str] | None = None
+
+
+class FilteredSearchResult(SearchResult):
+    id: str
+
+
 _clip_indexer = None
 _qdrant_url: str = ""
 
@@ -30,20 +46,12 @@ def init(clip_indexer, qdrant_url: str) -> None:
     _qdrant_url = qdrant_url
 
 
-@app.get("/search", response_model=list[SearchResult])
-def search(q: str = Query(..., min_length=1), limit: int = Query(default=20, le=100)):
-    if _clip_indexer is None:
-        return []
-
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import Query
+def _text_vector(q: str) -> list[float]:
+    import open_clip
     import torch
 
     model = _clip_indexer._model
-    preprocess = _clip_indexer._preprocess
     device = _clip_indexer._device
-
-    import open_clip
     tokenizer = open_clip.get_tokenizer("ViT-B-32")
     tokens = tokenizer([q]).to(device)
 
@@ -51,20 +59,64 @@ def search(q: str = Query(..., min_length=1), limit: int = Query(default=20, le=
         text_features = model.encode_text(tokens)
         text_features = text_features / text_features.norm(dim=-1, keepdim=True)
 
-    vector = text_features.squeeze(0).cpu().float().tolist()
+    return text_features.squeeze(0).cpu().float().tolist()
+
+
+def _query(vector: list[float], limit: int, query_filter=None):
+    from qdrant_client import QdrantClient
 
     client = QdrantClient(url=_qdrant_url)
     result = client.query_points(
         collection_name="hotprevue_clip",
         query=vector,
+        query_filter=query_filter,
         limit=limit,
-        with_payload=True,
+        with_payload=["hothash"],
+    )
+    return [hit for hit in result.points if hit.payload and "hothash" in hit.payload]
+
+
+def _filter(must: list[dict], ids: list[str] | None):
+    from qdrant_client.models import (
+        FieldCondition, Filter, HasIdCondition, IsNullCondition, MatchExcept, MatchValue,
+        PayloadField, Range,
     )
 
+    conditions = []
+    for c in must:
+        key = c["key"]
+        if "match" in c:
+            conditions.append(FieldCondition(key=key, match=MatchValue(value=c["match"])))
+        elif "except" in c:
+            conditions.append(FieldCondition(key=key, match=MatchExcept(**{"except": c["except"]})))
+        elif c.get("is_null"):
+            conditions.append(IsNullCondition(is_null=PayloadField(key=key)))
+        else:
+            bounds = {op: c[op] for op in ("gt", "gte", "lt", "lte") if op in c}
+            conditions.append(FieldCondition(key=key, range=Range(**bounds)))
+    if ids is not None:
+        conditions.append(HasIdCondition(has_id=ids))
+    return Filter(must=conditions) if conditions else None
+
+
+@app.get("/search", response_model=list[SearchResult])
+def search(q: str = Query(..., min_length=1), limit: int = Query(default=20, le=100)):
+    if _clip_indexer is None:
+        return []
     return [
         SearchResult(hothash=hit.payload["hothash"], score=round(hit.score, 4))
-        for hit in result.points
-        if hit.payload and "hothash" in hit.payload
+        for hit in _query(_text_vector(q), limit)
+    ]
+
+
+@app.post("/search", response_model=list[FilteredSearchResult])
+def filtered_search(req: FilteredSearchRequest):
+    if _clip_indexer is None or req.ids == []:
+        return []
+    hits = _query(_text_vector(req.q), min(req.limit, 10_000), _filter(req.must, req.ids))
+    return [
+        FilteredSearchResult(id=str(hit.id), hothash=hit.payload["hothash"], score=round(hit.score, 4))
+        for hit in hits
     ]
 
 
@@ -6,8 +6,9 @@ Environment variables:
 
 Workflow per poll cycle:
   1. GET /ai/jobs?capability=clip → generate CLIP embeddings → POST /ai/results
-  2. GET /ai/jobs?capability=faces → detect faces → POST /ai/results
-  3. If new face results: run DBSCAN recluster
+  2. GET /ai/payloads → update the filter payload of changed CLIP points → POST /ai/payloads
+  3. GET /ai/jobs?capability=faces → detect faces → POST /ai/results
+  4. If new face results: run DBSCAN recluster
 
 Crash-safe: no job is "claimed" before processing. If the worker restarts
 mid-batch, the same photos are picked up again. Qdrant upserts are idempotent.
@@ -35,6 +36,7 @@ log = logging.getLogger("worker")
 
 POLL_INTERVAL = 7       # seconds between idle polls
 BATCH_SIZE = 20         # photos per job fetch
+PAYLOAD_BATCH_SIZE = 500  # CLIP points per payload sync
 BACKOFF_MAX = 300       # cap exponential backoff at 5 minutes
 COLDPREVIEW_TIMEOUT = 60  # seconds to fetch a coldpreview
 
@@ -47,8 +49,9 @@ def _require_env(name: str) -> str:
     return value
 
 
-def _fetch_coldpreview(client: httpx.Client, hothash: str) -> bytes:
-    resp = client.get(f"/photos/{hothash}/coldpreview", timeout=COLDPREVIEW_TIMEOUT)
+def _fetch_coldpreview(client: httpx.Client, hothash: str, max_px: int | None = None) -> bytes:
+    params = {"max_px": max_px} if max_px else None
+    resp = client.get(f"/photos/{hothash}/coldpreview", params=params, timeout=COLDPREVIEW_TIMEOUT)
     resp.raise_for_status()
     return resp.content
 
@@ -62,10 +65,15 @@ def _poll_clip(client: httpx.Client, clip: CLIPIndexer) -> int:
     for job in jobs:
         hothash = job["hothash"]
         photo_id = job["photo_id"]
+        payload = job.get("payload")
         try:
-            jpeg = _fetch_coldpreview(client, hothash)
-            qdrant_id = clip.index(photo_id, hothash, jpeg)
-            results.append({"hothash": hothash, "capability": "clip", "status": "done", "qdrant_id": qdrant_id})
+            # CLIP resizes to 224 px — the 600 px variant is plenty
+            jpeg = _fetch_coldpreview(client, hothash, max_px=600)
+            qdrant_id = clip.index(photo_id, hothash, jpeg, payload)
+            results.append({
+                "hothash": hothash, "capability": "clip", "status": "done", "qdrant_id": qdrant_id,
+                "payload": payload,
+            })
             log.info("CLIP indexed %s", hothash[:12])
         except Exception as exc:
             log.warning("CLIP failed %s: %s", hothash[:12], exc)
@@ -75,6 +83,21 @@ def _poll_clip(client: httpx.Client, clip: CLIPIndexer) -> int:
     return len(jobs)
 
 
+def _sync_payloads(client: httpx.Client, clip: CLIPIndexer) -> int:
+    updates = client.get("/ai/payloads", params={"limit": PAYLOAD_BATCH_SIZE}).raise_for_status().json()
+    synced = []
+    for update in updates:
+        try:
+            clip.set_payload(update["photo_id"], update["payload"])
+            synced.append({"photo_id": update["photo_id"], "version": update["version"]})
+        except Exception as exc:
+            log.warning("Payload sync failed %s: %s", update["photo_id"], exc)
+    if synced:
+        client.post("/ai/payloads", json={"synced": synced}).raise_for_status()
+        log.info("Payload synced for %d CLIP points", len(synced))
+    return len(synced)
+
+
 def _poll_faces(client: httpx.Client, face_indexer: FaceIndexer) -> int:
     jobs = client.get("/ai/jobs", params={"capability": "faces", "limit": BATCH_SIZE}).raise_for_status().json()
     if not jobs:
@@ -116,6 +139,7 @@ def main() -> None:
         try:
             with httpx.Client(base_url=backend_url, timeout=30) as client:
                 clip_n = _poll_clip(client, clip)
+                clip_n += _sync_payloads(client, clip)
                 face_n = _poll_faces(client, faces)
 
             if face_n > 0: